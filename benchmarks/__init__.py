@@ -0,0 +1 @@
+"""Benchmarks for the data-plane worker (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,50 @@
+"""Synthetic projection data shared by benchmarks."""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import structlog
+
+
+def quiet_logging() -> None:
+    """Silence per-read structlog output so timings are not dominated by logging."""
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+
+def write_series_year_month(
+    root: Path,
+    series_codes: list[str],
+    start: str = "2004-01-01",
+    periods: int = 20 * 365,
+) -> dict[str, list[str]]:
+    """Write daily series in the ``series_year_month`` layout.
+
+    Returns the relative parquet paths of each series, as listed in a dataset manifest.
+    """
+    obs_time = pd.date_range(start, periods=periods, freq="D")
+    rng = np.random.default_rng(0)
+    files: dict[str, list[str]] = {}
+
+    for series_code in series_codes:
+        frame = pd.DataFrame(
+            {
+                "obs_time": obs_time,
+                "value": rng.normal(100.0, 5.0, size=periods),
+                "internal_series_code": series_code,
+            }
+        )
+        files[series_code] = []
+        for (year, month), month_frame in frame.groupby(
+            [frame["obs_time"].dt.year, frame["obs_time"].dt.month]
+        ):
+            relative = f"{series_code}/year={year:04d}/month={month:02d}/data.parquet"
+            target = root / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            pq.write_table(pa.Table.from_pandas(month_frame, preserve_index=False), target)
+            files[series_code].append(relative)
+
+    return files
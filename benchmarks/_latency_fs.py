@@ -0,0 +1,144 @@
+"""Local filesystem and object store with injected per-request latency, standing in for S3."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+from pyarrow.fs import FileSystemHandler, LocalFileSystem, PyFileSystem
+
+
+class RequestCounter:
+    """Thread-safe count of simulated object requests."""
+
+    def __init__(self) -> None:
+        """Initialize counter."""
+        self._lock = threading.Lock()
+        self.heads = 0
+        self.gets = 0
+        self.lists = 0
+
+    def add(self, kind: str) -> None:
+        """Record one request of ``kind`` ("head", "get" or "list")."""
+        with self._lock:
+            setattr(self, f"{kind}s", getattr(self, f"{kind}s") + 1)
+
+
+class _LatencyFile:
+    """Python file object that sleeps on every read, like one ranged GET."""
+
+    def __init__(self, path: str, latency_s: float, counter: RequestCounter) -> None:
+        self._file = Path(path).open("rb")  # noqa: SIM115
+        self._latency_s = latency_s
+        self._counter = counter
+        self.closed = False
+
+    def read(self, nbytes: int = -1) -> bytes:
+        time.sleep(self._latency_s)
+        self._counter.add("get")
+        return self._file.read(nbytes)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self.closed = True
+        self._file.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+
+class LatencyHandler(FileSystemHandler):
+    """Read-only handler adding ``latency_s`` to every metadata call and read."""
+
+    def __init__(self, latency_s: float, counter: RequestCounter | None = None) -> None:
+        """Initialize handler."""
+        self._local = LocalFileSystem()
+        self._latency_s = latency_s
+        self.counter = counter or RequestCounter()
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
+
+    def __ne__(self, other: object) -> bool:
+        return self is not other
+
+    def get_type_name(self) -> str:
+        return "latency-local"
+
+    def normalize_path(self, path: str) -> str:
+        return path
+
+    def get_file_info(self, paths: list[str]) -> list[Any]:
+        for _ in paths:
+            time.sleep(self._latency_s)
+            self.counter.add("head")
+        return self._local.get_file_info(paths)
+
+    def get_file_info_selector(self, selector: Any) -> list[Any]:
+        time.sleep(self._latency_s)
+        self.counter.add("list")
+        return self._local.get_file_info(selector)
+
+    def open_input_file(self, path: str) -> pa.NativeFile:
+        return pa.PythonFile(_LatencyFile(path, self._latency_s, self.counter), mode="r")
+
+    def open_input_stream(self, path: str) -> pa.NativeFile:
+        return self.open_input_file(path)
+
+    def create_dir(self, path: str, recursive: bool) -> None:
+        raise NotImplementedError
+
+    def delete_dir(self, path: str) -> None:
+        raise NotImplementedError
+
+    def delete_dir_contents(self, path: str, missing_dir_ok: bool = False) -> None:
+        raise NotImplementedError
+
+    def delete_root_dir_contents(self) -> None:
+        raise NotImplementedError
+
+    def delete_file(self, path: str) -> None:
+        raise NotImplementedError
+
+    def move(self, src: str, dest: str) -> None:
+        raise NotImplementedError
+
+    def copy_file(self, src: str, dest: str) -> None:
+        raise NotImplementedError
+
+    def open_output_stream(self, path: str, metadata: Any) -> pa.NativeFile:
+        raise NotImplementedError
+
+    def open_append_stream(self, path: str, metadata: Any) -> pa.NativeFile:
+        raise NotImplementedError
+
+
+def latency_filesystem(latency_ms: float) -> PyFileSystem:
+    """Build a local filesystem where every request costs ``latency_ms``."""
+    return PyFileSystem(LatencyHandler(latency_ms / 1000.0))
+
+
+class LatencyObjectStore:
+    """``S3IO.get_object`` stand-in: whole local files, one delayed GET each."""
+
+    def __init__(self, root: str, latency_ms: float, counter: RequestCounter) -> None:
+        """Initialize store; ``root`` plays the bucket."""
+        self.bucket = root
+        self._latency_s = latency_ms / 1000.0
+        self.counter = counter
+
+    async def get_object(self, key: str) -> bytes:
+        """Return the object bytes after one request's latency."""
+        await asyncio.sleep(self._latency_s)
+        self.counter.add("get")
+        return (Path(self.bucket) / key).read_bytes()
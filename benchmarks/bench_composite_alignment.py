@@ -0,0 +1,119 @@
+"""Benchmark: composite sum over 2 to 500 operands.
+
+Builds ``--operands`` daily series of ``--years`` of history, each with its own
+start date and about 5% of days missing, and times a composite ``sum`` over all
+of them three ways:
+
+- previous: k - 1 successive outer ``pd.merge`` calls, then
+  ``DataFrame.sum(axis=1)``, as the evaluator did before compact series;
+- align: the k-way alignment used for operands off the run's timeline, which
+  builds the union once and scatters every operand into one preallocated
+  (obs_time, operands) array before a single row reduction;
+- evaluate: ``evaluate_expression``, where inputs already share the run's
+  timeline and are only copied into that array.
+
+Results are checked for exact equality with the previous implementation.
+
+    python -m benchmarks.bench_composite_alignment --operands 2,10,50,100,500 --years 10
+"""
+
+import argparse
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics_worker.application.services.compact_series import CompactSeries
+from metrics_worker.application.services.expression_eval import (
+    _COMPOSITE_OPS,
+    _align_multiple_series,
+    evaluate_expression,
+)
+from metrics_worker.domain.enums import CompositeOp
+
+
+def _previous_sum(series_data: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Composite sum as computed with successive merges."""
+    frames = list(series_data.values())
+    result = frames[0].rename(columns={"value": "value_0"})
+    for idx, frame in enumerate(frames[1:], start=1):
+        result = result.merge(
+            frame.rename(columns={"value": f"value_{idx}"}), on="obs_time", how="outer"
+        )
+    result = result.sort_values("obs_time")
+    value_cols = [col for col in result.columns if col.startswith("value_")]
+    result["value"] = result[value_cols].sum(axis=1)
+    return result[["obs_time", "value"]].reset_index(drop=True)
+
+
+def _aligned_sum(series_data: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Composite sum through the k-way alignment of series off the timeline."""
+    series_list = [CompactSeries.from_frame(frame) for frame in series_data.values()]
+    obs_time, values, _ = _align_multiple_series(series_list)
+    return CompactSeries(obs_time, _COMPOSITE_OPS[CompositeOp.SUM](values)).to_frame()
+
+
+def _ns(frame: pd.DataFrame) -> pd.DataFrame:
+    """The frame with obs_time in nanoseconds, whatever unit pandas inferred."""
+    return frame.assign(obs_time=frame["obs_time"].astype("datetime64[ns]"))
+
+
+def _series_data(operands: int, years: int) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    series_data = {}
+    for idx in range(operands):
+        obs_time = pd.date_range("2000-01-01", periods=years * 365, freq="D") + pd.Timedelta(
+            days=int(rng.integers(0, 30))
+        )
+        keep = rng.random(len(obs_time)) > 0.05
+        series_data[f"S{idx}"] = pd.DataFrame({
+            "obs_time": obs_time[keep],
+            "value": rng.normal(100.0, 5.0, size=int(keep.sum())),
+        })
+    return series_data
+
+
+def _best_of(repeat: int, fn) -> tuple[float, pd.DataFrame]:
+    best = float("inf")
+    result = pd.DataFrame()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    """Run the benchmark and print timings per operand count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operands", default="2,10,50,100,500")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for operands in (int(count) for count in args.operands.split(",")):
+        series_data = _series_data(operands, args.years)
+        expression = {
+            "op": "sum",
+            "operands": [{"series_code": code} for code in series_data],
+        }
+        previous, expected = _best_of(args.repeat, functools.partial(_previous_sum, series_data))
+        aligned, aligned_result = _best_of(
+            args.repeat, functools.partial(_aligned_sum, series_data)
+        )
+        evaluated, result = _best_of(
+            args.repeat,
+            functools.partial(evaluate_expression, expression, "composite", series_data),
+        )
+        for frame in (aligned_result, result):
+            pd.testing.assert_frame_equal(_ns(frame), _ns(expected), check_exact=True)
+        print(
+            f"operands={operands:<4} previous={previous * 1000:9.1f}ms "
+            f"align={aligned * 1000:8.1f}ms evaluate={evaluated * 1000:8.1f}ms "
+            f"speedup={previous / evaluated:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: evaluating independent expression subtrees on several threads.
+
+Evaluates ``sum`` over ``--branches`` window operations (sma, ema, window max
+and window sum in turn, each over its own daily series of ``--years`` of
+history) with the pandas and Arrow engines, once per value of
+``--parallel`` (nodes evaluated at once). Results are checked for exact
+equality with sequential evaluation. For the widest setting it also prints the
+per-node timing breakdown a run logs as ``expression_evaluated``.
+
+    python -m benchmarks.bench_parallel_expression --branches 8 --years 200 --parallel 1,2,4,8
+"""
+
+import argparse
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics_worker.application.services.arrow_expression_eval import evaluate_expression_arrow
+from metrics_worker.application.services.expression_eval import evaluate_expression
+
+_WINDOW_OPS = ("sma", "ema", "max", "sum")
+
+
+def _expression(branches: int) -> dict:
+    return {
+        "op": "sum",
+        "operands": [
+            {
+                "op": _WINDOW_OPS[idx % len(_WINDOW_OPS)],
+                "series": {"series_code": f"S{idx}"},
+                "window": 30 + idx,
+            }
+            for idx in range(branches)
+        ],
+    }
+
+
+def _series_data(branches: int, years: int) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    obs_time = pd.date_range("1800-01-01", periods=years * 365, freq="D")
+    return {
+        f"S{idx}": pd.DataFrame({
+            "obs_time": obs_time,
+            "value": rng.normal(100.0, 5.0, size=len(obs_time)),
+        })
+        for idx in range(branches)
+    }
+
+
+def _best_of(repeat: int, fn):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    """Run the benchmark and print timings per engine and parallelism."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--branches", type=int, default=8)
+    parser.add_argument("--years", type=int, default=200)
+    parser.add_argument("--parallel", default="1,2,4,8")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    expression = _expression(args.branches)
+    series_data = _series_data(args.branches, args.years)
+    engines = {"pandas": evaluate_expression, "arrow": evaluate_expression_arrow}
+    levels = [int(level) for level in args.parallel.split(",")]
+
+    print(f"branches={args.branches} rows={len(next(iter(series_data.values())))}")
+    for name, engine in engines.items():
+        sequential, expected = _best_of(
+            args.repeat, functools.partial(engine, expression, "composite", series_data)
+        )
+        for level in levels:
+            elapsed, result = _best_of(
+                args.repeat,
+                functools.partial(engine, expression, "composite", series_data, level),
+            )
+            if isinstance(result, pd.DataFrame):
+                pd.testing.assert_frame_equal(result, expected, check_exact=True)
+            else:
+                assert result.equals(expected)
+            print(
+                f"engine={name:<7} parallel={level:<3} {elapsed * 1000:8.1f}ms "
+                f"speedup={sequential / elapsed:5.2f}x"
+            )
+
+    timings = []
+    evaluate_expression(expression, "composite", series_data, max(levels), timings)
+    print(f"pandas nodes at parallel={max(levels)}:")
+    for timing in sorted(timings, key=lambda t: t.start_seconds):
+        entry = timing.as_dict()
+        print(
+            f"  {entry['node']:<22}start={entry['start_ms']:8.1f}ms "
+            f"{entry['duration_ms']:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: sequential vs executor-backed concurrent series reads.
+
+Reads N series (one ``series_year_month`` file per month) from local Parquet files,
+first one after another on the calling thread (the previous behaviour, where
+``scanner.to_table()`` blocked the loop), then concurrently through
+``ParquetReader.read_series_from_paths``. ``--latency-ms`` adds a per-request delay
+to approximate S3 round trips; with zero latency the scans are CPU-bound and the
+gain depends on the number of cores.
+
+    python -m benchmarks.bench_parallel_reads --series 20 --years 5 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from pyarrow.fs import FileSystem, LocalFileSystem
+
+from benchmarks._data import quiet_logging, write_series_year_month
+from benchmarks._latency_fs import latency_filesystem
+from metrics_worker.infrastructure.io.parquet_reader import ParquetReader
+
+
+def _build_reader(root: Path, filesystem: FileSystem, max_workers: int) -> ParquetReader:
+    s3_io = MagicMock()
+    # Paths are built as f"{bucket}/{key}", so a local root acts as the bucket
+    s3_io.bucket = str(root)
+    return ParquetReader(s3_io, filesystem=filesystem, max_workers=max_workers)
+
+
+def _run_sequential(reader: ParquetReader, files: dict[str, list[str]]) -> float:
+    started = time.perf_counter()
+    for series_code, paths in files.items():
+        reader._read_series_sync(paths, series_code)
+    return time.perf_counter() - started
+
+
+async def _run_concurrent(reader: ParquetReader, files: dict[str, list[str]]) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[reader.read_series_from_paths(paths, code) for code, paths in files.items()]
+    )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Run the benchmark and print wall times."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    quiet_logging()
+
+    filesystem = latency_filesystem(args.latency_ms) if args.latency_ms > 0 else LocalFileSystem()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        codes = [f"BENCH_SERIES_{idx:03d}" for idx in range(args.series)]
+        files = write_series_year_month(root, codes, periods=args.years * 365)
+
+        reader = _build_reader(root, filesystem, args.workers)
+        sequential = min(_run_sequential(reader, files) for _ in range(args.repeat))
+        concurrent = min(asyncio.run(_run_concurrent(reader, files)) for _ in range(args.repeat))
+        reader.shutdown()
+
+    print(
+        f"series={args.series} files/series={len(files[codes[0]])} "
+        f"workers={args.workers} latency_ms={args.latency_ms}"
+    )
+    print(f"sequential: {sequential:.3f}s")
+    print(f"concurrent: {concurrent:.3f}s")
+    print(f"speedup:    {sequential / concurrent:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark: memory peak of converting a scanned series to pandas.
+
+Scans one daily series (``--years`` of history, 20 by default) from local
+Parquet files, then converts the scanned table to an obs_time/value frame two
+ways. The previous conversion decodes every column with ``to_pandas()``,
+including the series code as Python strings, filters rows by code again, copies
+the frame, casts both columns and sorts. The current one is ``ParquetReader``'s
+Arrow-level conversion. Peak memory is counted over the Arrow table already in
+memory, as the peak of ``tracemalloc`` (NumPy buffers and Python objects) plus
+the peak of Arrow allocations during the conversion.
+
+With ``--single-file`` the series is one file instead of one per month, so its
+columns come out of the scan as single chunks and are not copied at all.
+
+    python -m benchmarks.bench_series_conversion --years 20
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from benchmarks._data import quiet_logging, write_series_year_month
+from metrics_worker.infrastructure.io.parquet_reader import _series_table_frame
+
+SERIES_CODE = "BENCH_SERIES_000"
+
+
+def _previous_conversion(table: pa.Table) -> pd.DataFrame:
+    """Conversion as done before Arrow-level column selection and casts."""
+    frame = table.to_pandas()
+    frame = frame[frame["internal_series_code"] == SERIES_CODE]
+    frame = frame[["obs_time", "value"]].copy()
+    frame["obs_time"] = frame["obs_time"].astype("datetime64[ns]")
+    frame["value"] = frame["value"].astype("float64")
+    return frame.sort_values("obs_time").reset_index(drop=True)
+
+
+def _current_conversion(table: pa.Table) -> pd.DataFrame:
+    return _series_table_frame(table, None, None)
+
+
+def _scan(paths: list[Path]) -> pa.Table:
+    dataset = ds.dataset([str(path) for path in paths], format="parquet")
+    return dataset.to_table(filter=ds.field("internal_series_code") == SERIES_CODE)
+
+
+_POOLS: list[pa.MemoryPool] = []
+
+
+def _measure(
+    paths: list[Path],
+    convert: Callable[[pa.Table], pd.DataFrame],
+    repeat: int,
+) -> tuple[float, int, int, pd.DataFrame]:
+    """Best wall time and largest Python and Arrow peaks over ``repeat`` conversions."""
+    best = float("inf")
+    python_peak = 0
+    arrow_peak = 0
+    frame = pd.DataFrame()
+    default_pool = pa.default_memory_pool()
+    for _ in range(repeat):
+        table = _scan(paths)
+        # A fresh proxy pool reports the Arrow peak of this conversion alone; it is
+        # kept alive because buffers allocated through it must not outlive it
+        pool = pa.proxy_memory_pool(default_pool)
+        _POOLS.append(pool)
+        pa.set_memory_pool(pool)
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            frame = convert(table)
+        finally:
+            best = min(best, time.perf_counter() - started)
+            python_peak = max(python_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            pa.set_memory_pool(default_pool)
+        arrow_peak = max(arrow_peak, pool.max_memory())
+        del table
+    return best, python_peak, arrow_peak, frame
+
+
+def main() -> None:
+    """Run the benchmark and print conversion times and memory peaks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--single-file", action="store_true")
+    args = parser.parse_args()
+    quiet_logging()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        files = write_series_year_month(root, [SERIES_CODE], periods=args.years * 365)
+        paths = [root / relative for relative in files[SERIES_CODE]]
+        if args.single_file:
+            single = root / "series.parquet"
+            pq.write_table(_scan(paths), single)
+            paths = [single]
+
+        table = _scan(paths)
+        print(
+            f"years={args.years} rows={len(table)} files={len(paths)} "
+            f"arrow_mb={table.nbytes / 2**20:.2f}"
+        )
+        del table
+
+        previous = _measure(paths, _previous_conversion, args.repeat)
+        current = _measure(paths, _current_conversion, args.repeat)
+
+    for label, (elapsed, python_peak, arrow_peak, _) in [
+        ("previous", previous),
+        ("current", current),
+    ]:
+        print(
+            f"{label:<9} {elapsed * 1000:8.2f}ms  python_peak={python_peak / 2**20:6.2f}MB "
+            f"arrow_peak={arrow_peak / 2**20:6.2f}MB"
+        )
+    assert np.array_equal(previous[3]["value"].to_numpy(), current[3]["value"].to_numpy())
+    previous_total = previous[1] + previous[2]
+    current_total = current[1] + current[2]
+    print(f"peak ratio: {previous_total / max(current_total, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: ranged Parquet reads vs whole-object fetches of small files.
+
+Reads N series stored in the ``series_year_month`` layout (one small file per
+series-month) through a local S3 stand-in where every request costs
+``--latency-ms``. The first mode scans through the filesystem: a footer read and
+pre-buffered column-chunk reads per file. The second downloads each file whole
+with one GET (``--fetch-concurrency`` in flight) and decodes it from memory,
+after listing each series directory once to learn object sizes.
+
+    python -m benchmarks.bench_small_object_fetch --series 10 --years 5 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from pyarrow.fs import PyFileSystem
+
+from benchmarks._data import quiet_logging, write_series_year_month
+from benchmarks._latency_fs import LatencyHandler, LatencyObjectStore, RequestCounter
+from metrics_worker.infrastructure.io.parquet_reader import ParquetReader
+
+
+async def _read_all(reader: ParquetReader, files: dict[str, list[str]]) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[
+            reader.read_series_from_paths(paths, code, dataset_version="bench")
+            for code, paths in files.items()
+        ]
+    )
+    return time.perf_counter() - started
+
+
+def _run_mode(
+    root: Path,
+    files: dict[str, list[str]],
+    latency_ms: float,
+    whole_object_max_bytes: int,
+    fetch_concurrency: int,
+) -> tuple[float, RequestCounter]:
+    counter = RequestCounter()
+    filesystem = PyFileSystem(LatencyHandler(latency_ms / 1000.0, counter))
+    reader = ParquetReader(
+        LatencyObjectStore(str(root), latency_ms, counter),
+        filesystem=filesystem,
+        whole_object_max_bytes=whole_object_max_bytes,
+        fetch_concurrency=fetch_concurrency,
+    )
+    try:
+        elapsed = asyncio.run(_read_all(reader, files))
+    finally:
+        reader.shutdown()
+    return elapsed, counter
+
+
+def main() -> None:
+    """Run the benchmark and print wall times and request counts."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, default=10)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--fetch-concurrency", type=int, default=64)
+    args = parser.parse_args()
+    quiet_logging()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        codes = [f"BENCH_SERIES_{idx:03d}" for idx in range(args.series)]
+        files = write_series_year_month(root, codes, periods=args.years * 365)
+        file_count = sum(len(paths) for paths in files.values())
+
+        ranged, ranged_requests = _run_mode(
+            root, files, args.latency_ms, 0, args.fetch_concurrency
+        )
+        whole, whole_requests = _run_mode(
+            root, files, args.latency_ms, 2 * 1024 * 1024, args.fetch_concurrency
+        )
+
+    print(
+        f"series={args.series} files={file_count} latency_ms={args.latency_ms} "
+        f"fetch_concurrency={args.fetch_concurrency}"
+    )
+    for label, elapsed, requests in [
+        ("ranged reads", ranged, ranged_requests),
+        ("whole object", whole, whole_requests),
+    ]:
+        print(
+            f"{label:<13} {elapsed:.3f}s  gets={requests.gets} heads={requests.heads} "
+            f"lists={requests.lists}"
+        )
+    print(f"speedup:      {ranged / whole:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
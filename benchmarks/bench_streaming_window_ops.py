@@ -0,0 +1,90 @@
+"""Benchmark: extending a window op by k points, streaming vs full recompute.
+
+Builds an hourly series of N points, computes each window op over the first N - k
+points with the streaming operator, snapshots its state, then restores and feeds
+the last k points. The extension is timed against recomputing all N points with
+the pandas-based ``window_ops``, and the concatenated streaming output is checked
+for equality with the pandas result.
+
+    python -m benchmarks.bench_streaming_window_ops --points 200000 --extend 20
+"""
+
+import argparse
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics_worker.application.services import window_ops
+from metrics_worker.application.services.streaming_window_ops import (
+    restore,
+    streaming_window_op,
+)
+
+_BATCH = {
+    "sma": window_ops.sma,
+    "ema": window_ops.ema,
+    "sum": window_ops.window_sum,
+    "max": window_ops.window_max,
+    "min": window_ops.window_min,
+}
+
+
+def _batch(op: str, series: pd.Series, window: int) -> np.ndarray:
+    if op == "lag":
+        return window_ops.lag(series, window, series.index).to_numpy()
+    return _BATCH[op](series, window).to_numpy()
+
+
+def _best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print timings per op."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=200_000)
+    parser.add_argument("--extend", type=int, default=20)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    obs_time = pd.DatetimeIndex(
+        pd.date_range("1990-01-01", periods=args.points, freq="h"), name="obs_time"
+    )
+    values = np.random.default_rng(0).normal(100.0, 5.0, size=args.points)
+    series = pd.Series(values, index=obs_time)
+    split = args.points - args.extend
+
+    print(f"points={args.points} extend={args.extend} window={args.window}")
+    header = ["op".ljust(5), "equal".ljust(6), "snapshot".rjust(10), "extend".rjust(10)]
+    print(" ".join([*header, "recompute".rjust(10), "speedup".rjust(9)]))
+    for op in ["sma", "ema", "sum", "max", "min", "lag"]:
+        expected = _batch(op, series, args.window)
+
+        operator = streaming_window_op(op, args.window)
+        head = operator.update(values[:split], obs_time[:split])
+        snapshot = operator.snapshot()
+
+        def extend(snapshot: bytes = snapshot) -> np.ndarray:
+            return restore(snapshot).update(values[split:], obs_time[split:])
+
+        streamed = np.concatenate([head, extend()])
+        equal = np.array_equal(streamed, expected, equal_nan=True)
+
+        extend_s = _best_of(args.repeat, extend)
+        recompute_s = _best_of(args.repeat, functools.partial(_batch, op, series, args.window))
+        print(
+            f"{op:<5} {equal!s:<6} {len(snapshot):>9}B {extend_s * 1e3:>8.3f}ms "
+            f"{recompute_s * 1e3:>8.3f}ms {recompute_s / extend_s:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
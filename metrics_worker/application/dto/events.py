@@ -1,13 +1,32 @@
 """Event DTOs."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from metrics_worker.domain.enums import ExpressionType
 from metrics_worker.domain.types import CatalogDict, ExpressionJson
 
 
+class OutputWindow(BaseModel):
+    """obs_time range a run recomputes; both bounds inclusive, open-ended without ``end``."""
+
+    start: datetime
+    end: datetime | None = None
+
+    @model_validator(mode="after")
+    def _check_order(self) -> "OutputWindow":
+        if self.end is not None and _as_utc(self.end) < _as_utc(self.start):
+            msg = "outputWindow.end must not be before outputWindow.start"
+            raise ValueError(msg)
+        return self
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so mixed bounds compare."""
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
 class MetricRunRequestedEvent(BaseModel):
     """Metric run requested event from Control Plane."""
 
@@ -21,6 +40,8 @@ class MetricRunRequestedEvent(BaseModel):
     inputs: list[dict[str, str]]
     catalog: CatalogDict
     output: dict[str, str]
+    # Only recompute values inside this window (full history when absent)
+    output_window: OutputWindow | None = Field(None, alias="outputWindow")
 
 
 class MetricRunStartedEvent(BaseModel):
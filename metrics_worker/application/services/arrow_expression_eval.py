@@ -0,0 +1,269 @@
+"""Expression evaluator over Arrow tables.
+
+Same expressions (the same compiled DAG) and results as ``expression_eval``,
+without converting series to pandas: operands stay ``pa.Table`` (obs_time,
+value), alignment is a full outer join on obs_time, and arithmetic runs on
+``pyarrow.compute`` kernels.
+Arrow has no rolling kernels, so window operations run the ``window_ops``
+functions over zero-copy NumPy views of the value column, which also keeps them
+bit-identical to the pandas engine.
+
+Missing values are nulls or NaNs interchangeably, as NaN is in pandas; both
+come out as NaN (or null) and are written as JSON ``null``.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from metrics_worker.application.services.expression_compiler import (
+    CompositeNode,
+    ExpressionNode,
+    NodeTiming,
+    SeriesMathNode,
+    SeriesNode,
+    WindowOpNode,
+    compile_expression,
+    evaluate_compiled,
+)
+from metrics_worker.application.services.window_ops import (
+    ema,
+    lag,
+    sma,
+    window_max,
+    window_min,
+    window_sum,
+)
+from metrics_worker.domain.enums import CompositeOp, ExpressionType, SeriesMathOp, WindowOp
+from metrics_worker.domain.errors import ExpressionEvaluationError, InvalidExpressionError
+from metrics_worker.domain.types import ExpressionJson, SeriesFrame
+
+_OBS_TIME_TYPE = pa.timestamp("ns")
+_RESULT_SCHEMA = pa.schema([("obs_time", _OBS_TIME_TYPE), ("value", pa.float64())])
+
+# Strategy pattern: Map expression types to evaluators
+_EXPRESSION_EVALUATORS: dict[ExpressionType, Callable[..., pa.Table]] = {}
+
+
+def _register_evaluator(expr_type: ExpressionType, evaluator: Callable[..., pa.Table]) -> None:
+    """Register an expression evaluator."""
+    _EXPRESSION_EVALUATORS[expr_type] = evaluator
+
+
+def evaluate_expression_arrow(
+    expression: ExpressionJson,
+    expression_type: ExpressionType | str,
+    series_data: dict[str, SeriesFrame],
+    max_parallel_nodes: int = 1,
+    timings: list[NodeTiming] | None = None,
+) -> pa.Table:
+    """Evaluate metric expression into an obs_time/value table sorted by obs_time.
+
+    Independent nodes run on up to ``max_parallel_nodes`` threads, and the time
+    of each node is appended to ``timings`` (see ``evaluate_compiled``).
+    """
+    compiled = compile_expression(expression, expression_type)
+
+    def evaluate_node(node: ExpressionNode, operands: list[pa.Table]) -> pa.Table:
+        if isinstance(node, SeriesNode):
+            return _resolve_series(node, series_data)
+        evaluator = _EXPRESSION_EVALUATORS.get(node.expression_type)
+        if not evaluator:
+            msg = f"Unknown expression type: {node.expression_type}"
+            raise InvalidExpressionError(msg)
+        return evaluator(node, *operands)
+
+    return evaluate_compiled(compiled, evaluate_node, max_parallel_nodes, timings)
+
+
+# Series math operations mapping
+_SERIES_MATH_OPS: dict[SeriesMathOp, Callable[[pa.ChunkedArray, pa.ChunkedArray], pa.Array]] = {
+    SeriesMathOp.ADD: pc.add,
+    SeriesMathOp.SUBTRACT: pc.subtract,
+    SeriesMathOp.MULTIPLY: pc.multiply,
+    SeriesMathOp.RATIO: pc.divide,
+}
+
+
+def _evaluate_series_math(node: SeriesMathNode, left: pa.Table, right: pa.Table) -> pa.Table:
+    """Evaluate series_math node."""
+    op = node.op
+    aligned = _align_tables([left, right])
+
+    operation = _SERIES_MATH_OPS.get(op)
+    if not operation:
+        msg = f"Unsupported series_math operation: {op}"
+        raise InvalidExpressionError(msg)
+
+    value = operation(aligned.column("value_0"), aligned.column("value_1"))
+
+    scale = node.scale
+    if scale is not None:
+        if not isinstance(scale, int | float):
+            msg = f"Invalid scale: {scale}"
+            raise InvalidExpressionError(msg)
+        value = pc.multiply(value, pa.scalar(float(scale)))
+
+    return _result(aligned.column("obs_time"), value)
+
+
+_register_evaluator(ExpressionType.SERIES_MATH, _evaluate_series_math)
+
+
+# Window operations mapping
+_WINDOW_OPS: dict[WindowOp, Callable[[pd.Series, int], pd.Series]] = {
+    WindowOp.SMA: sma,
+    WindowOp.EMA: ema,
+    WindowOp.SUM: window_sum,
+    WindowOp.MAX: window_max,
+    WindowOp.MIN: window_min,
+    WindowOp.LAG: lag,
+}
+
+
+def _evaluate_window_op(node: WindowOpNode, series: pa.Table) -> pa.Table:
+    """Evaluate window_op node."""
+    op = node.op
+    window = node.window
+
+    window_func = _WINDOW_OPS.get(op)
+    if not window_func:
+        msg = f"Unsupported window operation: {op}"
+        raise InvalidExpressionError(msg)
+
+    obs_time = series.column("obs_time")
+    obs_time_index = pd.DatetimeIndex(_numpy(obs_time), name="obs_time", copy=False)
+    value = pd.Series(_numpy(series.column("value")), index=obs_time_index, copy=False)
+
+    # Lag is calendar-based, so it also gets obs_time_index
+    if op == WindowOp.LAG:
+        result = lag(value, window, obs_time_index=obs_time_index)
+    else:
+        result = window_func(value, window)
+
+    return _result(obs_time, np.asarray(result, dtype="float64"))
+
+
+_register_evaluator(ExpressionType.WINDOW_OP, _evaluate_window_op)
+
+
+def _composite_sum(values: list[pa.ChunkedArray]) -> pa.Array:
+    """Row sums skipping missing values (0.0 when all are missing, like pandas).
+
+    Rows of an (obs_time, operands) array are summed in the pairwise order
+    ``DataFrame.sum(axis=1)`` uses, which Arrow's elementwise adds would not
+    reproduce beyond a few operands.
+    """
+    block = np.empty((len(values[0]), len(values)))
+    for column, value in enumerate(values):
+        block[:, column] = _numpy(pc.fill_null(value, 0.0))
+    return pa.array(block.sum(axis=1), pa.float64())
+
+
+def _composite_avg(values: list[pa.ChunkedArray]) -> pa.Array:
+    """Row means skipping missing values (NaN when all are missing)."""
+    count = pc.cast(pc.is_valid(values[0]), pa.float64())
+    for value in values[1:]:
+        count = pc.add(count, pc.cast(pc.is_valid(value), pa.float64()))
+    return pc.divide(_composite_sum(values), count)
+
+
+# Composite operations mapping, over value columns whose NaNs are already nulls
+_COMPOSITE_OPS: dict[CompositeOp, Callable[[list[pa.ChunkedArray]], pa.Array]] = {
+    CompositeOp.SUM: _composite_sum,
+    CompositeOp.AVG: _composite_avg,
+    CompositeOp.MAX: lambda values: pc.max_element_wise(*values, skip_nulls=True),
+    CompositeOp.MIN: lambda values: pc.min_element_wise(*values, skip_nulls=True),
+}
+
+
+def _evaluate_composite(node: CompositeNode, *operands: pa.Table) -> pa.Table:
+    """Evaluate composite node."""
+    op = node.op
+    aligned = _align_tables(list(operands))
+    values = [_nan_to_null(aligned.column(f"value_{idx}")) for idx in range(len(operands))]
+
+    composite_func = _COMPOSITE_OPS.get(op)
+    if not composite_func:
+        msg = f"Unsupported composite operation: {op}"
+        raise InvalidExpressionError(msg)
+
+    return _result(aligned.column("obs_time"), composite_func(values))
+
+
+_register_evaluator(ExpressionType.COMPOSITE, _evaluate_composite)
+
+
+def _resolve_series(node: SeriesNode, series_data: dict[str, SeriesFrame]) -> pa.Table:
+    """Resolve a series reference to an obs_time/value table sorted by obs_time."""
+    if node.series_code not in series_data:
+        msg = f"Series not found: {node.series_code}"
+        raise ExpressionEvaluationError(msg)
+    return _series_table(series_data[node.series_code])
+
+
+def _series_table(frame: SeriesFrame) -> pa.Table:
+    """Normalize an input series to an obs_time/value table sorted by obs_time.
+
+    Tables already in that shape (as ``ParquetReader`` returns them) are used
+    as they are; pandas frames are converted once.
+    """
+    if isinstance(frame, pd.DataFrame):
+        table = pa.Table.from_pandas(frame[["obs_time", "value"]], preserve_index=False)
+    else:
+        table = frame.select(["obs_time", "value"])
+    if table.schema.field("obs_time").type != _OBS_TIME_TYPE:
+        table = table.set_column(0, "obs_time", pc.cast(table.column(0), _OBS_TIME_TYPE))
+    if table.schema.field("value").type != pa.float64():
+        table = table.set_column(1, "value", pc.cast(table.column(1), pa.float64()))
+    if not _is_sorted(table.column("obs_time")):
+        table = table.take(pc.sort_indices(table, sort_keys=[("obs_time", "ascending")]))
+    return table
+
+
+def _align_tables(tables: list[pa.Table]) -> pa.Table:
+    """Full outer join of tables on obs_time, with value columns value_0..value_n.
+
+    Rows are sorted by obs_time; a series missing at an obs_time has a null there.
+    """
+    aligned = tables[0].rename_columns(["obs_time", "value_0"])
+    for idx, table in enumerate(tables[1:], start=1):
+        aligned = aligned.join(
+            table.rename_columns(["obs_time", f"value_{idx}"]),
+            keys="obs_time",
+            join_type="full outer",
+        )
+    return aligned.sort_by("obs_time").combine_chunks()
+
+
+def _is_sorted(obs_time: pa.ChunkedArray) -> bool:
+    """Whether obs_time is non-decreasing."""
+    values = _numpy(obs_time)
+    return bool(len(values) < 2 or (values[1:] >= values[:-1]).all())
+
+
+def _numpy(column: pa.ChunkedArray) -> npt.NDArray[Any]:
+    """NumPy view of a column (a copy only if it has several chunks or nulls)."""
+    if column.num_chunks == 1 and column.null_count == 0:
+        return np.asarray(column.chunk(0).to_numpy(zero_copy_only=False))
+    return np.asarray(column.to_numpy())
+
+
+def _nan_to_null(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Mark NaN values as null, so kernels skip them as pandas skips NaN."""
+    return pc.if_else(pc.is_nan(values), pa.scalar(None, pa.float64()), values)
+
+
+def _result(
+    obs_time: pa.ChunkedArray,
+    value: pa.Array | pa.ChunkedArray | npt.NDArray[np.float64],
+) -> pa.Table:
+    """Assemble an expression result."""
+    if isinstance(value, np.ndarray):
+        value = pa.array(value, pa.float64())
+    return pa.Table.from_arrays([obs_time, value], schema=_RESULT_SCHEMA)
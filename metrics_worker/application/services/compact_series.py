@@ -0,0 +1,169 @@
+"""Compact series representation used while evaluating expressions."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from metrics_worker.domain.types import SeriesFrame
+
+
+class CompactSeries:
+    """One series as two parallel arrays: int64 obs_time (ns, naive UTC) and float64 value.
+
+    Expression nodes pass these between each other instead of DataFrames; a
+    DataFrame is built once, for the final result. The arrays are read-only:
+    inputs are views of the caller's buffers and node results may be shared by
+    several consumers, so nodes build new arrays instead of copying defensively
+    and nothing writes to an operand. ``is_sorted``
+    records whether obs_time is non-decreasing, which every series read by
+    ``ParquetReader`` already is.
+
+    A series placed on a ``Timeline`` has the run's shared obs_time and a
+    ``mask`` of the positions it observes; its value is NaN everywhere else.
+    """
+
+    __slots__ = ("obs_time", "value", "is_sorted", "mask")
+
+    def __init__(
+        self,
+        obs_time: np.ndarray,
+        value: np.ndarray,
+        is_sorted: bool | None = None,
+        mask: np.ndarray | None = None,
+    ) -> None:
+        """Initialize series (``is_sorted`` is computed when not given)."""
+        self.obs_time = _read_only(obs_time)
+        self.value = _read_only(value)
+        self.is_sorted = _is_non_decreasing(obs_time) if is_sorted is None else is_sorted
+        self.mask = None if mask is None else _read_only(mask)
+
+    @classmethod
+    def from_frame(cls, frame: SeriesFrame) -> "CompactSeries":
+        """View the obs_time/value columns of a DataFrame or Arrow table."""
+        if isinstance(frame, pa.Table):
+            obs_time_column = frame.column("obs_time")
+            if obs_time_column.type != pa.timestamp("ns"):
+                obs_time_column = pc.cast(obs_time_column, pa.timestamp("ns"))
+            obs_time = obs_time_column.to_numpy()
+            value = frame.column("value").to_numpy().astype("float64", copy=False)
+        else:
+            obs_time = frame["obs_time"].to_numpy(dtype="datetime64[ns]")
+            value = frame["value"].to_numpy(dtype="float64")
+        return cls(obs_time.view("int64"), value)
+
+    def __len__(self) -> int:
+        """Number of observations."""
+        return len(self.obs_time)
+
+    @property
+    def is_strictly_increasing(self) -> bool:
+        """Sorted with no repeated obs_time."""
+        return self.is_sorted and bool(
+            len(self.obs_time) < 2 or (self.obs_time[1:] != self.obs_time[:-1]).all()
+        )
+
+    def sorted(self) -> "CompactSeries":
+        """This series ordered by obs_time (itself when already sorted)."""
+        if self.is_sorted:
+            return self
+        order = np.argsort(self.obs_time, kind="stable")
+        return CompactSeries(self.obs_time[order], self.value[order], is_sorted=True)
+
+    def obs_time_index(self) -> pd.DatetimeIndex:
+        """obs_time as a DatetimeIndex named ``obs_time``, sharing the array."""
+        return pd.DatetimeIndex(self.obs_time.view("datetime64[ns]"), name="obs_time", copy=False)
+
+    def observed(self) -> "CompactSeries":
+        """Just the observations of this series (views when it observes every row)."""
+        if self.mask is None:
+            return self
+        if self.mask.all():
+            return CompactSeries(self.obs_time, self.value, is_sorted=True)
+        return CompactSeries(self.obs_time[self.mask], self.value[self.mask], is_sorted=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build the obs_time/value DataFrame of the observations of this series."""
+        series = self.observed()
+        return pd.DataFrame(
+            {"obs_time": series.obs_time.view("datetime64[ns]"), "value": series.value},
+            copy=False,
+        )
+
+
+class Timeline:
+    """Sorted union of the obs_time of every series a run reads.
+
+    Series placed on it share one obs_time array, so operators combine them
+    position by position, with no merge per expression node.
+    """
+
+    __slots__ = ("obs_time", "_full_mask")
+
+    def __init__(self, obs_time: np.ndarray) -> None:
+        """Initialize timeline from a strictly increasing int64 obs_time."""
+        self.obs_time = _read_only(obs_time)
+        # Shared by every series observing the whole timeline
+        self._full_mask = _read_only(np.ones(len(obs_time), dtype=bool))
+
+    @classmethod
+    def from_series(cls, series_list: list[CompactSeries]) -> "Timeline | None":
+        """Union timeline of the series, or None if one repeats an obs_time.
+
+        Repeated obs_time cannot be placed on a timeline without losing rows.
+        """
+        if not all(series.is_strictly_increasing for series in series_list):
+            return None
+        if not series_list:
+            return cls(np.empty(0, dtype="int64"))
+        return cls(_union([series.obs_time for series in series_list]))
+
+    def place(self, series: CompactSeries) -> CompactSeries:
+        """The series on this timeline, NaN and unmasked where it has no observation."""
+        if len(series) == len(self.obs_time):
+            return CompactSeries(self.obs_time, series.value, is_sorted=True, mask=self._full_mask)
+        positions = np.searchsorted(self.obs_time, series.obs_time)
+        value = np.full(len(self.obs_time), np.nan)
+        value[positions] = series.value
+        mask = np.zeros(len(self.obs_time), dtype=bool)
+        mask[positions] = True
+        return CompactSeries(self.obs_time, value, is_sorted=True, mask=mask)
+
+
+def align(series_list: list[CompactSeries]) -> tuple[np.ndarray, np.ndarray]:
+    """Put strictly increasing series on the sorted union of their obs_time.
+
+    The union is built once, for all series, and each series is scattered into
+    its column of one preallocated (obs_time, series) array: ``values[:, i]``
+    holds series ``i`` on the union, NaN where it has no observation. Rows are
+    contiguous, the layout pandas reduces across columns.
+    """
+    obs_time = _union([series.obs_time for series in series_list])
+    values = np.full((len(obs_time), len(series_list)), np.nan)
+    for column, series in enumerate(series_list):
+        if len(series) == len(obs_time):
+            values[:, column] = series.value
+        else:
+            values[np.searchsorted(obs_time, series.obs_time), column] = series.value
+    return obs_time, values
+
+
+def _union(obs_times: list[np.ndarray]) -> np.ndarray:
+    """Sorted union of obs_time arrays, without repeats."""
+    if len(obs_times) == 1:
+        return obs_times[0]
+    return np.unique(np.concatenate(obs_times))
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """The array, or a read-only view of it (the caller's array keeps its flags)."""
+    if not array.flags.writeable:
+        return array
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _is_non_decreasing(obs_time: np.ndarray) -> bool:
+    """Whether obs_time is sorted."""
+    return bool(len(obs_time) < 2 or (obs_time[1:] >= obs_time[:-1]).all())
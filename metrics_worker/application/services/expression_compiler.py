@@ -0,0 +1,451 @@
+"""Expression compiler.
+
+Parses ``expression_json`` once into an immutable DAG of typed nodes, which the
+planner and the evaluators consume instead of walking raw dicts. Each node's
+type is inferred and validated once, at compile time. Identical subtrees are
+interned to a single node, keyed by their operation and the identity of their
+already interned operands, so e.g. ``sma(X, 30)`` used on both sides of a ratio
+is evaluated once. Compiled expressions are cached by a hash of their
+canonical JSON, so repeated runs of a metric skip parsing entirely.
+
+Nodes whose operands are ready are independent, and ``evaluate_compiled`` can
+run them on a thread pool: NumPy, pandas rolling and Arrow kernels release the
+GIL, so the branches of an expression use several cores.
+"""
+
+import hashlib
+import heapq
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import ClassVar, TypeVar
+
+from metrics_worker.domain.enums import CompositeOp, ExpressionType, SeriesMathOp, WindowOp
+from metrics_worker.domain.errors import InvalidExpressionError
+from metrics_worker.domain.types import ExpressionJson, JsonValue
+
+T = TypeVar("T")
+
+# Compiled expressions kept across runs, by expression hash and type
+_PLAN_CACHE_MAX = 256
+_plan_cache: "OrderedDict[tuple[str, ExpressionType], CompiledExpression]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True, eq=False)
+class SeriesNode:
+    """Input series reference."""
+
+    expression_type: ClassVar[ExpressionType | None] = None
+
+    series_code: str
+
+    @property
+    def operands(self) -> tuple["ExpressionNode", ...]:
+        """Nodes this node is computed from."""
+        return ()
+
+
+@dataclass(frozen=True, eq=False)
+class SeriesMathNode:
+    """Elementwise operation on two aligned operands."""
+
+    expression_type: ClassVar[ExpressionType] = ExpressionType.SERIES_MATH
+
+    op: SeriesMathOp
+    left: "ExpressionNode"
+    right: "ExpressionNode"
+    scale: JsonValue = None
+
+    @property
+    def operands(self) -> tuple["ExpressionNode", ...]:
+        """Nodes this node is computed from."""
+        return (self.left, self.right)
+
+
+@dataclass(frozen=True, eq=False)
+class WindowOpNode:
+    """Window operation over the observations of one operand."""
+
+    expression_type: ClassVar[ExpressionType] = ExpressionType.WINDOW_OP
+
+    op: WindowOp
+    window: int
+    series: "ExpressionNode"
+
+    @property
+    def operands(self) -> tuple["ExpressionNode", ...]:
+        """Nodes this node is computed from."""
+        return (self.series,)
+
+
+@dataclass(frozen=True, eq=False)
+class CompositeNode:
+    """Row-wise reduction across aligned operands."""
+
+    expression_type: ClassVar[ExpressionType] = ExpressionType.COMPOSITE
+
+    op: CompositeOp
+    operand_nodes: tuple["ExpressionNode", ...]
+
+    @property
+    def operands(self) -> tuple["ExpressionNode", ...]:
+        """Nodes this node is computed from."""
+        return self.operand_nodes
+
+
+ExpressionNode = SeriesNode | SeriesMathNode | WindowOpNode | CompositeNode
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """Expression DAG.
+
+    ``nodes`` lists every distinct node once, each after its operands, and ends
+    with ``root``.
+    """
+
+    root: ExpressionNode
+    nodes: tuple[ExpressionNode, ...]
+
+    @property
+    def series_codes(self) -> tuple[str, ...]:
+        """Codes of the series the expression reads."""
+        return tuple(node.series_code for node in self.nodes if isinstance(node, SeriesNode))
+
+    def consumer_counts(self) -> dict[ExpressionNode, int]:
+        """How many times each node is used as an operand of another node."""
+        counts = {node: 0 for node in self.nodes}
+        for node in self.nodes:
+            for operand in node.operands:
+                counts[operand] += 1
+        return counts
+
+
+@dataclass(frozen=True)
+class NodeTiming:
+    """Evaluation time of one node, relative to the start of the evaluation."""
+
+    node: ExpressionNode
+    start_seconds: float
+    seconds: float
+
+    def as_dict(self) -> dict[str, JsonValue]:
+        """Node label and times in milliseconds, for logging."""
+        return {
+            "node": node_label(self.node),
+            "start_ms": round(self.start_seconds * 1000, 3),
+            "duration_ms": round(self.seconds * 1000, 3),
+        }
+
+
+def node_label(node: ExpressionNode) -> str:
+    """Short description of a node, e.g. ``window_op:sma(30)`` or a series code."""
+    if isinstance(node, SeriesNode):
+        return node.series_code
+    label = f"{node.expression_type.value}:{node.op.value}"
+    if isinstance(node, WindowOpNode):
+        return f"{label}({node.window})"
+    return label
+
+
+def evaluate_compiled(
+    compiled: CompiledExpression,
+    evaluate_node: Callable[[ExpressionNode, list[T]], T],
+    max_parallel_nodes: int = 1,
+    timings: list[NodeTiming] | None = None,
+) -> T:
+    """Evaluate every node once, operands first, and return the root's result.
+
+    ``evaluate_node`` gets a node and its operands' results. A result is
+    dropped as soon as the last node using it has run. With
+    ``max_parallel_nodes`` above 1, nodes run on a thread pool of that size as
+    soon as their operands are ready, so ``evaluate_node`` must be thread-safe
+    and must not modify its operands. The time of each node is appended to
+    ``timings``, if given, in completion order.
+    """
+    started = time.perf_counter()
+
+    def run_node(node: ExpressionNode, operands: list[T]) -> tuple[T, NodeTiming]:
+        node_started = time.perf_counter()
+        result = evaluate_node(node, operands)
+        finished = time.perf_counter()
+        return result, NodeTiming(node, node_started - started, finished - node_started)
+
+    remaining = compiled.consumer_counts()
+    results: dict[ExpressionNode, T] = {}
+
+    def complete(node: ExpressionNode, result: T, timing: NodeTiming) -> None:
+        results[node] = result
+        if timings is not None:
+            timings.append(timing)
+        for operand in node.operands:
+            remaining[operand] -= 1
+            if remaining[operand] == 0:
+                del results[operand]
+
+    if max_parallel_nodes <= 1:
+        for node in compiled.nodes:
+            complete(node, *run_node(node, [results[operand] for operand in node.operands]))
+        return results[compiled.root]
+
+    # Ready nodes are started in topological order, so runs are reproducible
+    position = {node: index for index, node in enumerate(compiled.nodes)}
+    pending = {node: len(set(node.operands)) for node in compiled.nodes}
+    consumers: dict[ExpressionNode, list[ExpressionNode]] = {node: [] for node in compiled.nodes}
+    for node in compiled.nodes:
+        for operand in set(node.operands):
+            consumers[operand].append(node)
+    ready = [position[node] for node in compiled.nodes if pending[node] == 0]
+    heapq.heapify(ready)
+
+    running: dict[Future[tuple[T, NodeTiming]], ExpressionNode] = {}
+    executor = ThreadPoolExecutor(
+        max_workers=max_parallel_nodes,
+        thread_name_prefix="expression-node",
+    )
+    try:
+        while ready or running:
+            while ready and len(running) < max_parallel_nodes:
+                node = compiled.nodes[heapq.heappop(ready)]
+                operands = [results[operand] for operand in node.operands]
+                running[executor.submit(run_node, node, operands)] = node
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                complete(node, *future.result())
+                for consumer in consumers[node]:
+                    pending[consumer] -= 1
+                    if pending[consumer] == 0:
+                        heapq.heappush(ready, position[consumer])
+    finally:
+        # On failure, let the nodes already running finish; nothing else starts
+        executor.shutdown(wait=True)
+    return results[compiled.root]
+
+
+def compile_expression(
+    expression: ExpressionJson,
+    expression_type: ExpressionType | str,
+) -> CompiledExpression:
+    """Compile expression JSON into a DAG, reusing the plan of an identical expression."""
+    # Convert string to enum if needed
+    if isinstance(expression_type, str):
+        try:
+            expression_type = ExpressionType(expression_type)
+        except ValueError:
+            msg = f"Unknown expression type: {expression_type}"
+            raise InvalidExpressionError(msg) from None
+
+    try:
+        canonical = json.dumps(expression, sort_keys=True, separators=(",", ":"))
+    except TypeError:
+        # Not plain JSON (built in code rather than parsed): compile without caching
+        return _Compiler().compile(expression, expression_type)
+    key = (hashlib.sha256(canonical.encode("utf-8")).hexdigest(), expression_type)
+
+    with _plan_cache_lock:
+        compiled = _plan_cache.get(key)
+        if compiled is not None:
+            _plan_cache.move_to_end(key)
+            return compiled
+
+    # Invalid expressions raise here and are not cached
+    compiled = _Compiler().compile(expression, expression_type)
+    with _plan_cache_lock:
+        _plan_cache[key] = compiled
+        while len(_plan_cache) > _PLAN_CACHE_MAX:
+            _plan_cache.popitem(last=False)
+    return compiled
+
+
+class _Compiler:
+    """Single-use compiler state: interned nodes in the order they were built."""
+
+    def __init__(self) -> None:
+        """Initialize compiler."""
+        self._interned: dict[tuple[object, ...], ExpressionNode] = {}
+
+    def compile(
+        self,
+        expression: ExpressionJson,
+        expression_type: ExpressionType,
+    ) -> CompiledExpression:
+        """Compile the root expression of the given type."""
+        root = self._parse(expression, expression_type)
+        return CompiledExpression(root=root, nodes=tuple(self._interned.values()))
+
+    def _parse(
+        self,
+        expression: ExpressionJson,
+        expression_type: ExpressionType,
+    ) -> ExpressionNode:
+        """Parse and validate an expression of a known type."""
+        parsers = {
+            ExpressionType.SERIES_MATH: self._parse_series_math,
+            ExpressionType.WINDOW_OP: self._parse_window_op,
+            ExpressionType.COMPOSITE: self._parse_composite,
+        }
+        parser = parsers.get(expression_type)
+        if not parser:
+            msg = f"Unknown expression type: {expression_type}"
+            raise InvalidExpressionError(msg)
+        return parser(expression)
+
+    def _parse_series_math(self, expression: ExpressionJson) -> ExpressionNode:
+        op_str = expression.get("op")
+        if not op_str:
+            msg = "Missing operation in series_math expression"
+            raise InvalidExpressionError(msg)
+
+        try:
+            op = SeriesMathOp(op_str)
+        except ValueError:
+            msg = f"Unknown series_math op: {op_str}"
+            raise InvalidExpressionError(msg) from None
+
+        left = self._parse_operand(expression.get("left"))
+        right = self._parse_operand(expression.get("right"))
+        scale = expression.get("scale")
+        return self._intern(
+            (SeriesMathNode, op, id(left), id(right), repr(scale)),
+            lambda: SeriesMathNode(op=op, left=left, right=right, scale=scale),
+        )
+
+    def _parse_window_op(self, expression: ExpressionJson) -> ExpressionNode:
+        op_str = expression.get("op")
+        if not op_str:
+            msg = "Missing operation in window_op expression"
+            raise InvalidExpressionError(msg)
+
+        try:
+            op = WindowOp(op_str)
+        except ValueError:
+            msg = f"Unknown window_op: {op_str}"
+            raise InvalidExpressionError(msg) from None
+
+        window = expression.get("window")
+        if not isinstance(window, int) or window < 1:
+            msg = f"Invalid window: {window}"
+            raise InvalidExpressionError(msg)
+
+        series = self._parse_operand(expression.get("series"))
+        return self._intern(
+            (WindowOpNode, op, window, id(series)),
+            lambda: WindowOpNode(op=op, window=window, series=series),
+        )
+
+    def _parse_composite(self, expression: ExpressionJson) -> ExpressionNode:
+        op_str = expression.get("op")
+        if not op_str:
+            msg = "Missing operation in composite expression"
+            raise InvalidExpressionError(msg)
+
+        try:
+            op = CompositeOp(op_str)
+        except ValueError:
+            msg = f"Unknown composite op: {op_str}"
+            raise InvalidExpressionError(msg) from None
+
+        operands = expression.get("operands", [])
+        if not isinstance(operands, list) or len(operands) < 2:
+            msg = "Composite requires at least 2 operands"
+            raise InvalidExpressionError(msg)
+
+        operand_nodes = tuple(self._parse_operand(operand) for operand in operands)
+        return self._intern(
+            (CompositeNode, op, *(id(node) for node in operand_nodes)),
+            lambda: CompositeNode(op=op, operand_nodes=operand_nodes),
+        )
+
+    def _parse_operand(self, operand: JsonValue) -> ExpressionNode:
+        """Parse an operand: a series reference or a nested expression."""
+        if operand is None:
+            msg = "Missing operand"
+            raise InvalidExpressionError(msg)
+        if not isinstance(operand, dict):
+            msg = f"Cannot resolve operand: {operand}"
+            raise InvalidExpressionError(msg)
+
+        # Support both snake_case and camelCase for series_code
+        series_code = operand.get("series_code") or operand.get("seriesCode")
+        if isinstance(series_code, str) and series_code:
+            return self._intern(
+                (SeriesNode, series_code),
+                lambda: SeriesNode(series_code=series_code),
+            )
+
+        if "op" in operand:
+            op_str = operand.get("op")
+            if not isinstance(op_str, str) or not op_str:
+                msg = "Missing operation in operand"
+                raise InvalidExpressionError(msg)
+            return self._parse(operand, _infer_expression_type_from_op(op_str, operand))
+
+        msg = f"Cannot resolve operand: {operand}"
+        raise InvalidExpressionError(msg)
+
+    def _intern(
+        self,
+        key: tuple[object, ...],
+        build: Callable[[], ExpressionNode],
+    ) -> ExpressionNode:
+        """The node for ``key``, built on first use.
+
+        Operands are interned before their parents, so their identity stands
+        for their whole structure in the key.
+        """
+        node = self._interned.get(key)
+        if node is None:
+            node = build()
+            self._interned[key] = node
+        return node
+
+
+def _infer_expression_type_from_op(
+    op: str,
+    expression: ExpressionJson | None = None,
+) -> ExpressionType:
+    """Infer expression type from operation string and expression structure.
+
+    Uses structure to disambiguate operations that exist in multiple enums:
+    - window_op: requires "series" and "window" fields
+    - composite: requires "operands" array field
+    - series_math: requires "left" and "right" fields
+    """
+    # If expression structure is provided, use it to disambiguate
+    if expression is not None:
+        # window_op must have "series" and "window" fields
+        if "series" in expression and "window" in expression and _is_op(WindowOp, op):
+            return ExpressionType.WINDOW_OP
+        # composite must have "operands" array field
+        if "operands" in expression and _is_op(CompositeOp, op):
+            return ExpressionType.COMPOSITE
+        # series_math must have "left" and "right" fields
+        if "left" in expression and "right" in expression and _is_op(SeriesMathOp, op):
+            return ExpressionType.SERIES_MATH
+
+    # Fallback: try enums in order of specificity
+    # Check WindowOp first (but only if structure matches)
+    window_shaped = expression is None or ("series" in expression and "window" in expression)
+    if window_shaped and _is_op(WindowOp, op):
+        return ExpressionType.WINDOW_OP
+    if _is_op(SeriesMathOp, op):
+        return ExpressionType.SERIES_MATH
+    if _is_op(CompositeOp, op):
+        return ExpressionType.COMPOSITE
+    msg = f"Unknown operation: {op}"
+    raise InvalidExpressionError(msg)
+
+
+def _is_op(op_enum: type[WindowOp | SeriesMathOp | CompositeOp], op: str) -> bool:
+    """Whether ``op`` is a value of ``op_enum``."""
+    try:
+        op_enum(op)
+    except ValueError:
+        return False
+    return True
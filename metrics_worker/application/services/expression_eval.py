@@ -1,10 +1,31 @@
-"""Expression evaluator."""
+"""Expression evaluator.
+
+Evaluates the DAG built by ``expression_compiler``, each distinct node once.
+Nodes exchange ``CompactSeries`` (obs_time and value arrays) rather than
+DataFrames, and a DataFrame is built once, for the result. The input series
+are placed once on the union ``Timeline`` of the run, so every node combines
+positional arrays and a mask of observed rows, with no join. Inputs that
+repeat an obs_time cannot share a timeline; their operands are aligned per
+node instead, by sorted-union merge or ``pd.merge``.
+"""
 
 import operator
-from typing import Callable
+from collections.abc import Callable
 
+import numpy as np
 import pandas as pd
 
+from metrics_worker.application.services.compact_series import CompactSeries, Timeline, align
+from metrics_worker.application.services.expression_compiler import (
+    CompositeNode,
+    ExpressionNode,
+    NodeTiming,
+    SeriesMathNode,
+    SeriesNode,
+    WindowOpNode,
+    compile_expression,
+    evaluate_compiled,
+)
 from metrics_worker.application.services.window_ops import (
     ema,
     lag,
@@ -15,97 +36,61 @@ from metrics_worker.application.services.window_ops import (
 )
 from metrics_worker.domain.enums import CompositeOp, ExpressionType, SeriesMathOp, WindowOp
 from metrics_worker.domain.errors import ExpressionEvaluationError, InvalidExpressionError
-from metrics_worker.domain.types import ExpressionResult, SeriesFrame
+from metrics_worker.domain.types import ExpressionJson, ExpressionResult, SeriesFrame
 
 # Strategy pattern: Map expression types to evaluators
-_EXPRESSION_EVALUATORS: dict[ExpressionType, Callable] = {}
+_EXPRESSION_EVALUATORS: dict[ExpressionType, Callable[..., CompactSeries]] = {}
 
 
-def _register_evaluator(expr_type: ExpressionType, evaluator: Callable) -> None:
+def _register_evaluator(
+    expr_type: ExpressionType,
+    evaluator: Callable[..., CompactSeries],
+) -> None:
     """Register an expression evaluator."""
     _EXPRESSION_EVALUATORS[expr_type] = evaluator
 
 
-def _infer_expression_type_from_op(op: str, expression: dict[str, any] | None = None) -> ExpressionType:
-    """Infer expression type from operation string and expression structure.
-    
-    Uses structure to disambiguate operations that exist in multiple enums:
-    - window_op: requires "series" and "window" fields
-    - composite: requires "operands" array field
-    - series_math: requires "left" and "right" fields
-    """
-    # If expression structure is provided, use it to disambiguate
-    if expression is not None:
-        # window_op must have "series" and "window" fields
-        if "series" in expression and "window" in expression:
-            try:
-                WindowOp(op)
-                return ExpressionType.WINDOW_OP
-            except ValueError:
-                pass
-        
-        # composite must have "operands" array field
-        if "operands" in expression:
-            try:
-                CompositeOp(op)
-                return ExpressionType.COMPOSITE
-            except ValueError:
-                pass
-        
-        # series_math must have "left" and "right" fields
-        if "left" in expression and "right" in expression:
-            try:
-                SeriesMathOp(op)
-                return ExpressionType.SERIES_MATH
-            except ValueError:
-                pass
-    
-    # Fallback: try enums in order of specificity
-    # Check WindowOp first (but only if structure matches)
-    if expression is None or ("series" in expression and "window" in expression):
-        try:
-            WindowOp(op)
-            return ExpressionType.WINDOW_OP
-        except ValueError:
-            pass
-    
-    # Check SeriesMathOp
-    try:
-        SeriesMathOp(op)
-        return ExpressionType.SERIES_MATH
-    except ValueError:
-        pass
-    
-    # Check CompositeOp
-    try:
-        CompositeOp(op)
-        return ExpressionType.COMPOSITE
-    except ValueError:
-        raise InvalidExpressionError(f"Unknown operation: {op}")
-
-
 def evaluate_expression(
-    expression: dict[str, any],
+    expression: ExpressionJson,
     expression_type: ExpressionType | str,
-    series_data: dict[str, pd.DataFrame],
+    series_data: dict[str, SeriesFrame],
+    max_parallel_nodes: int = 1,
+    timings: list[NodeTiming] | None = None,
 ) -> ExpressionResult:
-    """Evaluate metric expression."""
-    # Convert string to enum if needed (for backward compatibility)
-    if isinstance(expression_type, str):
-        try:
-            expression_type = ExpressionType(expression_type)
-        except ValueError:
-            raise InvalidExpressionError(f"Unknown expression type: {expression_type}")
-    
-    evaluator = _EXPRESSION_EVALUATORS.get(expression_type)
-    if not evaluator:
-        raise InvalidExpressionError(f"Unknown expression type: {expression_type}")
-    
-    return evaluator(expression, series_data)
+    """Evaluate metric expression.
+
+    Independent nodes run on up to ``max_parallel_nodes`` threads, and the time
+    of each node is appended to ``timings`` (see ``evaluate_compiled``).
+    """
+    compiled = compile_expression(expression, expression_type)
+    series = _on_timeline(series_data)
+
+    def evaluate_node(node: ExpressionNode, operands: list[CompactSeries]) -> CompactSeries:
+        if isinstance(node, SeriesNode):
+            return _resolve_series(node, series)
+        evaluator = _EXPRESSION_EVALUATORS.get(node.expression_type)
+        if not evaluator:
+            msg = f"Unknown expression type: {node.expression_type}"
+            raise InvalidExpressionError(msg)
+        return evaluator(node, *operands)
+
+    return evaluate_compiled(compiled, evaluate_node, max_parallel_nodes, timings).to_frame()
+
+
+def _on_timeline(series_data: dict[str, SeriesFrame]) -> dict[str, CompactSeries]:
+    """Input series as compact series, placed on their union timeline when possible."""
+    compact = {
+        series_code: CompactSeries.from_frame(frame).sorted()
+        for series_code, frame in series_data.items()
+    }
+    timeline = Timeline.from_series(list(compact.values()))
+    if timeline is None:
+        return compact
+    return {series_code: timeline.place(series) for series_code, series in compact.items()}
 
 
 # Series math operations mapping
-_SERIES_MATH_OPS: dict[SeriesMathOp, Callable[[pd.Series, pd.Series], pd.Series]] = {
+_SERIES_MATH_OPS: dict[SeriesMathOp, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
     SeriesMathOp.ADD: operator.add,
     SeriesMathOp.SUBTRACT: operator.sub,
     SeriesMathOp.MULTIPLY: operator.mul,
@@ -114,37 +99,31 @@ _SERIES_MATH_OPS: dict[SeriesMathOp, Callable[[pd.Series, pd.Series], pd.Series]
 
 
 def _evaluate_series_math(
-    expression: dict[str, any],
-    series_data: dict[str, pd.DataFrame],
-) -> pd.DataFrame:
-    """Evaluate series_math expression."""
-    op_str = expression.get("op")
-    if not op_str:
-        raise InvalidExpressionError("Missing operation in series_math expression")
-    
-    try:
-        op = SeriesMathOp(op_str)
-    except ValueError:
-        raise InvalidExpressionError(f"Unknown series_math op: {op_str}")
-
-    left = _resolve_operand(expression.get("left"), series_data)
-    right = _resolve_operand(expression.get("right"), series_data)
-
-    result_df = _align_series(left, right)
+    node: SeriesMathNode,
+    left: CompactSeries,
+    right: CompactSeries,
+) -> CompactSeries:
+    """Evaluate series_math node."""
+    op = node.op
+    obs_time, left_value, right_value, mask = _align_series(left, right)
 
     # Apply operation using operator mapping
     operation = _SERIES_MATH_OPS.get(op)
     if not operation:
-        raise InvalidExpressionError(f"Unsupported series_math operation: {op}")
-    
-    result_df["value"] = operation(result_df["left_value"], result_df["right_value"])
+        msg = f"Unsupported series_math operation: {op}"
+        raise InvalidExpressionError(msg)
+
+    # Division by zero gives inf/NaN as in pandas, without warnings
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = operation(left_value, right_value)
 
     # Apply scale if present
-    scale = expression.get("scale")
+    scale = node.scale
     if scale is not None:
-        result_df["value"] = result_df["value"] * scale
+        # value is this node's own new array
+        value *= scale
 
-    return result_df[["obs_time", "value"]].copy()
+    return CompactSeries(obs_time, value, is_sorted=True, mask=mask)
 
 
 _register_evaluator(ExpressionType.SERIES_MATH, _evaluate_series_math)
@@ -161,168 +140,165 @@ _WINDOW_OPS: dict[WindowOp, Callable[[pd.Series, int], pd.Series]] = {
 }
 
 
-def _evaluate_window_op(
-    expression: dict[str, any],
-    series_data: dict[str, pd.DataFrame],
-) -> pd.DataFrame:
-    """Evaluate window_op expression."""
-    op_str = expression.get("op")
-    if not op_str:
-        raise InvalidExpressionError("Missing operation in window_op expression")
-    
-    try:
-        op = WindowOp(op_str)
-    except ValueError:
-        raise InvalidExpressionError(f"Unknown window_op: {op_str}")
-
-    window = expression.get("window")
-    if not isinstance(window, int) or window < 1:
-        raise InvalidExpressionError(f"Invalid window: {window}")
-
-    series = _resolve_operand(expression.get("series"), series_data)
-
-    series_df = series[["obs_time", "value"]].copy().sort_values("obs_time")
-    series_df = series_df.set_index("obs_time")
+def _evaluate_window_op(node: WindowOpNode, operand: CompactSeries) -> CompactSeries:
+    """Evaluate window_op node."""
+    op = node.op
+    window = node.window
 
     # Apply window operation using function mapping
     window_func = _WINDOW_OPS.get(op)
     if not window_func:
-        raise InvalidExpressionError(f"Unsupported window operation: {op}")
-    
-    # For lag operation, pass obs_time_index for calendar-based lag
+        msg = f"Unsupported window operation: {op}"
+        raise InvalidExpressionError(msg)
+
+    # Windows span the series' own observations, not the shared timeline
+    series = operand.observed().sorted()
+
+    obs_time_index = series.obs_time_index()
+    value = pd.Series(series.value, index=obs_time_index, copy=False)
+
+    # Lag is calendar-based, so it also gets obs_time_index
     if op == WindowOp.LAG:
-        result = window_func(series_df["value"], window, obs_time_index=series_df.index)
+        result = lag(value, window, obs_time_index=obs_time_index)
     else:
-        result = window_func(series_df["value"], window)
+        result = window_func(value, window)
+    result = np.asarray(result, dtype="float64")
 
-    result_df = pd.DataFrame({"obs_time": result.index, "value": result.values})
-    return result_df
+    if operand.mask is None:
+        return CompactSeries(series.obs_time, result, is_sorted=True)
+    return _on_mask(operand, result)
 
 
 _register_evaluator(ExpressionType.WINDOW_OP, _evaluate_window_op)
 
 
-# Composite operations mapping
-_COMPOSITE_OPS: dict[CompositeOp, Callable[[pd.DataFrame], pd.Series]] = {
-    CompositeOp.SUM: lambda df: df.sum(axis=1),
-    CompositeOp.AVG: lambda df: df.mean(axis=1),
-    CompositeOp.MAX: lambda df: df.max(axis=1),
-    CompositeOp.MIN: lambda df: df.min(axis=1),
-}
+def _composite_sum(values: np.ndarray) -> np.ndarray:
+    """Row sums skipping NaN (0.0 when all are NaN).
 
+    Summing each contiguous row is the (pairwise) order ``DataFrame.sum(axis=1)``
+    uses, so results match it bit for bit.
+    """
+    # Infinities are kept: only NaN counts as missing
+    np.nan_to_num(values, copy=False, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    return values.sum(axis=1)
 
-def _evaluate_composite(
-    expression: dict[str, any],
-    series_data: dict[str, pd.DataFrame],
-) -> pd.DataFrame:
-    """Evaluate composite expression."""
-    op_str = expression.get("op")
-    if not op_str:
-        raise InvalidExpressionError("Missing operation in composite expression")
-    
-    try:
-        op = CompositeOp(op_str)
-    except ValueError:
-        raise InvalidExpressionError(f"Unknown composite op: {op_str}")
 
-    operands = expression.get("operands", [])
-    if len(operands) < 2:
-        raise InvalidExpressionError("Composite requires at least 2 operands")
+def _composite_avg(values: np.ndarray) -> np.ndarray:
+    """Row means skipping NaN (NaN when all are NaN)."""
+    count = values.shape[1] - np.isnan(values).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _composite_sum(values) / count
 
-    resolved = [_resolve_operand(op, series_data) for op in operands]
 
-    result_df = _align_multiple_series(resolved)
+# Composite operations mapping: NaN-skipping reductions across the operands of
+# each row of the aligned (obs_time, operands) block, which they may overwrite
+_COMPOSITE_OPS: dict[CompositeOp, Callable[[np.ndarray], np.ndarray]] = {
+    CompositeOp.SUM: _composite_sum,
+    CompositeOp.AVG: _composite_avg,
+    CompositeOp.MAX: lambda values: np.fmax.reduce(values, axis=1),
+    CompositeOp.MIN: lambda values: np.fmin.reduce(values, axis=1),
+}
 
-    value_cols = [col for col in result_df.columns if col.startswith("value_")]
+
+def _evaluate_composite(node: CompositeNode, *operands: CompactSeries) -> CompactSeries:
+    """Evaluate composite node."""
+    op = node.op
+    obs_time, values, mask = _align_multiple_series(list(operands))
 
     # Apply composite operation using function mapping
     composite_func = _COMPOSITE_OPS.get(op)
     if not composite_func:
-        raise InvalidExpressionError(f"Unsupported composite operation: {op}")
-    
-    result_df["value"] = composite_func(result_df[value_cols])
+        msg = f"Unsupported composite operation: {op}"
+        raise InvalidExpressionError(msg)
 
-    return result_df[["obs_time", "value"]].copy()
+    value = composite_func(values)
+    if mask is not None:
+        # A sum over no observation is 0.0; rows nobody observes must stay missing
+        value[~mask] = np.nan
+    return CompactSeries(obs_time, value, is_sorted=True, mask=mask)
 
 
 _register_evaluator(ExpressionType.COMPOSITE, _evaluate_composite)
 
 
-def _resolve_operand(
-    operand: dict[str, any] | None,
-    series_data: dict[str, pd.DataFrame],
-) -> pd.DataFrame:
-    """Resolve operand to DataFrame."""
-    if operand is None:
-        raise InvalidExpressionError("Missing operand")
-
-    # Direct series reference
-    # Support both snake_case and camelCase for series_code
-    series_code = operand.get("series_code") or operand.get("seriesCode")
-    if series_code:
-        if series_code not in series_data:
-            raise ExpressionEvaluationError(f"Series not found: {series_code}")
-        return series_data[series_code].copy()
-
-    # Nested expression
-    if "op" in operand:
-        op_str = operand.get("op")
-        if not op_str:
-            raise InvalidExpressionError("Missing operation in operand")
-        
-        # Infer expression type from operation and expression structure
-        expr_type = _infer_expression_type_from_op(op_str, operand)
-        evaluator = _EXPRESSION_EVALUATORS.get(expr_type)
-        if not evaluator:
-            raise InvalidExpressionError(f"Cannot evaluate operand with type: {expr_type}")
-        
-        return evaluator(operand, series_data)
-
-    raise InvalidExpressionError(f"Cannot resolve operand: {operand}")
+def _resolve_series(node: SeriesNode, series_data: dict[str, CompactSeries]) -> CompactSeries:
+    """Resolve a series reference to its input series."""
+    if node.series_code not in series_data:
+        msg = f"Series not found: {node.series_code}"
+        raise ExpressionEvaluationError(msg)
+    return series_data[node.series_code]
 
 
 def _align_series(
-    left: pd.DataFrame,
-    right: pd.DataFrame,
-) -> pd.DataFrame:
-    """Align two series by obs_time."""
-    left_df = left[["obs_time", "value"]].copy()
-    right_df = right[["obs_time", "value"]].copy()
-
-    merged = pd.merge(
-        left_df,
-        right_df,
-        on="obs_time",
-        how="outer",
-        suffixes=("_left", "_right"),
-    ).sort_values("obs_time")
-
-    merged = merged.rename(columns={"value_left": "left_value", "value_right": "right_value"})
-    merged["obs_time"] = merged["obs_time"]
-
-    return merged
-
-
-def _align_multiple_series(series_list: list[pd.DataFrame]) -> pd.DataFrame:
-    """Align multiple series by obs_time."""
+    left: CompactSeries,
+    right: CompactSeries,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray | None]:
+    """Align two series by obs_time: (obs_time, left values, right values, mask)."""
+    if left.mask is not None and right.mask is not None:
+        # Both on the run's timeline: already aligned
+        return left.obs_time, left.value, right.value, np.logical_or(left.mask, right.mask)
+    obs_time, values, mask = _align_multiple_series([left, right])
+    return obs_time, values[:, 0], values[:, 1], mask
+
+
+def _align_multiple_series(
+    series_list: list[CompactSeries],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Align multiple series by obs_time (outer join, sorted by obs_time).
+
+    Returns the int64 obs_time, a new (obs_time, series) block of their values
+    on it (NaN where a series has none) and, for series on the run's timeline,
+    the mask of rows any of them observes. Those only need copying into the
+    block. Other series are scattered onto the union of their obs_time, and
+    those with repeated obs_time joined like ``pd.merge`` joins them (every
+    pair of matching rows), which a union cannot express.
+    """
     if not series_list:
-        raise InvalidExpressionError("Empty series list")
+        msg = "Empty series list"
+        raise InvalidExpressionError(msg)
+
+    masks = [series.mask for series in series_list if series.mask is not None]
+    if len(masks) == len(series_list):
+        obs_time = series_list[0].obs_time
+        values = np.empty((len(obs_time), len(series_list)))
+        mask = masks[0].copy()
+        for column, (series, series_mask) in enumerate(zip(series_list, masks, strict=True)):
+            values[:, column] = series.value
+            np.logical_or(mask, series_mask, out=mask)
+        return obs_time, values, mask
+
+    series_list = [series.sorted() for series in series_list]
+    if all(series.is_strictly_increasing for series in series_list):
+        return *align(series_list), None
+    return *_merge_multiple_series(series_list), None
+
+
+def _on_mask(series: CompactSeries, observed_value: np.ndarray) -> CompactSeries:
+    """Scatter values computed over a series' observations back onto its timeline."""
+    if len(observed_value) == len(series.obs_time):
+        value = observed_value
+    else:
+        value = np.full(len(series.obs_time), np.nan)
+        value[series.mask] = observed_value
+    return CompactSeries(series.obs_time, value, is_sorted=True, mask=series.mask)
 
-    result = series_list[0][["obs_time", "value"]].copy()
-    result = result.rename(columns={"value": "value_0"})
 
-    for idx, series_df in enumerate(series_list[1:], start=1):
-        series_df = series_df[["obs_time", "value"]].copy()
-        result = pd.merge(
-            result,
-            series_df,
+def _merge_multiple_series(
+    series_list: list[CompactSeries],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Outer-join series with ``pd.merge``, for series with repeated obs_time."""
+    result = series_list[0].to_frame().rename(columns={"value": "value_0"})
+
+    for idx, series in enumerate(series_list[1:], start=1):
+        result = result.merge(
+            series.to_frame().rename(columns={"value": f"value_{idx}"}),
             on="obs_time",
             how="outer",
-            suffixes=("", f"_{idx}"),
         )
-        if f"value_{idx}" not in result.columns:
-            result = result.rename(columns={"value": f"value_{idx}"})
-
-    result = result.sort_values("obs_time")
-    return result
 
+    result = result.sort_values("obs_time", kind="stable")
+    obs_time = result["obs_time"].to_numpy(dtype="datetime64[ns]").view("int64")
+    values = np.empty((len(result), len(series_list)))
+    for idx in range(len(series_list)):
+        values[:, idx] = result[f"value_{idx}"].to_numpy(dtype="float64")
+    return obs_time, values
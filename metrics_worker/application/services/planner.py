@@ -1,10 +1,43 @@
 """Planning service for data reads."""
 
 from collections import defaultdict
-
-from metrics_worker.domain.enums import CompositeOp, ExpressionType, SeriesMathOp, WindowOp
+from dataclasses import dataclass
+
+from metrics_worker.application.services.expression_compiler import (
+    CompiledExpression,
+    ExpressionNode,
+    SeriesNode,
+    WindowOpNode,
+    compile_expression,
+)
+from metrics_worker.domain.enums import ExpressionType, WindowOp
 from metrics_worker.domain.types import ExpressionJson
 
+# EMA (adjust=False) is seeded from its first value; after this many spans of
+# history the seed's weight is below e^-20, so a truncated read matches the full one
+EMA_WARMUP_SPANS = 10
+
+
+@dataclass(frozen=True)
+class Lookback:
+    """History an output value needs before its own obs_time.
+
+    ``observations`` counts input rows (rolling windows, EMA warm-up, the row a lag
+    lands on) and ``days`` calendar days (lag offsets). Reading ``observations``
+    rows before ``start - days`` covers any order in which the two were nested.
+    """
+
+    observations: int = 0
+    days: int = 0
+
+    def extend(self, observations: int = 0, days: int = 0) -> "Lookback":
+        """Lookback of an operand whose result feeds an op needing this much more."""
+        return Lookback(self.observations + observations, self.days + days)
+
+    def union(self, other: "Lookback") -> "Lookback":
+        """Lookback covering both requirements (a series used in several places)."""
+        return Lookback(max(self.observations, other.observations), max(self.days, other.days))
+
 
 class ReadPlan:
     """Plan for reading series data."""
@@ -13,6 +46,7 @@ class ReadPlan:
         """Initialize read plan."""
         self.series_by_dataset: dict[str, list[str]] = defaultdict(list)
         self.columns: set[str] = {"obs_time", "value", "internal_series_code"}
+        self.lookbacks: dict[str, Lookback] = {}
 
     def add_series(self, dataset_id: str, series_code: str) -> None:
         """Add series to read plan."""
@@ -22,6 +56,10 @@ class ReadPlan:
         """Get series codes for dataset."""
         return self.series_by_dataset.get(dataset_id, [])
 
+    def get_lookback(self, series_code: str) -> Lookback:
+        """Get the history a series needs before the output window."""
+        return self.lookbacks.get(series_code, Lookback())
+
 
 def plan_reads(
     expression: ExpressionJson,
@@ -36,107 +74,37 @@ def plan_reads(
         series_code = input_item["seriesCode"]
         plan.add_series(dataset_id, series_code)
 
-    # Convert string to enum if needed
-    if isinstance(expression_type, str):
-        expression_type = ExpressionType(expression_type)
-    
-    _extract_series_from_expression(expression, expression_type, plan)
+    compiled = compile_expression(expression, expression_type)
+    plan.lookbacks.update(_collect_lookbacks(compiled))
 
     return plan
 
 
-def _extract_series_from_expression(
-    expression: ExpressionJson,
-    expression_type: ExpressionType,
-    plan: ReadPlan,
-) -> None:
-    """Recursively extract series references from expression."""
-    if expression_type == ExpressionType.SERIES_MATH:
-        left = expression.get("left", {})
-        right = expression.get("right", {})
-        if "series_code" in left:
-            pass
-        elif "op" in left:
-            _extract_series_from_expression(left, _infer_type(left), plan)
-        if "series_code" in right:
-            pass
-        elif "op" in right:
-            _extract_series_from_expression(right, _infer_type(right), plan)
-
-    elif expression_type == ExpressionType.WINDOW_OP:
-        series = expression.get("series", {})
-        if "series_code" in series:
-            pass
-        elif "op" in series:
-            _extract_series_from_expression(series, _infer_type(series), plan)
-
-    elif expression_type == ExpressionType.COMPOSITE:
-        operands = expression.get("operands", [])
-        for operand in operands:
-            if "series_code" in operand:
-                pass
-            elif "op" in operand:
-                _extract_series_from_expression(operand, _infer_type(operand), plan)
-
-
-def _infer_type(expr: ExpressionJson) -> ExpressionType:
-    """Infer expression type from structure.
-    
-    Uses structure to disambiguate operations that exist in multiple enums:
-    - window_op: requires "series" and "window" fields
-    - composite: requires "operands" array field
-    - series_math: requires "left" and "right" fields
-    """
-    op = expr.get("op", "")
-    if not op:
-        return ExpressionType.SERIES_MATH  # Default fallback
-    
-    # Use structure to disambiguate operations that exist in multiple enums
-    # window_op must have "series" and "window" fields
-    if "series" in expr and "window" in expr:
-        try:
-            WindowOp(op)
-            return ExpressionType.WINDOW_OP
-        except ValueError:
-            pass
-    
-    # composite must have "operands" array field
-    if "operands" in expr:
-        try:
-            CompositeOp(op)
-            return ExpressionType.COMPOSITE
-        except ValueError:
-            pass
-    
-    # series_math must have "left" and "right" fields
-    if "left" in expr and "right" in expr:
-        try:
-            SeriesMathOp(op)
-            return ExpressionType.SERIES_MATH
-        except ValueError:
-            pass
-    
-    # Fallback: try enums in order of specificity
-    # Check WindowOp first (but only if structure matches)
-    if "series" in expr and "window" in expr:
-        try:
-            WindowOp(op)
-            return ExpressionType.WINDOW_OP
-        except ValueError:
-            pass
-    
-    try:
-        SeriesMathOp(op)
-        return ExpressionType.SERIES_MATH
-    except ValueError:
-        pass
-    
-    try:
-        CompositeOp(op)
-        return ExpressionType.COMPOSITE
-    except ValueError:
-        pass
-    
-    # Default fallback
-    return ExpressionType.SERIES_MATH
+def _collect_lookbacks(compiled: CompiledExpression) -> dict[str, Lookback]:
+    """Push the lookback each node needs down to every series leaf.
 
+    Nodes are visited root first, so a node shared by several parents has the
+    union of their needs before passing it on to its own operands.
+    """
+    needed: dict[ExpressionNode, Lookback] = {compiled.root: Lookback()}
+    lookbacks: dict[str, Lookback] = {}
+    for node in reversed(compiled.nodes):
+        node_needs = needed.get(node, Lookback())
+        if isinstance(node, SeriesNode):
+            lookbacks[node.series_code] = node_needs
+            continue
+        if isinstance(node, WindowOpNode):
+            node_needs = _window_lookback(node, node_needs)
+        for operand in node.operands:
+            needed[operand] = needed.get(operand, Lookback()).union(node_needs)
+    return lookbacks
+
+
+def _window_lookback(node: WindowOpNode, needed: Lookback) -> Lookback:
+    """Lookback the operand of a window_op needs, given what its output needs."""
+    if node.op == WindowOp.LAG:
+        # The last row at or before obs_time - window days
+        return needed.extend(observations=1, days=node.window)
+    if node.op == WindowOp.EMA:
+        return needed.extend(observations=EMA_WARMUP_SPANS * node.window)
+    return needed.extend(observations=node.window - 1)
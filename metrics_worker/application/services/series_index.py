@@ -0,0 +1,119 @@
+"""Series-to-file index over a dataset manifest."""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+# ``series_year_month`` layout: <SERIES_CODE>/year=<YYYY>/month=<MM>/<file>.parquet
+_PARTITION_RE = re.compile(r"^(?P<code>[^/]+)/year=(?P<year>\d{4})/month=(?P<month>\d{1,2})/")
+
+
+@dataclass(frozen=True)
+class SeriesFile:
+    """A parquet file of one series with the calendar month it covers."""
+
+    path: str
+    year: int
+    month: int
+
+    @property
+    def month_key(self) -> int:
+        """Months since year 0, the sort key of the file."""
+        return _month_key(self.year, self.month)
+
+
+@dataclass
+class _SeriesFiles:
+    """Files of one series sorted by month, with a parallel list of month keys."""
+
+    files: list[SeriesFile] = field(default_factory=list)
+    month_keys: list[int] = field(default_factory=list)
+    # Files outside the partition layout that name the series in a path segment
+    unpartitioned: list[str] = field(default_factory=list)
+
+
+class SeriesFileIndex:
+    """Map series codes to their parquet files, built once per manifest version.
+
+    Files following the ``series_year_month`` layout are matched on the exact
+    series segment (``X_D`` never matches ``X_D_ADJ/...``) and kept sorted by month,
+    so time-range lookups are two bisections. Files outside that layout are matched
+    when one of their path segments (or the file stem) equals the series code.
+    """
+
+    def __init__(self, parquet_files: list[str]) -> None:
+        """Build the index from a manifest's ``parquet_files`` list."""
+        self._series: dict[str, _SeriesFiles] = {}
+        partitioned: dict[str, list[SeriesFile]] = {}
+
+        for path in parquet_files:
+            match = _PARTITION_RE.match(path)
+            if match:
+                series_file = SeriesFile(path, int(match["year"]), int(match["month"]))
+                partitioned.setdefault(match["code"], []).append(series_file)
+                continue
+            for code in _path_codes(path):
+                self._entry(code).unpartitioned.append(path)
+
+        for code, files in partitioned.items():
+            files.sort(key=lambda f: (f.month_key, f.path))
+            entry = self._entry(code)
+            entry.files = files
+            entry.month_keys = [f.month_key for f in files]
+
+    def __contains__(self, series_code: object) -> bool:
+        """Return whether the manifest lists any file for ``series_code``."""
+        return series_code in self._series
+
+    @property
+    def series_codes(self) -> list[str]:
+        """Series codes present in the index."""
+        return sorted(self._series)
+
+    def files_for(
+        self,
+        series_code: str,
+        start: date | datetime | None = None,
+        end: date | datetime | None = None,
+    ) -> list[str]:
+        """Return the files of ``series_code`` whose month overlaps [start, end].
+
+        Both bounds are inclusive and optional. Files outside the partition layout
+        have no known month and are always returned.
+        """
+        entry = self._series.get(series_code)
+        if entry is None:
+            return []
+
+        lo = 0 if start is None else bisect_left(entry.month_keys, _month_key(start.year, start.month))
+        hi = (
+            len(entry.files)
+            if end is None
+            else bisect_right(entry.month_keys, _month_key(end.year, end.month))
+        )
+        return [f.path for f in entry.files[lo:hi]] + entry.unpartitioned
+
+    def month_bounds(self, series_code: str) -> tuple[tuple[int, int], tuple[int, int]] | None:
+        """Return the first and last (year, month) partition of ``series_code``."""
+        entry = self._series.get(series_code)
+        if entry is None or not entry.files:
+            return None
+        first, last = entry.files[0], entry.files[-1]
+        return (first.year, first.month), (last.year, last.month)
+
+    def _entry(self, series_code: str) -> _SeriesFiles:
+        return self._series.setdefault(series_code, _SeriesFiles())
+
+
+def _month_key(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+
+def _path_codes(path: str) -> set[str]:
+    """Candidate series codes of a path outside the partition layout."""
+    segments = [segment for segment in path.split("/") if segment]
+    codes = {segment for segment in segments[:-1] if "=" not in segment}
+    if segments:
+        codes.add(segments[-1].rsplit(".", 1)[0])
+    return codes
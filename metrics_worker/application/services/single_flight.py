@@ -0,0 +1,42 @@
+"""Single-flight deduplication of concurrent async loads."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call per key between concurrent callers.
+
+    The first caller for a key starts the load; callers arriving while it runs await
+    the same result (or exception). Different keys load concurrently. Nothing is
+    cached once the call finishes, so a later call starts a fresh load.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of keys currently in flight."""
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Run ``load`` for ``key`` unless a call for it is already in flight.
+
+        The load runs in its own task and is shielded from each caller, so a
+        cancelled caller does not cancel the load for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        """Drop ``key`` once its task finished, unless a newer call replaced it."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
@@ -0,0 +1,452 @@
+"""Streaming (stateful) counterparts of the window operations.
+
+Each operator consumes a series in chunks and carries just enough state to
+continue where it stopped, so extending a series by ``k`` points costs O(k)
+instead of recomputing all ``n``. Outputs match ``window_ops`` exactly: rolling
+sums and means replay pandas' compensated add/remove algorithm, max/min use a
+monotonic deque, EMA carries the ``adjust=False`` accumulator and lag keeps a
+time-ordered buffer of the last ``window`` days.
+
+State can be serialized with ``snapshot()`` and resumed with ``restore()``.
+"""
+
+import json
+import math
+import struct
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import ClassVar
+
+import numpy as np
+import numpy.typing as npt
+
+from metrics_worker.domain.enums import WindowOp
+from metrics_worker.domain.errors import ExpressionEvaluationError
+
+_MAGIC = b"SWOP"
+_HEADER = struct.Struct("<4sI")
+_NS_PER_DAY = 86_400 * 10**9
+
+Scalar = int | float
+
+
+class StreamingWindowOp(ABC):
+    """Window operator that is fed a series chunk by chunk."""
+
+    op: ClassVar[WindowOp]
+
+    def __init__(self, window: int) -> None:
+        """Initialize empty state."""
+        if window < 1:
+            msg = f"Window must be >= 1, got {window}"
+            raise ExpressionEvaluationError(msg)
+        self.window = window
+
+    @abstractmethod
+    def update(
+        self,
+        values: npt.ArrayLike,
+        obs_time: npt.ArrayLike | None = None,
+    ) -> np.ndarray:
+        """Consume the next points (oldest first) and return their outputs."""
+
+    def snapshot(self) -> bytes:
+        """Serialize the operator state."""
+        scalars, arrays = self._state()
+        header = json.dumps(
+            {
+                "op": self.op.value,
+                "window": self.window,
+                "scalars": scalars,
+                "arrays": [[name, array.dtype.str, len(array)] for name, array in arrays.items()],
+            }
+        ).encode("utf-8")
+        body = b"".join(np.ascontiguousarray(array).tobytes() for array in arrays.values())
+        return _HEADER.pack(_MAGIC, len(header)) + header + body
+
+    @abstractmethod
+    def _state(self) -> tuple[dict[str, Scalar], dict[str, np.ndarray]]:
+        """Return scalar and array state for ``snapshot``."""
+
+    @abstractmethod
+    def _load(self, scalars: dict[str, Scalar], arrays: dict[str, np.ndarray]) -> None:
+        """Restore state produced by ``_state``."""
+
+
+class _RollingCompensated(StreamingWindowOp):
+    """Rolling sum/mean with Kahan-compensated adds and removes (as pandas)."""
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        self._ring = np.full(window, np.nan)
+        self._count = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._nobs = 0
+        self._neg_ct = 0
+        self._same_run = 0
+        self._prev = math.nan
+
+    def update(
+        self,
+        values: npt.ArrayLike,
+        obs_time: npt.ArrayLike | None = None,  # noqa: ARG002
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype="float64")
+        out = np.empty(len(values))
+        window = self.window
+        ring = self._ring
+        for idx, val in enumerate(values.tolist()):
+            slot = self._count % window
+            if self._count == 0 or window == 1:
+                self._sum = self._comp_add = self._comp_remove = 0.0
+                self._nobs = self._neg_ct = self._same_run = 0
+                self._prev = val
+            elif self._count >= window:
+                self._remove(ring[slot])
+            self._add(val)
+            ring[slot] = val
+            self._count += 1
+            out[idx] = self._result()
+        return out
+
+    def _add(self, val: float) -> None:
+        # NaN check without a function call per point
+        if val != val:  # noqa: PLR0124
+            return
+        self._nobs += 1
+        y = val - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct += 1
+        if val == self._prev:
+            self._same_run += 1
+        else:
+            self._same_run = 1
+        self._prev = val
+
+    def _remove(self, val: float) -> None:
+        if val != val:  # noqa: PLR0124
+            return
+        self._nobs -= 1
+        y = -val - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct -= 1
+
+    @abstractmethod
+    def _result(self) -> float:
+        """Output for the window ending at the last added point."""
+
+    def _state(self) -> tuple[dict[str, Scalar], dict[str, np.ndarray]]:
+        scalars = {
+            "count": self._count,
+            "sum": self._sum,
+            "comp_add": self._comp_add,
+            "comp_remove": self._comp_remove,
+            "nobs": self._nobs,
+            "neg_ct": self._neg_ct,
+            "same_run": self._same_run,
+            "prev": self._prev,
+        }
+        return scalars, {"ring": self._ring}
+
+    def _load(self, scalars: dict[str, Scalar], arrays: dict[str, np.ndarray]) -> None:
+        self._ring = arrays["ring"].copy()
+        self._count = int(scalars["count"])
+        self._sum = float(scalars["sum"])
+        self._comp_add = float(scalars["comp_add"])
+        self._comp_remove = float(scalars["comp_remove"])
+        self._nobs = int(scalars["nobs"])
+        self._neg_ct = int(scalars["neg_ct"])
+        self._same_run = int(scalars["same_run"])
+        self._prev = float(scalars["prev"])
+
+
+class StreamingSum(_RollingCompensated):
+    """Streaming ``window_sum``."""
+
+    op = WindowOp.SUM
+
+    def _result(self) -> float:
+        if self._nobs < self.window:
+            return math.nan
+        if self._same_run >= self._nobs:
+            return self._prev * self._nobs
+        return self._sum
+
+
+class StreamingSMA(_RollingCompensated):
+    """Streaming ``sma``."""
+
+    op = WindowOp.SMA
+
+    def _result(self) -> float:
+        nobs = self._nobs
+        if nobs < self.window:
+            return math.nan
+        if self._same_run >= nobs:
+            return self._prev
+        result = self._sum / nobs
+        # All-positive or all-negative windows cannot average to the other sign
+        if (self._neg_ct == 0 and result < 0) or (self._neg_ct == nobs and result > 0):
+            return 0.0
+        return result
+
+
+class _RollingExtreme(StreamingWindowOp):
+    """Rolling max/min over a monotonic deque of (position, value)."""
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        self._count = 0
+        self._candidates: deque[tuple[int, float]] = deque()
+        self._nan_positions: deque[int] = deque()
+
+    @staticmethod
+    @abstractmethod
+    def _dominates(new: float, old: float) -> bool:
+        """Whether ``new`` makes ``old`` irrelevant for every later window."""
+
+    def update(
+        self,
+        values: npt.ArrayLike,
+        obs_time: npt.ArrayLike | None = None,  # noqa: ARG002
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype="float64")
+        out = np.empty(len(values))
+        candidates = self._candidates
+        nan_positions = self._nan_positions
+        for idx, val in enumerate(values.tolist()):
+            position = self._count
+            if val != val:  # noqa: PLR0124
+                nan_positions.append(position)
+            else:
+                while candidates and self._dominates(val, candidates[-1][1]):
+                    candidates.pop()
+                candidates.append((position, val))
+            oldest = position - self.window + 1
+            while candidates and candidates[0][0] < oldest:
+                candidates.popleft()
+            while nan_positions and nan_positions[0] < oldest:
+                nan_positions.popleft()
+            self._count += 1
+            if oldest < 0 or nan_positions:
+                out[idx] = math.nan
+            else:
+                out[idx] = candidates[0][1]
+        return out
+
+    def _state(self) -> tuple[dict[str, Scalar], dict[str, np.ndarray]]:
+        positions = np.array([pos for pos, _ in self._candidates], dtype="int64")
+        values = np.array([val for _, val in self._candidates], dtype="float64")
+        nan_positions = np.array(self._nan_positions, dtype="int64")
+        arrays = {"positions": positions, "values": values, "nan_positions": nan_positions}
+        return {"count": self._count}, arrays
+
+    def _load(self, scalars: dict[str, Scalar], arrays: dict[str, np.ndarray]) -> None:
+        self._count = int(scalars["count"])
+        self._candidates = deque(
+            zip(arrays["positions"].tolist(), arrays["values"].tolist(), strict=True)
+        )
+        self._nan_positions = deque(arrays["nan_positions"].tolist())
+
+
+class StreamingMax(_RollingExtreme):
+    """Streaming ``window_max``."""
+
+    op = WindowOp.MAX
+
+    @staticmethod
+    def _dominates(new: float, old: float) -> bool:
+        return new >= old
+
+
+class StreamingMin(_RollingExtreme):
+    """Streaming ``window_min``."""
+
+    op = WindowOp.MIN
+
+    @staticmethod
+    def _dominates(new: float, old: float) -> bool:
+        return new <= old
+
+
+class StreamingEMA(StreamingWindowOp):
+    """Streaming ``ema`` (``ewm(span=window, adjust=False).mean()``)."""
+
+    op = WindowOp.EMA
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        # Same derivation as pandas: span -> center of mass -> alpha
+        com = (window - 1) / 2.0
+        self._alpha = 1.0 / (1.0 + com)
+        self._started = False
+        self._weighted = math.nan
+        self._old_wt = 1.0
+        self._nobs = 0
+
+    def update(
+        self,
+        values: npt.ArrayLike,
+        obs_time: npt.ArrayLike | None = None,  # noqa: ARG002
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype="float64")
+        out = np.empty(len(values))
+        alpha = self._alpha
+        old_wt_factor = 1.0 - alpha
+        for idx, cur in enumerate(values.tolist()):
+            is_observation = cur == cur  # noqa: PLR0124
+            if not self._started:
+                self._started = True
+                self._weighted = cur
+                self._nobs = int(is_observation)
+                self._old_wt = 1.0
+            else:
+                self._nobs += is_observation
+                weighted = self._weighted
+                if weighted == weighted:  # noqa: PLR0124
+                    self._old_wt *= old_wt_factor
+                    if is_observation:
+                        if weighted != cur:
+                            weighted = self._old_wt * weighted + alpha * cur
+                            weighted /= self._old_wt + alpha
+                        self._old_wt = 1.0
+                elif is_observation:
+                    weighted = cur
+                self._weighted = weighted
+            out[idx] = self._weighted if self._nobs >= 1 else math.nan
+        return out
+
+    def _state(self) -> tuple[dict[str, Scalar], dict[str, np.ndarray]]:
+        scalars = {
+            "started": int(self._started),
+            "weighted": self._weighted,
+            "old_wt": self._old_wt,
+            "nobs": self._nobs,
+        }
+        return scalars, {}
+
+    def _load(
+        self,
+        scalars: dict[str, Scalar],
+        arrays: dict[str, np.ndarray],  # noqa: ARG002
+    ) -> None:
+        self._started = bool(scalars["started"])
+        self._weighted = float(scalars["weighted"])
+        self._old_wt = float(scalars["old_wt"])
+        self._nobs = int(scalars["nobs"])
+
+
+class StreamingLag(StreamingWindowOp):
+    """Streaming calendar-day ``lag``.
+
+    Each output is the value of the last observation at or before
+    ``obs_time - window days``. Only observations that can still be that answer for
+    a later point are kept, i.e. roughly the last ``window`` days.
+    """
+
+    op = WindowOp.LAG
+
+    def __init__(self, window: int) -> None:
+        super().__init__(window)
+        self._times: deque[int] = deque()
+        self._values: deque[float] = deque()
+        self._last_time: int | None = None
+
+    def update(
+        self,
+        values: npt.ArrayLike,
+        obs_time: npt.ArrayLike | None = None,
+    ) -> np.ndarray:
+        if obs_time is None:
+            msg = "Streaming lag requires obs_time"
+            raise ExpressionEvaluationError(msg)
+        values = np.asarray(values, dtype="float64")
+        times = np.asarray(obs_time, dtype="datetime64[ns]").astype("int64")
+        if len(times) != len(values):
+            msg = f"Series length ({len(values)}) must match obs_time length ({len(times)})"
+            raise ExpressionEvaluationError(msg)
+        out = np.empty(len(values))
+        offset = self.window * _NS_PER_DAY
+        buffered_times = self._times
+        buffered_values = self._values
+        for idx, (time_ns, val) in enumerate(zip(times.tolist(), values.tolist(), strict=True)):
+            if self._last_time is not None and time_ns < self._last_time:
+                msg = "Streaming lag requires increasing obs_time"
+                raise ExpressionEvaluationError(msg)
+            self._last_time = time_ns
+            buffered_times.append(time_ns)
+            buffered_values.append(val)
+            target = time_ns - offset
+            # Targets only move forward: an entry followed by another at or before
+            # the target can never be the answer again
+            while len(buffered_times) > 1 and buffered_times[1] <= target:
+                buffered_times.popleft()
+                buffered_values.popleft()
+            out[idx] = buffered_values[0] if buffered_times[0] <= target else math.nan
+        return out
+
+    def _state(self) -> tuple[dict[str, Scalar], dict[str, np.ndarray]]:
+        arrays = {
+            "times": np.array(self._times, dtype="int64"),
+            "values": np.array(self._values, dtype="float64"),
+        }
+        last_time = -1 if self._last_time is None else self._last_time
+        return {"has_last": int(self._last_time is not None), "last_time": last_time}, arrays
+
+    def _load(self, scalars: dict[str, Scalar], arrays: dict[str, np.ndarray]) -> None:
+        self._times = deque(arrays["times"].tolist())
+        self._values = deque(arrays["values"].tolist())
+        self._last_time = int(scalars["last_time"]) if scalars["has_last"] else None
+
+
+_STREAMING_OPS: dict[WindowOp, type[StreamingWindowOp]] = {
+    WindowOp.SMA: StreamingSMA,
+    WindowOp.EMA: StreamingEMA,
+    WindowOp.SUM: StreamingSum,
+    WindowOp.MAX: StreamingMax,
+    WindowOp.MIN: StreamingMin,
+    WindowOp.LAG: StreamingLag,
+}
+
+
+def streaming_window_op(op: WindowOp | str, window: int) -> StreamingWindowOp:
+    """Create an empty streaming operator for a window_op."""
+    try:
+        op = WindowOp(op)
+    except ValueError:
+        msg = f"Unknown window_op: {op}"
+        raise ExpressionEvaluationError(msg) from None
+    return _STREAMING_OPS[op](window)
+
+
+def restore(snapshot: bytes) -> StreamingWindowOp:
+    """Rebuild an operator from ``StreamingWindowOp.snapshot()`` output."""
+    if len(snapshot) < _HEADER.size:
+        msg = "Truncated window operator snapshot"
+        raise ExpressionEvaluationError(msg)
+    magic, header_len = _HEADER.unpack_from(snapshot)
+    if magic != _MAGIC:
+        msg = "Not a window operator snapshot"
+        raise ExpressionEvaluationError(msg)
+    offset = _HEADER.size
+    header = json.loads(snapshot[offset : offset + header_len].decode("utf-8"))
+    offset += header_len
+
+    arrays: dict[str, np.ndarray] = {}
+    for name, dtype_str, length in header["arrays"]:
+        dtype = np.dtype(dtype_str)
+        size = dtype.itemsize * length
+        arrays[name] = np.frombuffer(snapshot, dtype=dtype, count=length, offset=offset).copy()
+        offset += size
+
+    operator = streaming_window_op(header["op"], header["window"])
+    operator._load(header["scalars"], arrays)
+    return operator
@@ -2,7 +2,7 @@
 
 from metrics_worker.domain.entities import MetricOutputManifest
 from metrics_worker.domain.ports import ClockPort
-from metrics_worker.domain.types import Timestamp
+from metrics_worker.domain.types import JsonValue, Timestamp
 
 
 async def run(
@@ -13,6 +13,8 @@ async def run(
     output_files: list[str],
     data_prefix: str,
     clock: ClockPort,
+    expression_hash: str | None = None,
+    output_window: dict[str, JsonValue] | None = None,
 ) -> MetricOutputManifest:
     """Build output manifest."""
     created_at: Timestamp = clock.now()
@@ -27,6 +29,8 @@ async def run(
             "data_prefix": data_prefix,
             "files": output_files,
         },
+        expression_hash=expression_hash,
+        output_window=output_window,
     )
 
     return manifest
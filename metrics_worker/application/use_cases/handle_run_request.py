@@ -1,15 +1,26 @@
 """Handle metric run request - main orchestration."""
 
 import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
 from dataclasses import dataclass
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import structlog
 
 from metrics_worker.application.dto.catalog import DatasetManifest
-from metrics_worker.application.dto.events import MetricRunRequestedEvent
+from metrics_worker.application.dto.events import MetricRunRequestedEvent, OutputWindow
+from metrics_worker.application.services.arrow_expression_eval import evaluate_expression_arrow
+from metrics_worker.application.services.expression_compiler import NodeTiming
 from metrics_worker.application.services.expression_eval import evaluate_expression
-from metrics_worker.application.services.planner import ReadPlan, plan_reads
+from metrics_worker.application.services.planner import Lookback, ReadPlan, plan_reads
+from metrics_worker.application.services.series_index import SeriesFileIndex
+from metrics_worker.application.services.single_flight import SingleFlight
 from metrics_worker.application.use_cases.build_output_manifest import run as build_manifest
 from metrics_worker.application.use_cases.publish_completed import (
     run_failure,
@@ -20,6 +31,7 @@ from metrics_worker.application.use_cases.validate_output_manifest import (
     run as validate_manifest,
 )
 from metrics_worker.domain.entities import MetricOutputManifest
+from metrics_worker.domain.enums import ExpressionEngine
 from metrics_worker.domain.ports import (
     CatalogPort,
     ClockPort,
@@ -27,11 +39,39 @@ from metrics_worker.domain.ports import (
     EventBusPort,
     OutputWriterPort,
 )
-from metrics_worker.domain.types import SeriesFrame
+from metrics_worker.domain.types import (
+    CatalogDict,
+    DatasetManifestDict,
+    ExpressionResult,
+    JsonValue,
+    SeriesFrame,
+    Timestamp,
+)
 from metrics_worker.infrastructure.aws.s3_path import S3Path
 
 logger = structlog.get_logger()
 
+# Parsed manifests keyed by (dataset_id, version_id), together with the dict they were
+# parsed from. The catalog hands back the same dict while its cached copy is still
+# valid, so repeated runs against an unchanged manifest skip pydantic validation.
+_PARSED_MANIFESTS_MAX = 64
+_parsed_manifests: OrderedDict[
+    tuple[str, str], tuple[DatasetManifestDict, DatasetManifest]
+] = OrderedDict()
+
+# Series-to-file indexes, built once per parsed manifest (same keying as above)
+_series_indexes: OrderedDict[
+    tuple[str, str], tuple[DatasetManifest, SeriesFileIndex]
+] = OrderedDict()
+
+# Manifest loads in flight across all runs in this worker, keyed by manifest path
+_manifest_flights: SingleFlight[DatasetManifest] = SingleFlight()
+
+_EXPRESSION_ENGINES = {
+    ExpressionEngine.PANDAS: evaluate_expression,
+    ExpressionEngine.ARROW: evaluate_expression_arrow,
+}
+
 
 @dataclass
 class _OutputPaths:
@@ -44,6 +84,29 @@ class _OutputPaths:
     manifest_relative_path: str
 
 
+@dataclass(frozen=True)
+class RunOptions:
+    """Tunables applied to a single metric run."""
+
+    max_concurrent_series_reads: int = 16
+    # Extend the previous output instead of recomputing the full history
+    incremental: bool = False
+    # Trailing days of the previous output that are recomputed (late revisions)
+    incremental_restate_days: int = 7
+    # Backend evaluating the expression; "arrow" keeps series as pa.Table throughout
+    expression_engine: ExpressionEngine = ExpressionEngine.PANDAS
+    # Independent expression nodes evaluated at once, each on its own thread
+    max_parallel_expression_nodes: int = 1
+
+
+@dataclass(frozen=True)
+class _PreviousOutput:
+    """Output of the last run that an incremental run extends."""
+
+    frame: pd.DataFrame
+    tail_start: pd.Timestamp
+
+
 async def run(
     event: MetricRunRequestedEvent,
     catalog: CatalogPort,
@@ -51,8 +114,10 @@ async def run(
     output_writer: OutputWriterPort,
     event_bus: EventBusPort,
     clock: ClockPort,
+    options: RunOptions | None = None,
 ) -> None:
     """Handle metric run request."""
+    options = options or RunOptions()
     run_id = event.run_id
     metric_code = event.metric_code
 
@@ -67,18 +132,33 @@ async def run(
             event.inputs,
         )
 
+        expression_hash = _expression_hash(event)
+        output_window = event.output_window
+        previous: _PreviousOutput | None = None
+        if options.incremental and output_window is None:
+            previous = await _load_previous_output(
+                event.output["basePath"],
+                expression_hash,
+                options.incremental_restate_days,
+                output_writer,
+            )
+            if previous is not None:
+                output_window = OutputWindow(start=previous.tail_start.to_pydatetime())
+
         series_data = await _read_all_series(
             read_plan,
             event.catalog,
             catalog,
             data_reader,
+            options.max_concurrent_series_reads,
+            output_window=output_window,
         )
 
-        result_df = evaluate_expression(
-            event.expression_json,
-            event.expression_type,
-            series_data,
-        )
+        result_df = await _evaluate(event, series_data, options)
+        if output_window is not None:
+            result_df = _trim_to_window(result_df, output_window)
+        if previous is not None:
+            result_df = _merge_with_previous(previous, result_df)
 
         version_ts = clock.format_version_ts(clock.now())
         output_paths = _calculate_output_paths(event.output["basePath"], version_ts, run_id)
@@ -92,6 +172,9 @@ async def run(
             output_paths,
             output_writer,
             clock,
+            # A windowed output lacks older history, so incremental runs must not extend it
+            expression_hash if event.output_window is None else None,
+            _window_json(event.output_window),
         )
 
         await validate_manifest(manifest, run_id, metric_code)
@@ -128,41 +211,102 @@ async def run(
 
 async def _read_all_series(
     read_plan: ReadPlan,
-    catalog_info: dict,
+    catalog_info: CatalogDict,
     catalog: CatalogPort,
     data_reader: DataReaderPort,
+    max_concurrent_reads: int = RunOptions.max_concurrent_series_reads,
+    output_window: OutputWindow | None = None,
 ) -> dict[str, SeriesFrame]:
-    """Read all series data according to the read plan."""
-    dataset_manifests: dict[str, DatasetManifest] = {}
-    manifest_lock = asyncio.Lock()
-
-    # Read all dataset manifests first (in parallel, with lock protection)
-    async def get_manifest_safe(dataset_id: str) -> None:
-        async with manifest_lock:
-            if dataset_id not in dataset_manifests:
-                manifest_path = catalog_info["datasets"][dataset_id]["manifestPath"]
-                manifest_dict = await catalog.get_dataset_manifest(manifest_path)
-                dataset_manifests[dataset_id] = DatasetManifest(**manifest_dict)
-
-    manifest_tasks = [
-        get_manifest_safe(dataset_id)
-        for dataset_id in read_plan.series_by_dataset.keys()
-    ]
-    await asyncio.gather(*manifest_tasks)
+    """Read all series data according to the read plan.
+
+    Reads are launched together but at most ``max_concurrent_reads`` are in flight
+    at once, so a wide composite cannot monopolise the reader pool. Series of the
+    same dataset are read with one batched scan. With an ``output_window`` each
+    series is instead read on its own from just before the window, as far back as
+    its planned lookback requires, instead of its full history.
+    """
+    async def get_manifest(dataset_id: str) -> DatasetManifest:
+        manifest_path = catalog_info["datasets"][dataset_id]["manifestPath"]
+
+        async def load() -> DatasetManifest:
+            manifest_dict = await catalog.get_dataset_manifest(manifest_path)
+            return _parse_dataset_manifest(manifest_dict)
+
+        return await _manifest_flights.do(manifest_path, load)
+
+    # Datasets load concurrently; runs asking for the same manifest share one fetch
+    dataset_ids = list(read_plan.series_by_dataset.keys())
+    manifests = await asyncio.gather(*(get_manifest(dataset_id) for dataset_id in dataset_ids))
+    dataset_manifests: dict[str, DatasetManifest] = dict(zip(dataset_ids, manifests, strict=True))
+
+    read_slots = asyncio.Semaphore(max_concurrent_reads)
+
+    async def read_bounded(
+        series_code: str,
+        dataset_id: str,
+        projections_path: str,
+        dataset_manifest: DatasetManifest,
+    ) -> SeriesFrame:
+        async with read_slots:
+            if output_window is not None:
+                return await _read_series_for_window(
+                    series_code,
+                    dataset_id,
+                    projections_path,
+                    _series_file_index(dataset_manifest),
+                    data_reader,
+                    dataset_manifest.version_id,
+                    output_window,
+                    read_plan.get_lookback(series_code),
+                )
+            return await _read_single_series(
+                series_code,
+                dataset_id,
+                projections_path,
+                _series_file_index(dataset_manifest),
+                data_reader,
+                dataset_manifest.version_id,
+            )
+
+    async def read_dataset_bounded(
+        series_codes: list[str],
+        dataset_id: str,
+        projections_path: str,
+        dataset_manifest: DatasetManifest,
+    ) -> dict[str, SeriesFrame]:
+        async with read_slots:
+            return await _read_dataset_series(
+                series_codes,
+                dataset_id,
+                projections_path,
+                _series_file_index(dataset_manifest),
+                data_reader,
+                dataset_manifest.version_id,
+            )
 
     # Read all series in parallel across all datasets
-    series_tasks = []
+    # A None series code marks a batched read of several series of one dataset
+    series_tasks: list[tuple[str | None, Awaitable[SeriesFrame | dict[str, SeriesFrame]]]] = []
     for dataset_id, series_codes in read_plan.series_by_dataset.items():
         dataset_manifest = dataset_manifests[dataset_id]
         projections_path = catalog_info["datasets"][dataset_id]["projectionsPath"]
-        
+
+        if output_window is None and len(series_codes) > 1:
+            task = read_dataset_bounded(
+                list(series_codes),
+                dataset_id,
+                projections_path,
+                dataset_manifest,
+            )
+            series_tasks.append((None, task))
+            continue
+
         for series_code in series_codes:
-            task = _read_single_series(
+            task = read_bounded(
                 series_code,
                 dataset_id,
                 projections_path,
-                dataset_manifest.parquet_files,
-                data_reader,
+                dataset_manifest,
             )
             series_tasks.append((series_code, task))
 
@@ -171,44 +315,97 @@ async def _read_all_series(
 
     # Build result dictionary, handling any errors
     series_data: dict[str, SeriesFrame] = {}
-    for (series_code, _), result in zip(series_tasks, results):
-        if isinstance(result, Exception):
+    for (task_series_code, _), result in zip(series_tasks, results, strict=True):
+        if isinstance(result, BaseException):
             raise result
-        series_data[series_code] = result
+        if task_series_code is None:
+            series_data.update(result)
+        else:
+            series_data[task_series_code] = result
 
     return series_data
 
 
+def _parse_dataset_manifest(manifest_dict: DatasetManifestDict) -> DatasetManifest:
+    """Parse a dataset manifest, reusing the previous parse of the same catalog copy."""
+    dataset_id = manifest_dict.get("dataset_id")
+    version_id = manifest_dict.get("version_id")
+    if not isinstance(dataset_id, str) or not isinstance(version_id, str):
+        return DatasetManifest.model_validate(manifest_dict)
+
+    key = (dataset_id, version_id)
+    entry = _parsed_manifests.get(key)
+    if entry is not None and entry[0] is manifest_dict:
+        _parsed_manifests.move_to_end(key)
+        return entry[1]
+
+    manifest = DatasetManifest.model_validate(manifest_dict)
+    _parsed_manifests[key] = (manifest_dict, manifest)
+    _parsed_manifests.move_to_end(key)
+    if len(_parsed_manifests) > _PARSED_MANIFESTS_MAX:
+        _parsed_manifests.popitem(last=False)
+    return manifest
+
+
+def _series_file_index(manifest: DatasetManifest) -> SeriesFileIndex:
+    """Return the series-to-file index of a parsed manifest, building it once."""
+    key = (manifest.dataset_id, manifest.version_id)
+    entry = _series_indexes.get(key)
+    if entry is not None and entry[0] is manifest:
+        _series_indexes.move_to_end(key)
+        return entry[1]
+
+    index = SeriesFileIndex(manifest.parquet_files)
+    _series_indexes[key] = (manifest, index)
+    _series_indexes.move_to_end(key)
+    if len(_series_indexes) > _PARSED_MANIFESTS_MAX:
+        _series_indexes.popitem(last=False)
+    return index
+
+
 async def _read_single_series(
     series_code: str,
     dataset_id: str,
     projections_path: str,
-    all_parquet_files: list[str],
+    series_index: SeriesFileIndex,
     data_reader: DataReaderPort,
+    dataset_version: str | None = None,
+    start: Timestamp | None = None,
+    end: Timestamp | None = None,
 ) -> SeriesFrame:
-    """Read a single series from its parquet files."""
-    # Find parquet files for this specific series
-    series_files = [f for f in all_parquet_files if series_code in f]
+    """Read a single series from its parquet files, optionally within obs_time bounds."""
+    if series_code not in series_index:
+        msg = f"No parquet files found for series {series_code} in dataset {dataset_id}"
+        raise ValueError(msg)
 
+    series_files = series_index.files_for(series_code, start, end)
     if not series_files:
-        raise ValueError(
-            f"No parquet files found for series {series_code} in dataset {dataset_id}"
+        logger.info(
+            "series_outside_requested_range",
+            series_code=series_code,
+            dataset_id=dataset_id,
+            start=str(start),
+            end=str(end),
+        )
+        return pd.DataFrame(
+            {
+                "obs_time": pd.Series([], dtype="datetime64[ns]"),
+                "value": pd.Series([], dtype="float64"),
+            }
         )
 
     full_paths = [S3Path.join(projections_path, f) for f in series_files]
 
     try:
-        series_df = await data_reader.read_series_from_paths(full_paths, series_code)
-        logger.info(
-            "series_read_success",
-            series_code=series_code,
-            dataset_id=dataset_id,
-            row_count=len(series_df),
-            parquet_files_used=len(series_files),
+        series_df = await data_reader.read_series_from_paths(
+            full_paths,
+            series_code,
+            dataset_version=dataset_version,
+            start=start,
+            end=end,
         )
-        return series_df
     except (ValueError, OSError) as e:
-        logger.error(
+        logger.exception(
             "failed_to_read_series",
             series_code=series_code,
             dataset_id=dataset_id,
@@ -217,6 +414,287 @@ async def _read_single_series(
         )
         raise
 
+    logger.info(
+        "series_read_success",
+        series_code=series_code,
+        dataset_id=dataset_id,
+        row_count=len(series_df),
+        parquet_files_used=len(series_files),
+    )
+    return series_df
+
+
+async def _read_dataset_series(
+    series_codes: list[str],
+    dataset_id: str,
+    projections_path: str,
+    series_index: SeriesFileIndex,
+    data_reader: DataReaderPort,
+    dataset_version: str | None = None,
+) -> dict[str, SeriesFrame]:
+    """Read several series of one dataset with a single batched reader call."""
+    for series_code in series_codes:
+        if series_code not in series_index:
+            msg = f"No parquet files found for series {series_code} in dataset {dataset_id}"
+            raise ValueError(msg)
+
+    paths_by_series = {
+        series_code: [S3Path.join(projections_path, f) for f in series_index.files_for(series_code)]
+        for series_code in series_codes
+    }
+
+    try:
+        series_data = await data_reader.read_many_series_from_paths(
+            paths_by_series,
+            dataset_version=dataset_version,
+        )
+    except (ValueError, OSError) as e:
+        logger.exception(
+            "failed_to_read_dataset_series",
+            series_codes=series_codes,
+            dataset_id=dataset_id,
+            projections_path=projections_path,
+            error=str(e),
+        )
+        raise
+
+    logger.info(
+        "dataset_series_read_success",
+        dataset_id=dataset_id,
+        series_count=len(series_codes),
+        row_count=sum(len(frame) for frame in series_data.values()),
+        parquet_files_used=sum(len(paths) for paths in paths_by_series.values()),
+    )
+    return series_data
+
+
+async def _read_series_for_window(
+    series_code: str,
+    dataset_id: str,
+    projections_path: str,
+    series_index: SeriesFileIndex,
+    data_reader: DataReaderPort,
+    dataset_version: str | None,
+    output_window: OutputWindow,
+    lookback: Lookback,
+) -> SeriesFrame:
+    """Read the part of a series an output window depends on.
+
+    The observation spacing is unknown before reading, so the first read assumes
+    one observation per day and is widened (4x each time) until it holds
+    ``lookback.observations`` rows before ``start - lookback.days`` or reaches the
+    first partition of the series.
+    """
+    window_start = _utc_naive(output_window.start)
+    window_end = _utc_naive_or_none(output_window.end)
+    anchor = window_start - pd.Timedelta(days=lookback.days)
+    bounds = series_index.month_bounds(series_code)
+    margin_days = max(lookback.observations, 1)
+
+    while True:
+        margin_start = anchor - pd.Timedelta(days=margin_days)
+        read_start: pd.Timestamp | None = margin_start
+        if bounds is None or (margin_start.year, margin_start.month) <= bounds[0]:
+            # Nothing older to prune: read from the first partition
+            read_start = None
+
+        series_df = await _read_single_series(
+            series_code,
+            dataset_id,
+            projections_path,
+            series_index,
+            data_reader,
+            dataset_version,
+            start=read_start,
+            end=window_end,
+        )
+        if read_start is None or lookback.observations == 0:
+            return series_df
+        rows_before = _rows_before(series_df, anchor)
+        if rows_before >= lookback.observations:
+            logger.info(
+                "series_read_for_window",
+                series_code=series_code,
+                read_start=str(read_start),
+                lookback_observations=lookback.observations,
+                lookback_days=lookback.days,
+            )
+            return series_df
+        margin_days *= 4
+
+
+def _rows_before(series_df: SeriesFrame, anchor: pd.Timestamp) -> int:
+    """Number of rows observed before ``anchor``."""
+    if isinstance(series_df, pa.Table):
+        return pc.sum(pc.less(series_df.column("obs_time"), anchor)).as_py() or 0
+    return int((series_df["obs_time"] < anchor).sum())
+
+
+def _trim_to_window(result_df: ExpressionResult, output_window: OutputWindow) -> ExpressionResult:
+    """Keep only result rows whose obs_time lies inside the output window."""
+    window_start = _utc_naive(output_window.start)
+    window_end = _utc_naive_or_none(output_window.end)
+    if isinstance(result_df, pa.Table):
+        obs_time = result_df.column("obs_time")
+        mask = pc.greater_equal(obs_time, window_start)
+        if window_end is not None:
+            mask = pc.and_(mask, pc.less_equal(obs_time, window_end))
+        return result_df.filter(mask)
+    mask = result_df["obs_time"] >= window_start
+    if window_end is not None:
+        mask &= result_df["obs_time"] <= window_end
+    return result_df[mask].reset_index(drop=True)
+
+
+def _window_json(output_window: OutputWindow | None) -> dict[str, JsonValue] | None:
+    """Requested output window as recorded in the manifest (UTC ISO 8601 bounds)."""
+    if output_window is None:
+        return None
+    end = _utc_naive_or_none(output_window.end)
+    return {
+        "start": _utc_naive(output_window.start).isoformat() + "Z",
+        "end": end.isoformat() + "Z" if end is not None else None,
+    }
+
+
+def _utc_naive(value: Timestamp) -> pd.Timestamp:
+    """Normalize a timestamp to naive UTC, like the obs_time of series frames."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts
+
+
+def _utc_naive_or_none(value: Timestamp | None) -> pd.Timestamp | None:
+    """``_utc_naive`` for an optional bound."""
+    return None if value is None else _utc_naive(value)
+
+
+# ============================================================================
+# Expression Evaluation
+# ============================================================================
+
+
+async def _evaluate(
+    event: MetricRunRequestedEvent,
+    series_data: dict[str, SeriesFrame],
+    options: RunOptions,
+) -> ExpressionResult:
+    """Evaluate the run's expression off the event loop and log where the time went."""
+    timings: list[NodeTiming] = []
+    started = time.perf_counter()
+    result_df = await asyncio.to_thread(
+        _EXPRESSION_ENGINES[options.expression_engine],
+        event.expression_json,
+        event.expression_type,
+        series_data,
+        options.max_parallel_expression_nodes,
+        timings,
+    )
+    elapsed = time.perf_counter() - started
+    # Node time over wall time: how many cores the evaluation kept busy on average
+    node_seconds = sum(timing.seconds for timing in timings)
+    logger.info(
+        "expression_evaluated",
+        run_id=event.run_id,
+        engine=options.expression_engine.value,
+        duration_ms=round(elapsed * 1000, 3),
+        parallelism=round(node_seconds / elapsed, 2) if elapsed > 0 else 0.0,
+        max_parallel_nodes=options.max_parallel_expression_nodes,
+        nodes=[timing.as_dict() for timing in sorted(timings, key=lambda t: t.start_seconds)],
+    )
+    return result_df
+
+
+# ============================================================================
+# Incremental Runs
+# ============================================================================
+
+
+def _expression_hash(event: MetricRunRequestedEvent) -> str:
+    """Fingerprint the expression and inputs an output was computed from."""
+    payload = json.dumps(
+        {
+            "expression_type": str(getattr(event.expression_type, "value", event.expression_type)),
+            "expression": event.expression_json,
+            "inputs": event.inputs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _load_previous_output(
+    base_path: str,
+    expression_hash: str,
+    restate_days: int,
+    output_writer: OutputWriterPort,
+) -> _PreviousOutput | None:
+    """Load the current output if an incremental run can extend it.
+
+    Returns None (full recompute) when there is no previous output, it was built
+    from a different expression or inputs, it only covers an output window, or it
+    cannot be read.
+    """
+    current_manifest_path = _current_manifest_path(base_path)
+    try:
+        manifest = await output_writer.read_manifest(current_manifest_path)
+        if manifest is None:
+            logger.info("incremental_no_previous_output", manifest_path=current_manifest_path)
+            return None
+        if "output_window" in manifest:
+            logger.info("incremental_previous_output_windowed", manifest_path=current_manifest_path)
+            return None
+        if manifest.get("expression_hash") != expression_hash:
+            logger.info("incremental_expression_changed", manifest_path=current_manifest_path)
+            return None
+
+        paths = _manifest_data_paths(manifest["outputs"])
+        frame = await output_writer.read_jsonl(paths)
+    except Exception as e:
+        logger.warning(
+            "incremental_previous_output_unreadable",
+            manifest_path=current_manifest_path,
+            error=str(e),
+        )
+        return None
+
+    if frame.empty:
+        return None
+    # The last ``restate_days`` of the previous output are recomputed, the rest kept
+    tail_start = frame["obs_time"].max() - pd.Timedelta(days=restate_days)
+    logger.info(
+        "incremental_previous_output_loaded",
+        previous_version=manifest.get("version_ts"),
+        previous_rows=len(frame),
+        tail_start=str(tail_start),
+    )
+    return _PreviousOutput(frame=frame, tail_start=tail_start)
+
+
+def _manifest_data_paths(outputs: dict[str, JsonValue]) -> list[str]:
+    """Paths of the data files listed in an output manifest."""
+    data_prefix = outputs.get("data_prefix")
+    files = outputs.get("files")
+    if not isinstance(data_prefix, str) or not isinstance(files, list):
+        msg = "Output manifest lists no data_prefix and files"
+        raise TypeError(msg)
+    return [S3Path.join(data_prefix, str(name)) for name in files]
+
+
+def _merge_with_previous(previous: _PreviousOutput, tail_df: ExpressionResult) -> ExpressionResult:
+    """Keep the stable part of the previous output and append the recomputed tail."""
+    stable = previous.frame[previous.frame["obs_time"] < previous.tail_start]
+    if isinstance(tail_df, pa.Table):
+        stable_table = pa.Table.from_pandas(stable[["obs_time", "value"]], preserve_index=False)
+        merged_table = pa.concat_tables(
+            [stable_table.cast(tail_df.schema), tail_df.select(["obs_time", "value"])]
+        )
+        return merged_table.sort_by("obs_time")
+    merged = pd.concat([stable, tail_df[["obs_time", "value"]]], ignore_index=True)
+    return merged.sort_values("obs_time", kind="stable").reset_index(drop=True)
+
 
 # ============================================================================
 # Output Writing
@@ -230,14 +708,20 @@ def _calculate_output_paths(base_path: str, version_ts: str, run_id: str) -> _Ou
     return _OutputPaths(
         parquet_path=S3Path.join(prefix, version_ts, "data", "metrics.jsonl"),
         manifest_path=S3Path.join(prefix, version_ts, "manifest.json"),
-        current_manifest_path=S3Path.join(prefix, "current", "manifest.json"),
+        current_manifest_path=_current_manifest_path(base_path),
         marker_path=S3Path.join(prefix, "runs", f"{run_id}.ok"),
         manifest_relative_path=S3Path.join(prefix, version_ts, "manifest.json"),
     )
 
 
+def _current_manifest_path(base_path: str) -> str:
+    """Path of the manifest pointing at the latest output of a metric."""
+    prefix = S3Path.rstrip_separator(S3Path.normalize(base_path))
+    return S3Path.join(prefix, "current", "manifest.json")
+
+
 async def _write_output(
-    result_df: pd.DataFrame,
+    result_df: ExpressionResult,
     run_id: str,
     metric_code: str,
     version_ts: str,
@@ -245,6 +729,8 @@ async def _write_output(
     output_paths: _OutputPaths,
     output_writer: OutputWriterPort,
     clock: ClockPort,
+    expression_hash: str | None = None,
+    output_window: dict[str, JsonValue] | None = None,
 ) -> MetricOutputManifest:
     """Write results to S3 (JSONL and manifest)."""
     output_files = await output_writer.write_jsonl(
@@ -261,6 +747,8 @@ async def _write_output(
         output_files,
         manifest_data_prefix,
         clock,
+        expression_hash,
+        output_window,
     )
 
     await output_writer.write_manifest(manifest, output_paths.manifest_path)
@@ -32,6 +32,10 @@ class MetricOutputManifest:
     created_at: Timestamp
     row_count: int
     outputs: dict[str, JsonValue]
+    # Fingerprint of expression and inputs; incremental runs only extend matching outputs
+    expression_hash: str | None = None
+    # obs_time range of a windowed run ("start", "end"); None for the full history
+    output_window: dict[str, JsonValue] | None = None
 
 
 @dataclass(frozen=True)
@@ -39,3 +39,9 @@ class CompositeOp(str, Enum):
     MAX = "max"
     MIN = "min"
 
+
+class ExpressionEngine(str, Enum):
+    """Backend evaluating metric expressions."""
+
+    PANDAS = "pandas"
+    ARROW = "arrow"  # pyarrow.compute over pa.Table series, no pandas conversion
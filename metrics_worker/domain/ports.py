@@ -1,9 +1,15 @@
 """Ports (interfaces) for infrastructure adapters."""
 
+import asyncio
 from abc import ABC, abstractmethod
 
 from metrics_worker.domain.entities import MetricOutputManifest
-from metrics_worker.domain.types import DatasetManifestDict, SeriesFrame, Timestamp
+from metrics_worker.domain.types import (
+    DatasetManifestDict,
+    ManifestSerializationDict,
+    SeriesFrame,
+    Timestamp,
+)
 
 
 class CatalogPort(ABC):
@@ -22,8 +28,48 @@ class DataReaderPort(ABC):
         self,
         parquet_paths: list[str],
         series_code: str,
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
     ) -> SeriesFrame:
-        """Read series data from specific parquet file paths."""
+        """Read series data from specific parquet file paths.
+
+        ``dataset_version`` is the manifest ``version_id`` the paths were taken from;
+        caching decorators use it to key entries without touching S3.
+
+        ``start`` / ``end`` are optional inclusive ``obs_time`` bounds (naive values
+        are UTC). Only rows inside them are returned, and readers may skip files
+        whose ``year=/month=`` partition lies entirely outside them.
+        """
+
+    async def read_many_series_from_paths(
+        self,
+        paths_by_series: dict[str, list[str]],
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> dict[str, SeriesFrame]:
+        """Read several series of one dataset, keyed by series code.
+
+        ``paths_by_series`` maps each series code to its parquet file paths; the
+        other arguments apply to every series as in ``read_series_from_paths``.
+        Readers that can scan the union of the files once should override this;
+        the default reads each series on its own, concurrently.
+        """
+        series_codes = list(paths_by_series)
+        frames = await asyncio.gather(
+            *(
+                self.read_series_from_paths(
+                    paths_by_series[series_code],
+                    series_code,
+                    dataset_version=dataset_version,
+                    start=start,
+                    end=end,
+                )
+                for series_code in series_codes
+            )
+        )
+        return dict(zip(series_codes, frames, strict=True))
 
 
 class OutputWriterPort(ABC):
@@ -45,6 +91,14 @@ class OutputWriterPort(ABC):
     ) -> None:
         """Write output manifest."""
 
+    @abstractmethod
+    async def read_manifest(self, manifest_path: str) -> ManifestSerializationDict | None:
+        """Read a previously written output manifest (None if there is none)."""
+
+    @abstractmethod
+    async def read_jsonl(self, paths: list[str]) -> SeriesFrame:
+        """Read previously written JSONL output back into an obs_time/value frame."""
+
     @abstractmethod
     async def check_run_marker(self, marker_path: str) -> bool:
         """Check if run marker exists (idempotency)."""
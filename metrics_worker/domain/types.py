@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import TYPE_CHECKING, TypedDict
+from typing import TYPE_CHECKING, NotRequired, TypedDict
 
 import pandas as pd
 import pyarrow as pa
@@ -69,6 +69,8 @@ class ManifestSerializationDict(TypedDict):
     created_at: str
     row_count: int
     outputs: dict[str, JsonValue]
+    expression_hash: NotRequired[str]
+    output_window: NotRequired[dict[str, JsonValue]]
 
 # Run marker structure
 class RunMarkerDict(TypedDict):
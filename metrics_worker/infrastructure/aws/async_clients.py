@@ -0,0 +1,67 @@
+"""Shared, non-blocking AWS client layer."""
+
+import asyncio
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal, TypeVar
+
+import boto3
+from botocore.config import Config
+
+from metrics_worker.infrastructure.config.settings import Settings
+
+T = TypeVar("T")
+
+
+class AsyncAwsClients:
+    """boto3 clients shared by the S3, SQS and SNS adapters.
+
+    boto3 is blocking, so every call is dispatched to a dedicated thread pool and
+    awaited from the event loop. Concurrent awaits (series reads, heartbeats, the
+    SQS long poll) therefore overlap instead of stalling the loop. All clients come
+    from one session and share a botocore ``Config`` whose connection pool is sized
+    to match the thread pool.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        """Initialize shared session, client config and I/O thread pool."""
+        self.config = Config(
+            region_name=settings.aws_region,
+            max_pool_connections=settings.aws_max_pool_connections,
+            connect_timeout=settings.aws_connect_timeout_seconds,
+            read_timeout=settings.aws_read_timeout_seconds,
+            retries={"max_attempts": settings.aws_max_attempts, "mode": "standard"},
+            tcp_keepalive=True,
+        )
+        self._session = boto3.session.Session()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.aws_max_pool_connections,
+            thread_name_prefix="aws-io",
+        )
+        self._clients: dict[str, Any] = {}
+        # Creating clients from one boto3 session is not thread-safe
+        self._lock = threading.Lock()
+
+    def client(self, service_name: Literal["s3", "sqs", "sns"]) -> Any:
+        """Get (or lazily create) the shared client for ``service_name``."""
+        with self._lock:
+            if service_name not in self._clients:
+                self._clients[service_name] = self._session.client(
+                    service_name,
+                    config=self.config,
+                )
+            return self._clients[service_name]
+
+    async def call(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run a blocking client call on the I/O pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs),
+        )
+
+    def shutdown(self) -> None:
+        """Release the I/O thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
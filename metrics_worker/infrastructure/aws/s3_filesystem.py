@@ -0,0 +1,63 @@
+"""Process-wide PyArrow S3 filesystem."""
+
+import threading
+import time
+
+import structlog
+from pyarrow.fs import AwsStandardS3RetryStrategy, FileSystem, S3FileSystem
+
+from metrics_worker.infrastructure.config.settings import Settings
+from metrics_worker.infrastructure.observability.metrics import (
+    s3_filesystem_init_seconds,
+    s3_filesystem_warmup_seconds,
+)
+
+logger = structlog.get_logger()
+
+# One filesystem per settings profile; constructing S3FileSystem resolves the
+# region and credential chain and sets up a connection pool, so it is shared.
+_filesystems: dict[tuple[str, float, float, int], S3FileSystem] = {}
+_filesystems_lock = threading.Lock()
+
+
+def get_s3_filesystem(settings: Settings) -> S3FileSystem:
+    """Get the shared S3FileSystem for this settings profile, creating it once."""
+    profile = (
+        settings.aws_region,
+        settings.s3fs_connect_timeout_seconds,
+        settings.s3fs_request_timeout_seconds,
+        settings.s3fs_retry_max_attempts,
+    )
+    with _filesystems_lock:
+        filesystem = _filesystems.get(profile)
+        if filesystem is None:
+            started = time.perf_counter()
+            filesystem = S3FileSystem(
+                region=settings.aws_region,
+                connect_timeout=settings.s3fs_connect_timeout_seconds,
+                request_timeout=settings.s3fs_request_timeout_seconds,
+                retry_strategy=AwsStandardS3RetryStrategy(
+                    max_attempts=settings.s3fs_retry_max_attempts,
+                ),
+            )
+            elapsed = time.perf_counter() - started
+            s3_filesystem_init_seconds.observe(elapsed)
+            logger.info("s3_filesystem_created", region=settings.aws_region, seconds=elapsed)
+            _filesystems[profile] = filesystem
+        return filesystem
+
+
+def warm_up_s3_filesystem(filesystem: FileSystem, bucket: str) -> None:
+    """Resolve credentials and open a pooled connection before the first run.
+
+    Issues one HEAD on the bucket. Failures are logged, not raised: the first
+    real read will surface any persistent problem with a better error.
+    """
+    started = time.perf_counter()
+    try:
+        filesystem.get_file_info(bucket)
+    except OSError as e:
+        logger.warning("s3_filesystem_warmup_failed", bucket=bucket, error=str(e))
+    elapsed = time.perf_counter() - started
+    s3_filesystem_warmup_seconds.observe(elapsed)
+    logger.info("s3_filesystem_warmed_up", bucket=bucket, seconds=elapsed)
@@ -1,65 +1,150 @@
 """S3 I/O operations."""
 
 import json
+from typing import cast
 
-import boto3
 from botocore.exceptions import ClientError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 
 from metrics_worker.domain.types import JsonValue
+from metrics_worker.infrastructure.aws.async_clients import AsyncAwsClients
 from metrics_worker.infrastructure.config.settings import Settings
 
+_NOT_FOUND_CODES = ("404", "NoSuchKey")
+
+
+class S3ObjectNotFoundError(RuntimeError):
+    """The requested S3 object does not exist (not retried)."""
+
 
 class S3IO:
     """S3 I/O operations."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, clients: AsyncAwsClients | None = None) -> None:
         """Initialize S3 client."""
         self.settings = settings
-        self.s3_client = boto3.client("s3", region_name=settings.aws_region)
+        self.clients = clients or AsyncAwsClients(settings)
+        self.s3_client = self.clients.client("s3")
         self.bucket = settings.aws_s3_bucket
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def get_json(self, key: str) -> dict[str, JsonValue]:
         """Get JSON object from S3."""
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-            content = response["Body"].read().decode("utf-8")
-            return json.loads(content)
+            content = await self.clients.call(self._get_body, key)
+            return cast(dict[str, JsonValue], json.loads(content.decode("utf-8")))
         except ClientError as e:
-            raise RuntimeError(f"Failed to read S3 object {key}: {e}") from e
+            msg = f"Failed to read S3 object {key}: {e}"
+            raise RuntimeError(msg) from e
+
+    @retry(
+        retry=retry_if_not_exception_type(S3ObjectNotFoundError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def get_json_if_modified(
+        self,
+        key: str,
+        etag: str | None,
+    ) -> tuple[dict[str, JsonValue] | None, str | None]:
+        """Conditionally get a JSON object from S3 (``If-None-Match``).
+
+        Returns:
+            Tuple of (data, etag); data is None when the object still matches ``etag``.
+
+        Raises:
+            S3ObjectNotFoundError: If the object does not exist.
+        """
+        try:
+            content, new_etag = await self.clients.call(self._get_body_if_modified, key, etag)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _NOT_FOUND_CODES:
+                msg = f"S3 object not found: {key}"
+                raise S3ObjectNotFoundError(msg) from e
+            msg = f"Failed to read S3 object {key}: {e}"
+            raise RuntimeError(msg) from e
+        if content is None:
+            return None, etag
+        data = cast(dict[str, JsonValue], json.loads(content.decode("utf-8")))
+        return data, new_etag
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    async def get_object(self, key: str) -> bytes:
+        """Get raw object bytes from S3."""
+        try:
+            return await self.clients.call(self._get_body, key)
+        except ClientError as e:
+            msg = f"Failed to read S3 object {key}: {e}"
+            raise RuntimeError(msg) from e
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def put_json(self, key: str, data: dict[str, JsonValue]) -> None:
         """Put JSON object to S3."""
         try:
             content = json.dumps(data, default=str, indent=2)
-            self.s3_client.put_object(
+            await self.clients.call(
+                self.s3_client.put_object,
                 Bucket=self.bucket,
                 Key=key,
                 Body=content.encode("utf-8"),
                 ContentType="application/json",
             )
         except ClientError as e:
-            raise RuntimeError(f"Failed to write S3 object {key}: {e}") from e
+            msg = f"Failed to write S3 object {key}: {e}"
+            raise RuntimeError(msg) from e
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    async def put_object(self, key: str, body: bytes, content_type: str = "application/octet-stream") -> None:
+    async def put_object(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> None:
         """Put object to S3."""
         try:
-            self.s3_client.put_object(
+            await self.clients.call(
+                self.s3_client.put_object,
                 Bucket=self.bucket,
                 Key=key,
                 Body=body,
                 ContentType=content_type,
             )
         except ClientError as e:
-            raise RuntimeError(f"Failed to write S3 object {key}: {e}") from e
+            msg = f"Failed to write S3 object {key}: {e}"
+            raise RuntimeError(msg) from e
 
     async def object_exists(self, key: str) -> bool:
         """Check if object exists in S3."""
         try:
-            self.s3_client.head_object(Bucket=self.bucket, Key=key)
-            return True
+            await self.clients.call(self.s3_client.head_object, Bucket=self.bucket, Key=key)
         except ClientError:
             return False
+        return True
+
+    async def list_keys(self, prefix: str, max_keys: int = 1000) -> list[str]:
+        """List object keys under a prefix (first page only)."""
+        response = await self.clients.call(
+            self.s3_client.list_objects_v2,
+            Bucket=self.bucket,
+            Prefix=prefix,
+            MaxKeys=max_keys,
+        )
+        return [obj["Key"] for obj in response.get("Contents", [])]
+
+    def _get_body_if_modified(self, key: str, etag: str | None) -> tuple[bytes | None, str | None]:
+        """Fetch an object body unless it still matches ``etag`` (HTTP 304)."""
+        params = {"Bucket": self.bucket, "Key": key}
+        if etag:
+            params["IfNoneMatch"] = etag
+        try:
+            response = self.s3_client.get_object(**params)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return None, etag
+            raise
+        return cast(bytes, response["Body"].read()), response.get("ETag")
+
+    def _get_body(self, key: str) -> bytes:
+        """Fetch and drain an object body; the body read is network I/O too."""
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+        return cast(bytes, response["Body"].read())
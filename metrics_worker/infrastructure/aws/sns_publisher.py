@@ -2,13 +2,13 @@
 
 import json
 
-import boto3
 import structlog
 from botocore.exceptions import ClientError
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from metrics_worker.domain.ports import EventBusPort
 from metrics_worker.domain.types import Timestamp
+from metrics_worker.infrastructure.aws.async_clients import AsyncAwsClients
 from metrics_worker.infrastructure.config.settings import Settings
 
 logger = structlog.get_logger()
@@ -21,10 +21,11 @@ class SNSPublisher(EventBusPort):
     that are subscribed to these SNS topics.
     """
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, clients: AsyncAwsClients | None = None) -> None:
         """Initialize SNS client."""
         self.settings = settings
-        self.sns_client = boto3.client("sns", region_name=settings.aws_region)
+        self.clients = clients or AsyncAwsClients(settings)
+        self.sns_client = self.clients.client("sns")
         # SNS Topics for each event type (all required)
         self.started_topic_arn = settings.aws_sns_metric_run_started_topic_arn
         self.heartbeat_topic_arn = settings.aws_sns_metric_run_heartbeat_topic_arn
@@ -131,7 +132,7 @@ class SNSPublisher(EventBusPort):
                 message_body=event,
             )
 
-            response = self.sns_client.publish(**publish_params)
+            response = await self.clients.call(self.sns_client.publish, **publish_params)
             
             logger.info(
                 "event_published_to_sns",
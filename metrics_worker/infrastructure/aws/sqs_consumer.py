@@ -2,11 +2,11 @@
 
 import json
 
-import boto3
 import structlog
 from botocore.exceptions import ClientError
 
 from metrics_worker.application.dto.events import MetricRunRequestedEvent
+from metrics_worker.infrastructure.aws.async_clients import AsyncAwsClients
 from metrics_worker.infrastructure.config.settings import Settings
 
 logger = structlog.get_logger()
@@ -15,9 +15,10 @@ logger = structlog.get_logger()
 class SQSConsumer:
     """SQS consumer for metric run requests."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, clients: AsyncAwsClients | None = None) -> None:
         """Initialize SQS client."""
-        self.sqs_client = boto3.client("sqs", region_name=settings.aws_region)
+        self.clients = clients or AsyncAwsClients(settings)
+        self.sqs_client = self.clients.client("sqs")
         self.queue_url = settings.aws_sqs_run_request_queue_url
         self.settings = settings
 
@@ -28,7 +29,9 @@ class SQSConsumer:
             Tuple of (event, receipt_handle) or (None, None) if no message.
         """
         try:
-            response = self.sqs_client.receive_message(
+            # The long poll holds an I/O thread, not the event loop
+            response = await self.clients.call(
+                self.sqs_client.receive_message,
                 QueueUrl=self.queue_url,
                 MaxNumberOfMessages=1,
                 WaitTimeSeconds=20,
@@ -97,7 +100,8 @@ class SQSConsumer:
     async def delete_message(self, receipt_handle: str) -> None:
         """Delete message from SQS."""
         try:
-            self.sqs_client.delete_message(
+            await self.clients.call(
+                self.sqs_client.delete_message,
                 QueueUrl=self.queue_url,
                 ReceiptHandle=receipt_handle,
             )
@@ -123,7 +127,8 @@ class SQSConsumer:
             timeout_seconds = self.settings.aws_sqs_visibility_timeout_extension_seconds
         
         try:
-            self.sqs_client.change_message_visibility(
+            await self.clients.call(
+                self.sqs_client.change_message_visibility,
                 QueueUrl=self.queue_url,
                 ReceiptHandle=receipt_handle,
                 VisibilityTimeout=timeout_seconds,
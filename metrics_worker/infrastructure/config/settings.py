@@ -17,8 +17,54 @@ class Settings(BaseSettings):
     aws_sns_metric_run_started_topic_arn: str
     aws_sns_metric_run_heartbeat_topic_arn: str
     aws_sns_metric_run_completed_topic_arn: str
+    # Shared AWS client layer: the connection pool size is also the I/O thread count.
+    # read_timeout must stay above the 20s SQS long poll.
+    aws_max_pool_connections: int = 32
+    aws_connect_timeout_seconds: float = 5.0
+    aws_read_timeout_seconds: float = 60.0
+    aws_max_attempts: int = 3
     worker_heartbeat_interval_seconds: int = 30
     output_compression: str = "snappy"
+    # Shared PyArrow S3FileSystem used by the Parquet reader
+    s3fs_connect_timeout_seconds: float = 5.0
+    s3fs_request_timeout_seconds: float = 30.0
+    s3fs_retry_max_attempts: int = 3
+    # Parquet scans run on a dedicated thread pool shared by all runs
+    parquet_reader_max_workers: int = 16
+    # Parquet files a scan opens ahead of the one being decoded
+    parquet_fragment_readahead: int = 16
+    # Parquet files up to this size are downloaded whole with one GET (0 disables)
+    parquet_whole_object_max_bytes: int = 2 * 1024 * 1024
+    # Whole-object downloads in flight (also bounded by aws_max_pool_connections)
+    parquet_fetch_concurrency: int = 64
+    # Parquet footers kept across runs for row-group pruning (0 disables); footers
+    # are also written to the directory, if set, to survive restarts
+    parquet_metadata_cache_max_entries: int = 50_000
+    parquet_metadata_cache_dir: str | None = None
+    # Expression backend: "pandas", or "arrow" to keep series as Arrow tables from the
+    # reader to the writer (same results)
+    expression_engine: str = "pandas"
+    # Upper bound on series reads in flight for a single run
+    run_max_concurrent_series_reads: int = 16
+    # Independent expression nodes evaluated at once (threads) in a single run; worth
+    # raising to the task's vCPUs, as only NumPy/pandas/Arrow kernels run in parallel
+    run_max_parallel_expression_nodes: int = 1
+    # Extend the previous output (recomputing the last N days) instead of full history
+    run_incremental_enabled: bool = False
+    run_incremental_restate_days: int = 7
+    # Local Arrow IPC cache of decoded series, keyed by dataset version
+    series_disk_cache_enabled: bool = False
+    series_disk_cache_dir: str = "/tmp/metrics-worker/series-cache"
+    series_disk_cache_max_bytes: int = 2 * 1024**3
+    # In-process cache of normalized series frames, in front of the disk cache
+    series_memory_cache_enabled: bool = False
+    series_memory_cache_max_bytes: int = 512 * 1024**2
+    # Dataset manifests are reused for the TTL, then revalidated with If-None-Match
+    manifest_cache_ttl_seconds: float = 30.0
+    manifest_cache_max_entries: int = 256
+    manifest_cache_refresh_enabled: bool = False
+    manifest_cache_refresh_interval_seconds: float = 60.0
+    manifest_cache_recent_seconds: float = 3600.0
     prometheus_port: int = 9300
 
     # AWS Credentials (optional - loaded from .env but not used directly)
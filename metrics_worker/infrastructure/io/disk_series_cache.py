@@ -0,0 +1,310 @@
+"""Local on-disk Arrow IPC cache for decoded series."""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import structlog
+
+from metrics_worker.domain.ports import DataReaderPort
+from metrics_worker.domain.types import SeriesFrame, Timestamp
+from metrics_worker.infrastructure.observability.metrics import (
+    series_disk_cache_bytes,
+    series_disk_cache_evictions,
+    series_disk_cache_hits,
+    series_disk_cache_misses,
+)
+
+logger = structlog.get_logger()
+
+_INDEX_FILE = "index.json"
+_ENTRY_SUFFIX = ".arrow"
+# Suffixes of entries and of interrupted entry/index writes
+_OWNED_SUFFIXES = (_ENTRY_SUFFIX, ".tmp")
+
+
+@dataclass
+class _CacheEntry:
+    """Index record for one cached series file."""
+
+    file_name: str
+    size_bytes: int
+    last_access: float
+
+
+class DiskSeriesCache(DataReaderPort):
+    """DataReaderPort decorator that keeps decoded series on local disk.
+
+    Entries are memory-mappable Arrow IPC files keyed by dataset ``version_id``,
+    series code and the exact object paths read, so a hit never touches S3.
+    Reads without a ``dataset_version`` bypass the cache. The index (LRU order and
+    sizes) is persisted next to the entries and reloaded on start, so the cache
+    survives container restarts; the least recently used entries are evicted once
+    ``max_bytes`` is exceeded. The index is rewritten at most every
+    ``index_write_interval_seconds`` and by ``flush_index`` on shutdown; entries
+    written after the last save are dropped as orphans on the next start.
+    Failed writes are logged and skipped, so the cache never fails a read.
+
+    Hits are returned as DataFrames, or with ``arrow_frames`` as the
+    memory-mapped Arrow tables themselves (for the Arrow expression engine).
+    """
+
+    def __init__(
+        self,
+        inner: DataReaderPort,
+        cache_dir: str | Path,
+        max_bytes: int,
+        arrow_frames: bool = False,
+        index_write_interval_seconds: float = 30.0,
+    ) -> None:
+        """Initialize cache and load the persisted index."""
+        self.inner = inner
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.arrow_frames = arrow_frames
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_write_interval_seconds = index_write_interval_seconds
+        self._lock = threading.Lock()
+        # Serializes index writes so a stale snapshot never overwrites a newer one
+        self._index_lock = threading.Lock()
+        self._index_dirty = False
+        self._index_written_at = time.monotonic()
+        self._entries: OrderedDict[str, _CacheEntry] = self._load_index()
+        self._total_bytes = sum(entry.size_bytes for entry in self._entries.values())
+        series_disk_cache_bytes.set(self._total_bytes)
+
+    async def read_series_from_paths(
+        self,
+        parquet_paths: list[str],
+        series_code: str,
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> SeriesFrame:
+        """Read series from the cache, falling back to the wrapped reader."""
+        if dataset_version is None:
+            return await self.inner.read_series_from_paths(
+                parquet_paths,
+                series_code,
+                start=start,
+                end=end,
+            )
+
+        key = self._cache_key(parquet_paths, series_code, dataset_version, start, end)
+        cached = await asyncio.to_thread(self._get, key)
+        if cached is not None:
+            series_disk_cache_hits.inc()
+            logger.info("series_disk_cache_hit", series_code=series_code, version=dataset_version)
+            return cached
+
+        series_disk_cache_misses.inc()
+        frame = await self.inner.read_series_from_paths(
+            parquet_paths,
+            series_code,
+            dataset_version=dataset_version,
+            start=start,
+            end=end,
+        )
+        await asyncio.to_thread(self._put, key, frame)
+        return frame
+
+    async def read_many_series_from_paths(
+        self,
+        paths_by_series: dict[str, list[str]],
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> dict[str, SeriesFrame]:
+        """Serve cached series from disk and read the rest in one wrapped call."""
+        if dataset_version is None:
+            return await self.inner.read_many_series_from_paths(
+                paths_by_series,
+                start=start,
+                end=end,
+            )
+
+        frames: dict[str, SeriesFrame] = {}
+        missing: dict[str, str] = {}
+        for series_code, parquet_paths in paths_by_series.items():
+            key = self._cache_key(parquet_paths, series_code, dataset_version, start, end)
+            cached = await asyncio.to_thread(self._get, key)
+            if cached is not None:
+                series_disk_cache_hits.inc()
+                frames[series_code] = cached
+            else:
+                series_disk_cache_misses.inc()
+                missing[series_code] = key
+
+        if missing:
+            read = await self.inner.read_many_series_from_paths(
+                {series_code: paths_by_series[series_code] for series_code in missing},
+                dataset_version=dataset_version,
+                start=start,
+                end=end,
+            )
+            for series_code, key in missing.items():
+                await asyncio.to_thread(self._put, key, read[series_code])
+                frames[series_code] = read[series_code]
+
+        logger.info(
+            "series_disk_cache_batch",
+            version=dataset_version,
+            hits=len(paths_by_series) - len(missing),
+            misses=len(missing),
+        )
+        return {series_code: frames[series_code] for series_code in paths_by_series}
+
+    def flush_index(self) -> None:
+        """Persist the index now if it changed since the last save."""
+        self._save_index(force=True)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held on disk."""
+        return self._total_bytes
+
+    @staticmethod
+    def _cache_key(
+        parquet_paths: list[str],
+        series_code: str,
+        dataset_version: str,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> str:
+        """Build a stable key from version, series code, object paths and bounds."""
+        parts: list[object] = [dataset_version, series_code, sorted(parquet_paths)]
+        if start is not None or end is not None:
+            # Unbounded reads keep the key layout they had before bounds existed
+            parts += [
+                None if bound is None else pd.Timestamp(bound).isoformat() for bound in (start, end)
+            ]
+        payload = json.dumps(parts)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> SeriesFrame | None:
+        """Load an entry and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry.last_access = time.time()
+
+        try:
+            with pa.memory_map(str(self.cache_dir / entry.file_name)) as source:
+                table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning("series_disk_cache_entry_unreadable", key=key, error=str(e))
+            with self._lock:
+                self._drop(key)
+                self._index_dirty = True
+            self._save_index()
+            return None
+        if self.arrow_frames:
+            return table
+        return table.to_pandas()
+
+    def _put(self, key: str, frame: SeriesFrame) -> None:
+        """Write an entry, then evict least recently used entries over budget."""
+        table = frame if isinstance(frame, pa.Table) else pa.Table.from_pandas(
+            frame,
+            preserve_index=False,
+        )
+        file_name = f"{key}{_ENTRY_SUFFIX}"
+        target = self.cache_dir / file_name
+        tmp = target.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            size_bytes = tmp.stat().st_size
+            if size_bytes > self.max_bytes:
+                tmp.unlink(missing_ok=True)
+                return
+            tmp.replace(target)
+        except OSError as e:
+            logger.warning("series_disk_cache_write_failed", key=key, error=str(e))
+            tmp.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._drop(key, unlink=False)
+            self._entries[key] = _CacheEntry(file_name, size_bytes, time.time())
+            self._total_bytes += size_bytes
+            while self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                series_disk_cache_evictions.inc()
+            self._index_dirty = True
+            series_disk_cache_bytes.set(self._total_bytes)
+        self._save_index()
+
+    def _drop(self, key: str, unlink: bool = True) -> None:
+        """Remove an entry from the index (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size_bytes
+        if unlink:
+            (self.cache_dir / entry.file_name).unlink(missing_ok=True)
+
+    def _save_index(self, force: bool = False) -> None:
+        """Persist the index atomically if it changed and the write interval has passed."""
+        with self._index_lock:
+            with self._lock:
+                elapsed = time.monotonic() - self._index_written_at
+                if not self._index_dirty or (
+                    not force and elapsed < self.index_write_interval_seconds
+                ):
+                    return
+                payload = {key: asdict(entry) for key, entry in self._entries.items()}
+                self._index_dirty = False
+
+            index_path = self.cache_dir / _INDEX_FILE
+            tmp = index_path.with_suffix(".tmp")
+            try:
+                tmp.write_text(json.dumps(payload), encoding="utf-8")
+                tmp.replace(index_path)
+            except OSError as e:
+                logger.warning("series_disk_cache_index_write_failed", error=str(e))
+                tmp.unlink(missing_ok=True)
+                with self._lock:
+                    self._index_dirty = True
+                return
+            self._index_written_at = time.monotonic()
+
+    def _load_index(self) -> OrderedDict[str, _CacheEntry]:
+        """Load the persisted index, dropping missing entries and orphan files."""
+        index_path = self.cache_dir / _INDEX_FILE
+        entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        if index_path.exists():
+            try:
+                raw = json.loads(index_path.read_text(encoding="utf-8"))
+                ordered = sorted(raw.items(), key=lambda item: item[1]["last_access"])
+                loaded = [(key, _CacheEntry(**values)) for key, values in ordered]
+            except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+                # Unreadable or malformed: start empty, its files become orphans
+                logger.warning("series_disk_cache_index_unreadable", error=str(e))
+                loaded = []
+            for key, entry in loaded:
+                if (self.cache_dir / entry.file_name).exists():
+                    entries[key] = entry
+
+        # Only files the cache itself writes are removed, whatever else shares the dir
+        known_files = {entry.file_name for entry in entries.values()}
+        for path in self.cache_dir.iterdir():
+            if (
+                path.suffix in _OWNED_SUFFIXES
+                and path.name not in known_files
+                and path.is_file()
+            ):
+                path.unlink(missing_ok=True)
+
+        logger.info("series_disk_cache_loaded", entries=len(entries), cache_dir=str(self.cache_dir))
+        return entries
@@ -2,12 +2,21 @@
 
 import io
 import json
+import math
+from typing import cast
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from metrics_worker.domain.entities import MetricOutputManifest
 from metrics_worker.domain.ports import OutputWriterPort
-from metrics_worker.domain.types import ManifestSerializationDict, RunMarkerDict, SeriesFrame
+from metrics_worker.domain.types import (
+    JsonValue,
+    ManifestSerializationDict,
+    RunMarkerDict,
+    SeriesFrame,
+)
 from metrics_worker.infrastructure.aws.s3_io import S3IO
 from metrics_worker.infrastructure.aws.s3_path import S3Path
 from metrics_worker.infrastructure.observability.metrics import s3_write_mb
@@ -26,40 +35,13 @@ class JsonlWriter(OutputWriterPort):
         output_path: str,
     ) -> list[str]:
         """Write JSONL file(s) to S3."""
-        if isinstance(data, pd.DataFrame):
-            df = data
-        else:
-            # Convert PyArrow Table to DataFrame
-            df = data.to_pandas()
-
-        # Convert DataFrame to JSONL format
-        # Each row becomes a JSON object on a single line
-        buffer = io.StringIO()
-        
-        # Identify datetime columns for proper serialization
-        datetime_columns = {
-            col for col in df.columns 
-            if pd.api.types.is_datetime64_any_dtype(df[col])
-        }
-        
-        # Use orient='records' to get list of dicts, then write each as a line
-        records = df.to_dict(orient='records')
-        for record in records:
-            # Convert any NaN/NaT values to None (null in JSON)
-            cleaned_record = {
-                k: (None if pd.isna(v) else v) 
-                for k, v in record.items()
-            }
-            # Serialize datetime objects to ISO format strings
-            for key in datetime_columns:
-                if cleaned_record[key] is not None:
-                    cleaned_record[key] = pd.Timestamp(cleaned_record[key]).isoformat()
-            
-            json_line = json.dumps(cleaned_record, ensure_ascii=False, default=str)
-            buffer.write(json_line)
-            buffer.write('\n')
-
-        content = buffer.getvalue().encode('utf-8')
+        content = None
+        if isinstance(data, pa.Table):
+            content = _table_jsonl(data)
+        if content is None:
+            # DataFrames, and tables the Arrow path does not cover
+            frame = data if isinstance(data, pd.DataFrame) else data.to_pandas()
+            content = _frame_jsonl(frame)
 
         await self.s3_io.put_object(output_path, content, "application/x-ndjson")
 
@@ -82,9 +64,34 @@ class JsonlWriter(OutputWriterPort):
             "row_count": manifest.row_count,
             "outputs": manifest.outputs,
         }
+        if manifest.expression_hash is not None:
+            manifest_dict["expression_hash"] = manifest.expression_hash
+        if manifest.output_window is not None:
+            manifest_dict["output_window"] = manifest.output_window
 
         await self.s3_io.put_json(manifest_path, manifest_dict)
 
+    async def read_manifest(self, manifest_path: str) -> ManifestSerializationDict | None:
+        """Read an output manifest from S3, or None if it does not exist."""
+        if not await self.s3_io.object_exists(manifest_path):
+            return None
+        return cast(ManifestSerializationDict, await self.s3_io.get_json(manifest_path))
+
+    async def read_jsonl(self, paths: list[str]) -> SeriesFrame:
+        """Read JSONL output files back into an obs_time/value frame."""
+        records: list[dict[str, JsonValue]] = []
+        for path in paths:
+            content = await self.s3_io.get_object(path)
+            records.extend(
+                json.loads(line) for line in content.decode("utf-8").splitlines() if line
+            )
+
+        frame = pd.DataFrame.from_records(records, columns=["obs_time", "value"])
+        obs_time = pd.to_datetime(frame["obs_time"], utc=True, format="ISO8601")
+        frame["obs_time"] = obs_time.dt.tz_localize(None)
+        frame["value"] = frame["value"].astype("float64")
+        return frame
+
     async def check_run_marker(self, marker_path: str) -> bool:
         """Check if run marker exists."""
         return await self.s3_io.object_exists(marker_path)
@@ -95,3 +102,62 @@ class JsonlWriter(OutputWriterPort):
         marker_dict: RunMarkerDict = {"run_id": run_id}
         await self.s3_io.put_json(marker_path, marker_dict)
 
+
+def _frame_jsonl(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame as JSONL, one object per row."""
+    buffer = io.StringIO()
+
+    # Identify datetime columns for proper serialization
+    datetime_columns = {
+        col for col in df.columns
+        if pd.api.types.is_datetime64_any_dtype(df[col])
+    }
+
+    # Use orient='records' to get list of dicts, then write each as a line
+    records = df.to_dict(orient='records')
+    for record in records:
+        # Convert any NaN/NaT values to None (null in JSON)
+        cleaned_record = {
+            k: (None if pd.isna(v) else v)
+            for k, v in record.items()
+        }
+        # Serialize datetime objects to ISO format strings
+        for key in datetime_columns:
+            if cleaned_record[key] is not None:
+                cleaned_record[key] = pd.Timestamp(cleaned_record[key]).isoformat()
+
+        json_line = json.dumps(cleaned_record, ensure_ascii=False, default=str)
+        buffer.write(json_line)
+        buffer.write('\n')
+
+    return buffer.getvalue().encode('utf-8')
+
+
+def _table_jsonl(table: pa.Table) -> bytes | None:
+    """Serialize an obs_time/value table as JSONL without converting it to pandas.
+
+    The output is byte-identical to ``_frame_jsonl`` on the same rows. Returns
+    None for tables it does not cover (other columns, time zones or sub-second
+    times), which are serialized through pandas instead.
+    """
+    if table.column_names != ["obs_time", "value"]:
+        return None
+    obs_type = table.schema.field("obs_time").type
+    if not pa.types.is_timestamp(obs_type) or obs_type.tz is not None:
+        return None
+    if not pa.types.is_floating(table.schema.field("value").type):
+        return None
+    try:
+        # A safe cast fails on sub-second times, whose isoformat has a fraction
+        seconds = table.column("obs_time").cast(pa.timestamp("s"))
+    except pa.ArrowInvalid:
+        return None
+
+    obs_times = pc.strftime(seconds, format="%Y-%m-%dT%H:%M:%S").to_pylist()
+    buffer = io.StringIO()
+    for obs_time, value in zip(obs_times, table.column("value").to_pylist(), strict=True):
+        # NaN is written as null, like a missing value
+        json_value = None if value is None or math.isnan(value) else value
+        buffer.write(json.dumps({"obs_time": obs_time, "value": json_value}, ensure_ascii=False))
+        buffer.write('\n')
+    return buffer.getvalue().encode('utf-8')
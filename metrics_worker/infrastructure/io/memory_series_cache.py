@@ -0,0 +1,214 @@
+"""In-process cache of decoded series."""
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+import structlog
+
+from metrics_worker.domain.ports import DataReaderPort
+from metrics_worker.domain.types import SeriesFrame, Timestamp
+from metrics_worker.infrastructure.observability.metrics import (
+    series_memory_cache_evictions,
+    series_memory_cache_hit_ratio,
+    series_memory_cache_hits,
+    series_memory_cache_misses,
+    series_memory_cache_resident_bytes,
+)
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class _CachedSeries:
+    """Normalized, read-only series columns (or an immutable Arrow table)."""
+
+    obs_time: npt.NDArray[np.datetime64] | None
+    value: npt.NDArray[np.float64] | None
+    table: pa.Table | None
+    size_bytes: int
+
+    def view(self) -> SeriesFrame:
+        """Wrap the cached buffers in a new frame without copying them."""
+        if self.table is not None:
+            return self.table
+        return pd.DataFrame({"obs_time": self.obs_time, "value": self.value}, copy=False)
+
+
+class MemorySeriesCache(DataReaderPort):
+    """DataReaderPort decorator keeping normalized series frames in memory.
+
+    Frames are stored as sorted ``datetime64[ns]`` / ``float64`` arrays marked
+    read-only; every hit returns a fresh DataFrame over the same buffers, so
+    callers can add or replace columns but any in-place write raises instead of
+    corrupting the cache. Entries are keyed by dataset ``version_id``, series code
+    and object paths, and evicted least-recently-used first once their combined
+    size exceeds ``max_bytes``. Reads without a ``dataset_version`` bypass the cache.
+    """
+
+    def __init__(self, inner: DataReaderPort, max_bytes: int) -> None:
+        """Initialize cache."""
+        self.inner = inner
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _CachedSeries] = OrderedDict()
+        self._resident_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    async def read_series_from_paths(
+        self,
+        parquet_paths: list[str],
+        series_code: str,
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> SeriesFrame:
+        """Read series from memory, falling back to the wrapped reader."""
+        if dataset_version is None:
+            return await self.inner.read_series_from_paths(
+                parquet_paths,
+                series_code,
+                start=start,
+                end=end,
+            )
+
+        key = self._cache_key(parquet_paths, series_code, dataset_version, start, end)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self._record(hit=True)
+            return cached.view()
+
+        self._record(hit=False)
+        frame = await self.inner.read_series_from_paths(
+            parquet_paths,
+            series_code,
+            dataset_version=dataset_version,
+            start=start,
+            end=end,
+        )
+        entry = self._freeze(frame)
+        self._put(key, entry)
+        return entry.view()
+
+    async def read_many_series_from_paths(
+        self,
+        paths_by_series: dict[str, list[str]],
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> dict[str, SeriesFrame]:
+        """Serve cached series from memory and read the rest in one wrapped call."""
+        if dataset_version is None:
+            return await self.inner.read_many_series_from_paths(
+                paths_by_series,
+                start=start,
+                end=end,
+            )
+
+        frames: dict[str, SeriesFrame] = {}
+        missing: dict[str, str] = {}
+        for series_code, parquet_paths in paths_by_series.items():
+            key = self._cache_key(parquet_paths, series_code, dataset_version, start, end)
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._record(hit=True)
+                frames[series_code] = cached.view()
+            else:
+                self._record(hit=False)
+                missing[series_code] = key
+
+        if missing:
+            read = await self.inner.read_many_series_from_paths(
+                {series_code: paths_by_series[series_code] for series_code in missing},
+                dataset_version=dataset_version,
+                start=start,
+                end=end,
+            )
+            for series_code, key in missing.items():
+                entry = self._freeze(read[series_code])
+                self._put(key, entry)
+                frames[series_code] = entry.view()
+
+        return {series_code: frames[series_code] for series_code in paths_by_series}
+
+    @property
+    def resident_bytes(self) -> int:
+        """Bytes currently held in memory."""
+        return self._resident_bytes
+
+    @property
+    def hit_ratio(self) -> float:
+        """Hits over lookups since start (0.0 before the first lookup)."""
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def _cache_key(
+        parquet_paths: list[str],
+        series_code: str,
+        dataset_version: str,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> str:
+        """Build a stable key from version, series code, object paths and bounds."""
+        parts: list[object] = [dataset_version, series_code, sorted(parquet_paths)]
+        if start is not None or end is not None:
+            # Unbounded reads keep the key layout they had before bounds existed
+            parts += [
+                None if bound is None else pd.Timestamp(bound).isoformat() for bound in (start, end)
+            ]
+        payload = json.dumps(parts)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _freeze(frame: SeriesFrame) -> _CachedSeries:
+        """Normalize a frame and mark its buffers read-only."""
+        if isinstance(frame, pa.Table):
+            return _CachedSeries(None, None, frame, frame.nbytes)
+
+        obs_time = np.asarray(frame["obs_time"].to_numpy(dtype="datetime64[ns]"))
+        value = np.asarray(frame["value"].to_numpy(dtype="float64"))
+        if len(obs_time) > 1 and not (obs_time[1:] >= obs_time[:-1]).all():
+            order = np.argsort(obs_time, kind="stable")
+            obs_time = obs_time[order]
+            value = value[order]
+        # Own the buffers so no caller-held frame can write into them later
+        if not obs_time.flags.owndata:
+            obs_time = obs_time.copy()
+        if not value.flags.owndata:
+            value = value.copy()
+        obs_time.flags.writeable = False
+        value.flags.writeable = False
+        return _CachedSeries(obs_time, value, None, obs_time.nbytes + value.nbytes)
+
+    def _put(self, key: str, entry: _CachedSeries) -> None:
+        """Insert an entry and evict least recently used entries over budget."""
+        if entry.size_bytes > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._resident_bytes -= previous.size_bytes
+        self._entries[key] = entry
+        self._resident_bytes += entry.size_bytes
+        while self._resident_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._resident_bytes -= evicted.size_bytes
+            series_memory_cache_evictions.inc()
+        series_memory_cache_resident_bytes.set(self._resident_bytes)
+
+    def _record(self, hit: bool) -> None:
+        """Update hit/miss counters and the exported hit ratio."""
+        if hit:
+            self._hits += 1
+            series_memory_cache_hits.inc()
+        else:
+            self._misses += 1
+            series_memory_cache_misses.inc()
+        series_memory_cache_hit_ratio.set(self.hit_ratio)
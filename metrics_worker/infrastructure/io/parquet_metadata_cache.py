@@ -0,0 +1,111 @@
+"""Cache of Parquet footers for objects already read."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import structlog
+
+from metrics_worker.infrastructure.observability.metrics import parquet_metadata_cache_requests
+
+logger = structlog.get_logger()
+
+_FOOTER_SUFFIX = ".footer.parquet"
+
+# Object path, size and mtime (ns) as listed: a rewritten object gets a new key
+FooterKey = tuple[str, int, int]
+
+
+class ParquetMetadataCache:
+    """Parquet fragments with loaded footers, keyed by object path, size and mtime.
+
+    A fragment keeps its ``FileMetaData`` once ``ensure_complete_metadata()`` has
+    run: scanning it reuses the footer instead of reading it again, and
+    ``subset(filter)`` prunes row groups by their statistics without any I/O.
+    Fragments are held in memory, least recently used first out once there are
+    more than ``max_entries``.
+
+    With ``cache_dir`` the footers are also written to disk. After a restart a
+    persisted footer still lets row groups (and whole files) be pruned before any
+    request; the footer is read from the object store again only when the file
+    has to be scanned.
+    """
+
+    def __init__(self, max_entries: int, cache_dir: str | Path | None = None) -> None:
+        """Initialize cache."""
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._format = ds.ParquetFileFormat()
+        self._lock = threading.Lock()
+        self._fragments: OrderedDict[FooterKey, ds.ParquetFileFragment] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Fragments held in memory."""
+        return len(self._fragments)
+
+    def get(self, key: FooterKey) -> ds.ParquetFileFragment | None:
+        """Return the scannable fragment of ``key``, if its footer is in memory."""
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+        parquet_metadata_cache_requests.labels(result="hit" if fragment else "miss").inc()
+        return fragment
+
+    def get_persisted(self, key: FooterKey) -> ds.ParquetFileFragment | None:
+        """Return a footer-only fragment of ``key`` from disk, for pruning only.
+
+        The fragment reads from the stored footer, not the object: use it with
+        ``subset`` to choose row groups, never to scan.
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            footer = (self.cache_dir / _file_name(key)).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("parquet_metadata_cache_unreadable", path=key[0], error=str(e))
+            return None
+
+        fragment = self._format.make_fragment(pa.BufferReader(footer))
+        try:
+            fragment.ensure_complete_metadata()
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning("parquet_metadata_cache_unreadable", path=key[0], error=str(e))
+            return None
+        parquet_metadata_cache_requests.labels(result="persisted").inc()
+        return fragment
+
+    def put(self, key: FooterKey, fragment: ds.ParquetFileFragment) -> None:
+        """Remember a fragment whose footer is loaded, persisting the footer."""
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+        if self.cache_dir is None:
+            return
+        target = self.cache_dir / _file_name(key)
+        if target.exists():
+            return
+        tmp = target.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with pa.OSFile(str(tmp), "wb") as sink:
+                fragment.metadata.write_metadata_file(sink)
+            tmp.replace(target)
+        except OSError as e:
+            logger.warning("parquet_metadata_cache_write_failed", path=key[0], error=str(e))
+            tmp.unlink(missing_ok=True)
+
+
+def _file_name(key: FooterKey) -> str:
+    path, size, mtime_ns = key
+    digest = hashlib.sha256(f"{path}\n{size}\n{mtime_ns}".encode()).hexdigest()
+    return f"{digest}{_FOOTER_SUFFIX}"
@@ -1,42 +1,290 @@
 """Parquet reader with PyArrow."""
 
-import structlog
+import asyncio
+import contextvars
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.dataset as ds
+import structlog
 from pyarrow import Table
-from pyarrow.fs import S3FileSystem
+from pyarrow.fs import FileSelector, FileSystem, S3FileSystem
 
 from metrics_worker.domain.ports import DataReaderPort
-from metrics_worker.domain.types import SeriesFrame
+from metrics_worker.domain.types import SeriesFrame, Timestamp
 from metrics_worker.infrastructure.aws.s3_io import S3IO
-from metrics_worker.infrastructure.aws.s3_path import S3Path
+from metrics_worker.infrastructure.io.parquet_metadata_cache import FooterKey, ParquetMetadataCache
 from metrics_worker.infrastructure.observability.metrics import s3_read_mb
+from metrics_worker.infrastructure.observability.object_requests import (
+    record_estimated_object_requests,
+)
 
 logger = structlog.get_logger()
 
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_FRAGMENT_READAHEAD = 16
+DEFAULT_FETCH_CONCURRENCY = 64
+
+_PARTITION_MONTH_RE = re.compile(r"(?:^|/)year=(\d{4})/month=(\d{1,2})(?:/|$)")
+
+# ``series_year_month`` layout: <root>/<SERIES_CODE>/year=<YYYY>/month=<MM>/<file>.parquet
+_SERIES_DIR_RE = re.compile(r"^((.*?)[^/]+/)year=\d{4}/month=\d{1,2}/")
+
+_COLUMNS = ["obs_time", "value", "internal_series_code"]
+
+# Series returned as Arrow tables (``arrow_frames``)
+_SERIES_SCHEMA = pa.schema([("obs_time", pa.timestamp("ns")), ("value", pa.float64())])
+
+# Bound on remembered (dataset_version, path) file stats and listed directories
+_FILE_STATS_MAX = 200_000
+
 
 class ParquetReader(DataReaderPort):
-    """Parquet reader with column pruning and predicate pushdown."""
+    """Parquet reader with column pruning and predicate pushdown.
+
+    PyArrow scans are blocking, so they run on a dedicated thread pool. This keeps
+    the event loop free (heartbeats, SQS visibility extensions) and lets concurrent
+    ``read_series_from_paths`` calls actually overlap.
+
+    The filesystem and Parquet format are built once and reused by every scan;
+    pass the process-wide filesystem from ``get_s3_filesystem`` in production.
 
-    def __init__(self, s3_io: S3IO) -> None:
+    With ``start`` / ``end`` bounds, files whose ``year=/month=`` partition lies
+    outside the range are dropped before the dataset is opened, and the bounds are
+    pushed into the scan filter so row groups are pruned by their statistics.
+
+    ``read_many_series_from_paths`` opens one dataset over the union of the files
+    of several series and scans it once with an ``isin`` filter, so footers are read
+    once per file and per-scan overhead is paid once per dataset.
+
+    Datasets are built from fragments rather than discovered: the schema is the
+    one passed in, or the one discovered by the first scan of each dataset root and
+    ``dataset_version``. For versioned reads, object sizes come from one listing per
+    series directory and version, so opening a file needs no HEAD request. Scans
+    pre-buffer column chunks and read ``fragment_readahead`` files ahead. The
+    requests of each access plan are estimated per kind (see ``object_requests``).
+
+    Series frames are converted from Arrow with as few copies as possible, and
+    their columns may be read-only: callers must not write into them in place.
+    With ``arrow_frames`` they are returned as ``pa.Table`` (obs_time, value)
+    instead, for the Arrow expression engine, and never converted at all.
+
+    Projection files are small, so per-request latency dominates. With
+    ``whole_object_max_bytes`` set, versioned reads download every file of known
+    size up to that threshold whole, with one GET each (at most
+    ``fetch_concurrency`` in flight), and decode it from memory instead of issuing
+    separate footer and column-chunk reads. Larger files, and files whose fetch
+    fails, are read from the filesystem as usual.
+
+    With a ``metadata_cache``, the footers of files opened by versioned reads are
+    loaded up front (in parallel) and kept across runs, keyed by object path, size
+    and modification time from the listing. Row groups, and whole files, that the
+    scan filter excludes by their statistics are then dropped before the scan, and
+    files already seen are scanned without reading their footer again.
+    """
+
+    def __init__(
+        self,
+        s3_io: S3IO,
+        filesystem: FileSystem | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        schema: pa.Schema | None = None,
+        fragment_readahead: int = DEFAULT_FRAGMENT_READAHEAD,
+        whole_object_max_bytes: int = 0,
+        fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        metadata_cache: ParquetMetadataCache | None = None,
+        arrow_frames: bool = False,
+    ) -> None:
         """Initialize parquet reader."""
         self.s3_io = s3_io
         self.bucket = s3_io.bucket
+        self.filesystem = filesystem if filesystem is not None else S3FileSystem()
+        self.schema = schema
+        self.fragment_readahead = fragment_readahead
+        self.whole_object_max_bytes = whole_object_max_bytes
+        self.metadata_cache = metadata_cache
+        self.arrow_frames = arrow_frames
+        self._fetch_slots = asyncio.Semaphore(fetch_concurrency)
+        self._format = ds.ParquetFileFormat(
+            default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True),
+        )
+        self._lock = threading.Lock()
+        self._schemas: dict[tuple[str, str | None], pa.Schema] = {}
+        # (dataset_version, path) -> (size, mtime_ns) as listed
+        self._file_stats: OrderedDict[tuple[str, str], tuple[int, int | None]] = OrderedDict()
+        self._listed_dirs: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="parquet-reader",
+        )
+        # Footer reads are submitted from scan threads, so they get their own pool
+        self._metadata_executor = ThreadPoolExecutor(
+            max_workers=max(1, fragment_readahead),
+            thread_name_prefix="parquet-footer",
+        )
 
     async def read_series_from_paths(
         self,
         parquet_paths: list[str],
         series_code: str,
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
     ) -> SeriesFrame:
         """Read series data from specific parquet file paths."""
         if not parquet_paths:
-            raise ValueError(f"No parquet paths provided for series {series_code}")
+            msg = f"No parquet paths provided for series {series_code}"
+            raise ValueError(msg)
 
-        # PyArrow S3FileSystem expects paths in format: bucket/key (not s3://bucket/key)
-        # So we need to construct paths as bucket/path
-        pyarrow_paths = [
-            f"{self.bucket}/{path.lstrip('/')}" for path in parquet_paths
+        prefetched = await self._prefetch_small_objects(parquet_paths, dataset_version, start, end)
+
+        loop = asyncio.get_running_loop()
+        # Run in a copy of this context so request counts reach the current run
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor,
+            context.run,
+            self._read_series_sync,
+            parquet_paths,
+            series_code,
+            start,
+            end,
+            dataset_version,
+            prefetched,
+        )
+
+    async def read_many_series_from_paths(
+        self,
+        paths_by_series: dict[str, list[str]],
+        dataset_version: str | None = None,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+    ) -> dict[str, SeriesFrame]:
+        """Read several series with a single scan over the union of their files."""
+        for series_code, parquet_paths in paths_by_series.items():
+            if not parquet_paths:
+                msg = f"No parquet paths provided for series {series_code}"
+                raise ValueError(msg)
+        if len(paths_by_series) < 2:
+            return await super().read_many_series_from_paths(
+                paths_by_series,
+                dataset_version=dataset_version,
+                start=start,
+                end=end,
+            )
+
+        all_paths = list(dict.fromkeys(p for paths in paths_by_series.values() for p in paths))
+        prefetched = await self._prefetch_small_objects(all_paths, dataset_version, start, end)
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor,
+            context.run,
+            self._read_many_series_sync,
+            paths_by_series,
+            start,
+            end,
+            dataset_version,
+            prefetched,
+        )
+
+    def shutdown(self) -> None:
+        """Release the scan and footer thread pools."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._metadata_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _prefetch_small_objects(
+        self,
+        parquet_paths: list[str],
+        dataset_version: str | None,
+        start: Timestamp | None,
+        end: Timestamp | None,
+    ) -> dict[str, bytes]:
+        """Download the small files a scan will open, keyed by PyArrow path."""
+        if self.whole_object_max_bytes <= 0 or dataset_version is None:
+            return {}
+
+        start_ts = _utc_naive(start)
+        end_ts = _utc_naive(end)
+        if start_ts is not None or end_ts is not None:
+            parquet_paths = _prune_partitions(parquet_paths, start_ts, end_ts)
+        pyarrow_paths = [self._pyarrow_path(path) for path in parquet_paths]
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        stats = await loop.run_in_executor(
+            self._executor,
+            context.run,
+            self._file_stats_for,
+            pyarrow_paths,
+            dataset_version,
+        )
+        small = [
+            (path, pyarrow_path)
+            for path, pyarrow_path in zip(parquet_paths, pyarrow_paths, strict=True)
+            if pyarrow_path in stats and stats[pyarrow_path][0] <= self.whole_object_max_bytes
         ]
+        if not small:
+            return {}
+
+        bodies = await asyncio.gather(
+            *(self._fetch_object(path) for path, _ in small),
+            return_exceptions=True,
+        )
+        record_estimated_object_requests("object", len(small))
+
+        prefetched: dict[str, bytes] = {}
+        for (path, pyarrow_path), body in zip(small, bodies, strict=True):
+            if isinstance(body, BaseException):
+                # The scan reads this file through the filesystem instead
+                logger.warning("parquet_object_fetch_failed", path=path, error=str(body))
+                continue
+            prefetched[pyarrow_path] = body
+        return prefetched
+
+    async def _fetch_object(self, path: str) -> bytes:
+        """GET one whole object, bounded by the fetch concurrency."""
+        async with self._fetch_slots:
+            return await self.s3_io.get_object(path.lstrip("/"))
+
+    def _pyarrow_path(self, path: str) -> str:
+        """PyArrow filesystem path (``bucket/key``) of a bucket-relative path."""
+        return f"{self.bucket}/{path.lstrip('/')}"
+
+    def _read_series_sync(
+        self,
+        parquet_paths: list[str],
+        series_code: str,
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+        dataset_version: str | None = None,
+        prefetched: dict[str, bytes] | None = None,
+    ) -> SeriesFrame:
+        """Blocking scan of a series; runs on the reader thread pool."""
+        start_ts = _utc_naive(start)
+        end_ts = _utc_naive(end)
+        bounded = start_ts is not None or end_ts is not None
+        if bounded:
+            listed_count = len(parquet_paths)
+            parquet_paths = _prune_partitions(parquet_paths, start_ts, end_ts)
+            logger.info(
+                "partitions_pruned",
+                series_code=series_code,
+                listed_files=listed_count,
+                kept_files=len(parquet_paths),
+            )
+            if not parquet_paths:
+                return self._empty_series()
 
         logger.info(
             "reading_series_from_paths",
@@ -47,73 +295,396 @@ class ParquetReader(DataReaderPort):
             bucket=self.bucket,
         )
 
-        filesystem = S3FileSystem()
-        try:
-            # Create dataset from multiple parquet files
-            # PyArrow expects paths in format: bucket/key
-            dataset = ds.dataset(
-                pyarrow_paths,
-                format="parquet",
-                filesystem=filesystem,
-            )
-        except (OSError, FileNotFoundError, ValueError) as e:
-            logger.error(
-                "failed_to_open_dataset_from_paths",
-                series_code=series_code,
-                parquet_files_count=len(parquet_paths),
-                first_path=parquet_paths[0] if parquet_paths else None,
-                error=str(e),
-            )
-            raise ValueError(
-                f"Series not found: {series_code} (failed to open dataset from paths): {e}"
-            ) from e
+        dataset, scan_filter = self._open_dataset(
+            parquet_paths,
+            [series_code],
+            dataset_version,
+            prefetched,
+            start_ts,
+            end_ts,
+        )
 
-        columns = ["obs_time", "value", "internal_series_code"]
+        table = self._scan(dataset, scan_filter, [series_code], parquet_paths)
 
-        scanner = dataset.scanner(
-            columns=columns,
-            filter=ds.field("internal_series_code") == series_code,
+        if len(table) == 0 and bounded:
+            # The series may exist outside the requested range
+            return self._empty_series()
+
+        if len(table) == 0:
+            raise self._series_not_found(dataset, series_code, parquet_paths)
+
+        # The scanner filter is exact: every row belongs to series_code
+        size_mb = table.nbytes / (1024 * 1024)
+        if self.arrow_frames:
+            series = _series_table(table, start_ts, end_ts)
+        else:
+            series = _series_table_frame(table, start_ts, end_ts)
+        s3_read_mb.observe(size_mb)
+
+        logger.info(
+            "series_read_success_from_paths",
+            series_code=series_code,
+            row_count=len(series),
+            size_mb=size_mb,
+            parquet_files_count=len(parquet_paths),
         )
 
-        table: Table = scanner.to_table()
+        return series
 
-        if len(table) == 0:
-            available_series = self._list_available_series(dataset)
-            error_msg = (
-                f"Series not found: {series_code} "
-                f"(searched in {len(parquet_paths)} parquet files). "
-                f"Available series: {available_series[:20] if available_series else 'none found'}"
-            )
-            logger.error(
-                "series_not_found_in_paths",
-                series_code=series_code,
-                parquet_files_count=len(parquet_paths),
-                first_path=parquet_paths[0] if parquet_paths else None,
-                available_count=len(available_series) if available_series else 0,
-                available_series=available_series[:10] if available_series else [],
+    def _read_many_series_sync(
+        self,
+        paths_by_series: dict[str, list[str]],
+        start: Timestamp | None = None,
+        end: Timestamp | None = None,
+        dataset_version: str | None = None,
+        prefetched: dict[str, bytes] | None = None,
+    ) -> dict[str, SeriesFrame]:
+        """Blocking single scan of several series; runs on the reader thread pool."""
+        start_ts = _utc_naive(start)
+        end_ts = _utc_naive(end)
+        bounded = start_ts is not None or end_ts is not None
+        series_codes = list(paths_by_series)
+        # Series may share files (non-partitioned layouts); each file is read once
+        parquet_paths = list(dict.fromkeys(p for paths in paths_by_series.values() for p in paths))
+        if bounded:
+            listed_count = len(parquet_paths)
+            parquet_paths = _prune_partitions(parquet_paths, start_ts, end_ts)
+            logger.info(
+                "partitions_pruned",
+                series_codes=series_codes,
+                listed_files=listed_count,
+                kept_files=len(parquet_paths),
             )
-            raise ValueError(error_msg)
+            if not parquet_paths:
+                return {series_code: self._empty_series() for series_code in series_codes}
+
+        logger.info(
+            "reading_many_series_from_paths",
+            series_codes=series_codes,
+            parquet_files_count=len(parquet_paths),
+            bucket=self.bucket,
+        )
+
+        dataset, scan_filter = self._open_dataset(
+            parquet_paths,
+            series_codes,
+            dataset_version,
+            prefetched,
+            start_ts,
+            end_ts,
+        )
 
-        df = table.to_pandas()
+        table = self._scan(dataset, scan_filter, series_codes, parquet_paths)
+        groups: dict[str, SeriesFrame]
+        if self.arrow_frames:
+            groups = {
+                series_code: _series_table(group, start_ts, end_ts)
+                for series_code, group in _split_table_by_series(table).items()
+            }
+        else:
+            groups = {
+                series_code: _series_frame(group, start_ts, end_ts)
+                for series_code, group in _split_by_series(table).items()
+            }
 
-        # Filter already applied in scanner, but double-check and select columns
-        df = df[df["internal_series_code"] == series_code][["obs_time", "value"]].copy()
-        df["obs_time"] = df["obs_time"].astype("datetime64[ns]")
-        df["value"] = df["value"].astype("float64")
-        df = df.sort_values("obs_time").reset_index(drop=True)
+        frames: dict[str, SeriesFrame] = {}
+        for series_code in series_codes:
+            group = groups.get(series_code)
+            if group is not None:
+                frames[series_code] = group
+            elif bounded:
+                # The series may exist outside the requested range
+                frames[series_code] = self._empty_series()
+            else:
+                raise self._series_not_found(dataset, series_code, parquet_paths)
 
         size_mb = table.nbytes / (1024 * 1024)
         s3_read_mb.observe(size_mb)
 
         logger.info(
-            "series_read_success_from_paths",
-            series_code=series_code,
-            row_count=len(df),
+            "many_series_read_success_from_paths",
+            series_codes=series_codes,
+            row_count=len(table),
             size_mb=size_mb,
             parquet_files_count=len(parquet_paths),
         )
 
-        return df
+        return frames
+
+    def _open_dataset(
+        self,
+        parquet_paths: list[str],
+        series_codes: list[str],
+        dataset_version: str | None = None,
+        prefetched: dict[str, bytes] | None = None,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> tuple[ds.Dataset, ds.Expression]:
+        """Open a dataset over bucket-relative parquet paths, with its scan filter.
+
+        Files in ``prefetched`` (keyed by PyArrow path) are decoded from memory.
+        """
+        # PyArrow S3FileSystem expects paths in format: bucket/key (not s3://bucket/key)
+        # So we need to construct paths as bucket/path
+        pyarrow_paths = [self._pyarrow_path(path) for path in parquet_paths]
+        schema_key = (_dataset_root(pyarrow_paths[0]), dataset_version)
+        prefetched = prefetched or {}
+
+        try:
+            with self._lock:
+                schema = self.schema or self._schemas.get(schema_key)
+            if schema is None and prefetched:
+                # A downloaded footer gives the schema without another request
+                body = next(iter(prefetched.values()))
+                schema = self._format.make_fragment(pa.BufferReader(body)).physical_schema
+                with self._lock:
+                    self._schemas[schema_key] = schema
+            if schema is not None:
+                scan_filter = _scan_filter(series_codes, schema, start, end)
+                dataset = self._dataset_from_fragments(
+                    pyarrow_paths,
+                    schema,
+                    dataset_version,
+                    prefetched,
+                    scan_filter,
+                )
+                return dataset, scan_filter
+
+            # First scan of this root/version: discover the schema from a footer
+            # (one HEAD and one footer read), then remember it
+            dataset = ds.dataset(
+                pyarrow_paths,
+                format=self._format,
+                filesystem=self.filesystem,
+            )
+            # Estimated from the plan: one request of each kind per file
+            record_estimated_object_requests("head", 1 + len(pyarrow_paths))
+            record_estimated_object_requests("footer", 1 + len(pyarrow_paths))
+            record_estimated_object_requests("data", len(pyarrow_paths))
+            with self._lock:
+                self._schemas[schema_key] = dataset.schema
+            return dataset, _scan_filter(series_codes, dataset.schema, start, end)
+        except (OSError, ValueError) as e:
+            error = _read_failed("open", series_codes, parquet_paths, e)
+            raise error from e
+
+    def _scan(
+        self,
+        dataset: ds.Dataset,
+        scan_filter: ds.Expression,
+        series_codes: list[str],
+        parquet_paths: list[str],
+    ) -> Table:
+        """Scan the series columns of a dataset from ``_open_dataset``.
+
+        Datasets built from fragments first touch their files here, so a missing
+        or unreadable object is reported like one that fails to open.
+        """
+        scanner = dataset.scanner(
+            columns=_COLUMNS,
+            filter=scan_filter,
+            fragment_readahead=self.fragment_readahead,
+        )
+        try:
+            table: Table = scanner.to_table()
+        except (OSError, ValueError) as e:
+            error = _read_failed("read", series_codes, parquet_paths, e)
+            raise error from e
+        return table
+
+    def _dataset_from_fragments(
+        self,
+        pyarrow_paths: list[str],
+        schema: pa.Schema,
+        dataset_version: str | None,
+        prefetched: dict[str, bytes],
+        scan_filter: ds.Expression,
+    ) -> ds.Dataset:
+        """Build a dataset from a known schema, without inspecting any file.
+
+        With a metadata cache, remote files of known size and mtime are opened from
+        cached footers, or have their footers loaded now, and are narrowed to the
+        row groups ``scan_filter`` may match.
+        """
+        remote_paths = [path for path in pyarrow_paths if path not in prefetched]
+        stats = self._file_stats_for(remote_paths, dataset_version) if remote_paths else {}
+        cached: dict[str, ds.ParquetFileFragment | None] = {}
+        if self.metadata_cache is not None:
+            # Footers are keyed by mtime, so files listed without one are not cached
+            footer_stats: dict[str, tuple[int, int]] = {}
+            for path in remote_paths:
+                size, mtime_ns = stats.get(path, (0, None))
+                if mtime_ns is not None:
+                    footer_stats[path] = (size, mtime_ns)
+            cached = self._cached_fragments(self.metadata_cache, footer_stats, scan_filter)
+
+        fragments = []
+        for path in pyarrow_paths:
+            body = prefetched.get(path)
+            if body is not None:
+                fragments.append(self._format.make_fragment(pa.BufferReader(body)))
+            elif path in cached:
+                if cached[path] is not None:
+                    fragments.append(cached[path])
+            else:
+                file_size = stats[path][0] if path in stats else None
+                fragments.append(
+                    self._format.make_fragment(
+                        path,
+                        filesystem=self.filesystem,
+                        file_size=file_size,
+                    )
+                )
+        # Estimated from the plan: files without a known size need a HEAD, files
+        # without a cached fragment a footer read, and every remote file a data read
+        uncached = len(remote_paths) - len(cached)
+        record_estimated_object_requests("head", len(remote_paths) - len(stats))
+        record_estimated_object_requests("footer", uncached)
+        scanned = uncached + sum(fragment is not None for fragment in cached.values())
+        record_estimated_object_requests("data", scanned)
+        return ds.FileSystemDataset(fragments, schema, self._format, self.filesystem)
+
+    def _cached_fragments(
+        self,
+        cache: ParquetMetadataCache,
+        footer_stats: dict[str, tuple[int, int]],
+        scan_filter: ds.Expression,
+    ) -> dict[str, ds.ParquetFileFragment | None]:
+        """Fragments with loaded footers, narrowed to the row groups the filter may match.
+
+        None marks a file whose statistics rule out every row group: it is not
+        scanned at all. Footers that are neither in memory nor excluded by a
+        persisted copy are read from the filesystem in parallel, one request each.
+        """
+        fragments: dict[str, ds.ParquetFileFragment | None] = {}
+        to_load: list[tuple[str, FooterKey]] = []
+        for path, (size, mtime_ns) in footer_stats.items():
+            key = (path, size, mtime_ns)
+            fragment = cache.get(key)
+            if fragment is not None:
+                fragments[path] = _narrowed(fragment, scan_filter)
+                continue
+            persisted = cache.get_persisted(key)
+            if persisted is not None and not persisted.subset(scan_filter).row_groups:
+                fragments[path] = None
+                continue
+            to_load.append((path, key))
+
+        record_estimated_object_requests("footer", len(to_load))
+        loads = [
+            self._metadata_executor.submit(self._load_footer, path, key[1])
+            for path, key in to_load
+        ]
+        for (path, key), load in zip(to_load, loads, strict=True):
+            try:
+                fragment = load.result()
+            except OSError as e:
+                # The scan reads this footer itself and reports any real error
+                logger.warning("parquet_footer_load_failed", path=path, error=str(e))
+                continue
+            cache.put(key, fragment)
+            fragments[path] = _narrowed(fragment, scan_filter)
+        return fragments
+
+    def _load_footer(self, path: str, size: int) -> ds.ParquetFileFragment:
+        """Open a remote fragment and read its footer."""
+        fragment = self._format.make_fragment(path, filesystem=self.filesystem, file_size=size)
+        fragment.ensure_complete_metadata()
+        return fragment
+
+    def _file_stats_for(
+        self,
+        pyarrow_paths: list[str],
+        dataset_version: str | None,
+    ) -> dict[str, tuple[int, int | None]]:
+        """Known (size, mtime_ns) of ``pyarrow_paths``, listing unseen series directories.
+
+        Stats are only trusted within a ``dataset_version``: a path rewritten by a
+        later version may have another size.
+        """
+        if dataset_version is None:
+            return {}
+
+        with self._lock:
+            missing_dirs = {
+                _series_dir(path)
+                for path in pyarrow_paths
+                if (dataset_version, path) not in self._file_stats
+            }
+            missing_dirs = {
+                directory
+                for directory in missing_dirs
+                if (dataset_version, directory) not in self._listed_dirs
+            }
+
+        for directory in sorted(missing_dirs):
+            try:
+                infos = self.filesystem.get_file_info(
+                    FileSelector(directory, allow_not_found=True, recursive=True)
+                )
+            except OSError as e:
+                # Scans still work without stats, at one HEAD per file
+                logger.warning("parquet_file_listing_failed", directory=directory, error=str(e))
+                infos = []
+            record_estimated_object_requests("list")
+            with self._lock:
+                for info in infos:
+                    if info.is_file:
+                        self._remember(
+                            self._file_stats,
+                            (dataset_version, info.path),
+                            (info.size, info.mtime_ns),
+                        )
+                self._remember(self._listed_dirs, (dataset_version, directory), None)
+
+        with self._lock:
+            stats = {}
+            for path in pyarrow_paths:
+                stat = self._file_stats.get((dataset_version, path))
+                if stat is not None:
+                    stats[path] = stat
+            return stats
+
+    @staticmethod
+    def _remember(
+        entries: OrderedDict[tuple[str, str], T],
+        key: tuple[str, str],
+        value: T,
+    ) -> None:
+        """Insert into a bounded LRU mapping (caller holds the lock)."""
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > _FILE_STATS_MAX:
+            entries.popitem(last=False)
+
+    def _empty_series(self) -> SeriesFrame:
+        """Series with no rows, as a table or a frame like every other result."""
+        if self.arrow_frames:
+            return _SERIES_SCHEMA.empty_table()
+        return _empty_series()
+
+    def _series_not_found(
+        self,
+        dataset: ds.Dataset,
+        series_code: str,
+        parquet_paths: list[str],
+    ) -> ValueError:
+        """Build (and log) the error for a series with no rows in its files."""
+        available_series = self._list_available_series(dataset)
+        error_msg = (
+            f"Series not found: {series_code} "
+            f"(searched in {len(parquet_paths)} parquet files). "
+            f"Available series: {available_series[:20] if available_series else 'none found'}"
+        )
+        logger.error(
+            "series_not_found_in_paths",
+            series_code=series_code,
+            parquet_files_count=len(parquet_paths),
+            first_path=parquet_paths[0] if parquet_paths else None,
+            available_count=len(available_series) if available_series else 0,
+            available_series=available_series[:10] if available_series else [],
+        )
+        return ValueError(error_msg)
 
     def _list_available_series(self, dataset: ds.Dataset) -> list[str]:
         """List available series codes in the dataset."""
@@ -123,10 +694,270 @@ class ParquetReader(DataReaderPort):
             table = scanner.to_table()
             if len(table) == 0:
                 return []
-            df = table.to_pandas()
-            available = df["internal_series_code"].unique().tolist()
+            frame = table.to_pandas()
+            available = frame["internal_series_code"].unique().tolist()
             return sorted(available)
         except (OSError, ValueError, RuntimeError) as e:
             logger.warning("failed_to_list_available_series", error=str(e))
             return []
 
+
+def _series_dir(path: str) -> str:
+    """Directory holding every partition of the series a file belongs to."""
+    match = _SERIES_DIR_RE.match(path)
+    if match is not None:
+        return match.group(1).rstrip("/")
+    return path.rsplit("/", 1)[0]
+
+
+def _dataset_root(path: str) -> str:
+    """Directory holding the series directories of a dataset (schema cache key)."""
+    match = _SERIES_DIR_RE.match(path)
+    if match is not None:
+        return match.group(2).rstrip("/")
+    return path.rsplit("/", 1)[0]
+
+
+def _read_failed(
+    action: str,
+    series_codes: list[str],
+    parquet_paths: list[str],
+    error: Exception,
+) -> ValueError:
+    """Log a dataset that failed to ``action`` ("open" or "read") as a missing series."""
+    series_label = ", ".join(series_codes)
+    logger.exception(
+        f"failed_to_{action}_dataset_from_paths",
+        series_code=series_label,
+        parquet_files_count=len(parquet_paths),
+        first_path=parquet_paths[0] if parquet_paths else None,
+        error=str(error),
+    )
+    msg = f"Series not found: {series_label} (failed to {action} dataset from paths): {error}"
+    return ValueError(msg)
+
+
+def _utc_naive(value: Timestamp | None) -> pd.Timestamp | None:
+    """Normalize a bound to a naive UTC timestamp, matching the frames we return."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts
+
+
+def _partition_month(path: str) -> tuple[int, int] | None:
+    """Return the (year, month) of a ``year=YYYY/month=MM`` path, if any."""
+    match = _PARTITION_MONTH_RE.search(path)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _prune_partitions(
+    parquet_paths: list[str],
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> list[str]:
+    """Drop files whose month partition lies entirely outside [start, end]."""
+    first = (start.year, start.month) if start is not None else None
+    last = (end.year, end.month) if end is not None else None
+    kept = []
+    for path in parquet_paths:
+        month = _partition_month(path)
+        if month is not None and (
+            (first is not None and month < first) or (last is not None and month > last)
+        ):
+            continue
+        kept.append(path)
+    return kept
+
+
+def _scan_filter(
+    series_codes: list[str],
+    schema: pa.Schema,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> ds.Expression:
+    """Filter selecting the rows of ``series_codes`` inside the obs_time bounds."""
+    if len(series_codes) == 1:
+        scan_filter = ds.field("internal_series_code") == series_codes[0]
+    else:
+        scan_filter = ds.field("internal_series_code").isin(series_codes)
+    if start is not None or end is not None:
+        scan_filter = _with_obs_time_bounds(scan_filter, schema, start, end)
+    return scan_filter
+
+
+def _narrowed(
+    fragment: ds.ParquetFileFragment,
+    scan_filter: ds.Expression,
+) -> ds.ParquetFileFragment | None:
+    """Fragment restricted to the row groups the filter may match (None if none)."""
+    subset = fragment.subset(scan_filter)
+    return subset if subset.row_groups else None
+
+
+def _with_obs_time_bounds(
+    scan_filter: ds.Expression,
+    schema: pa.Schema,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> ds.Expression:
+    """Add obs_time bounds, typed like the stored column so statistics can prune."""
+    field_index = schema.get_field_index("obs_time")
+    if field_index < 0:
+        return scan_filter
+    obs_type = schema.field(field_index).type
+    if not pa.types.is_timestamp(obs_type):
+        # Other encodings are filtered after decoding only
+        return scan_filter
+
+    def typed(bound: pd.Timestamp) -> pa.Scalar:
+        if obs_type.tz is not None:
+            bound = bound.tz_localize("UTC")
+        return pa.scalar(bound, type=obs_type)
+
+    if start is not None:
+        scan_filter = scan_filter & (ds.field("obs_time") >= typed(start))
+    if end is not None:
+        scan_filter = scan_filter & (ds.field("obs_time") <= typed(end))
+    return scan_filter
+
+
+def _split_by_series(table: Table) -> dict[str, pd.DataFrame]:
+    """Group scanned rows by series code.
+
+    The code column is dictionary-encoded first (files usually store it that way
+    already), so grouping works on small integer codes instead of strings.
+    """
+    field_index = table.schema.get_field_index("internal_series_code")
+    codes = table.column(field_index)
+    if not pa.types.is_dictionary(codes.type):
+        table = table.set_column(field_index, "internal_series_code", pc.dictionary_encode(codes))
+    frame = table.to_pandas()
+    return {
+        str(series_code): group
+        for series_code, group in frame.groupby("internal_series_code", observed=True, sort=False)
+    }
+
+
+def _split_table_by_series(table: Table) -> dict[str, Table]:
+    """Group scanned rows by series code, as obs_time/value tables.
+
+    Rows are reordered once by the dictionary code of their series (stable, so
+    each series keeps its scan order); every series is then a slice of the result.
+    """
+    codes = table.column("internal_series_code")
+    if pa.types.is_dictionary(codes.type):
+        table = table.unify_dictionaries()
+        encoded = table.column("internal_series_code").combine_chunks()
+    else:
+        encoded = pc.dictionary_encode(codes.combine_chunks())
+    indices = encoded.indices.to_numpy(zero_copy_only=False)
+    order = np.argsort(indices, kind="stable")
+    rows = table.select(["obs_time", "value"]).take(pa.array(order))
+    bounds = np.searchsorted(indices[order], np.arange(len(encoded.dictionary) + 1))
+    return {
+        str(series_code): rows.slice(bounds[code], bounds[code + 1] - bounds[code])
+        for code, series_code in enumerate(encoded.dictionary.to_pylist())
+        if bounds[code + 1] > bounds[code]
+    }
+
+
+def _series_table(
+    table: Table,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> Table:
+    """Normalize the rows of one series to an obs_time/value table sorted by obs_time."""
+    table = table.select(["obs_time", "value"])
+    if table.schema.field("obs_time").type != _SERIES_SCHEMA.field("obs_time").type:
+        table = table.set_column(0, "obs_time", table.column(0).cast(pa.timestamp("ns")))
+    if table.schema.field("value").type != pa.float64():
+        table = table.set_column(1, "value", table.column(1).cast(pa.float64()))
+    obs_time = table.column("obs_time")
+    if len(table) > 1 and not pc.all(
+        pc.greater_equal(obs_time.slice(1), obs_time.slice(0, len(table) - 1))
+    ).as_py():
+        table = table.sort_by("obs_time")
+    if start is not None or end is not None:
+        # Bounds are pushed into the scan for timestamp columns; this only trims
+        # other encodings, or the rows of a series shared with others
+        mask = pc.is_valid(table.column("obs_time"))
+        if start is not None:
+            mask = pc.and_(mask, pc.greater_equal(table.column("obs_time"), start))
+        if end is not None:
+            mask = pc.and_(mask, pc.less_equal(table.column("obs_time"), end))
+        if not pc.all(mask).as_py():
+            table = table.filter(mask)
+    return table
+
+
+def _series_frame(
+    frame: pd.DataFrame,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> pd.DataFrame:
+    """Select and normalize the columns of one series, sorted by obs_time."""
+    return _normalized(frame[["obs_time", "value"]], start, end)
+
+
+def _series_table_frame(
+    table: Table,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> pd.DataFrame:
+    """Convert the scanned rows of one series to a frame, copying as little as possible.
+
+    The code column is dropped and the columns are cast in Arrow, so the pandas
+    conversion is the only copy of the data; a single-chunk column without nulls
+    is not copied at all. The conversion releases the table's buffers as it goes,
+    so ``table`` must not be used afterwards. The returned columns may be
+    read-only views of Arrow memory.
+    """
+    table = table.select(["obs_time", "value"])
+    obs_type = table.schema.field("obs_time").type
+    if pa.types.is_timestamp(obs_type) and obs_type != pa.timestamp("ns"):
+        # Timezone-aware times become naive UTC, like the bounds
+        table = table.set_column(0, "obs_time", table.column(0).cast(pa.timestamp("ns")))
+    if table.schema.field("value").type != pa.float64():
+        table = table.set_column(1, "value", table.column(1).cast(pa.float64()))
+    frame = table.to_pandas(split_blocks=True, self_destruct=True)
+    return _normalized(frame, start, end)
+
+
+def _normalized(
+    frame: pd.DataFrame,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+) -> pd.DataFrame:
+    """Cast, sort and bound an obs_time/value frame, skipping steps that change nothing."""
+    if frame["obs_time"].dtype != "datetime64[ns]":
+        frame = frame.assign(obs_time=frame["obs_time"].astype("datetime64[ns]"))
+    if frame["value"].dtype != "float64":
+        frame = frame.assign(value=frame["value"].astype("float64"))
+    if not frame["obs_time"].is_monotonic_increasing:
+        frame = frame.sort_values("obs_time", kind="stable")
+    if start is not None or end is not None:
+        # Sorted, so the bounds select a contiguous slice
+        obs_time = frame["obs_time"].to_numpy()
+        first = 0 if start is None else obs_time.searchsorted(start.to_datetime64(), "left")
+        last = len(frame) if end is None else obs_time.searchsorted(end.to_datetime64(), "right")
+        if first > 0 or last < len(frame):
+            frame = frame.iloc[first:last]
+    index = frame.index
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        frame = frame.reset_index(drop=True)
+    return frame
+
+
+def _empty_series() -> pd.DataFrame:
+    """Series frame with no rows and the usual dtypes."""
+    return pd.DataFrame(
+        {
+            "obs_time": pd.Series([], dtype="datetime64[ns]"),
+            "value": pd.Series([], dtype="float64"),
+        }
+    )
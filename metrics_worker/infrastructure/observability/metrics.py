@@ -1,6 +1,6 @@
 """Prometheus metrics."""
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 runs_started = Counter(
     "metric_runs_started_total",
@@ -36,3 +36,78 @@ s3_write_mb = Histogram(
     buckets=[0.1, 1, 10, 100, 1000],
 )
 
+
+s3_filesystem_init_seconds = Histogram(
+    "s3_filesystem_init_seconds",
+    "Time spent constructing the shared PyArrow S3FileSystem",
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+
+s3_filesystem_warmup_seconds = Histogram(
+    "s3_filesystem_warmup_seconds",
+    "Time spent pre-warming the shared PyArrow S3FileSystem at startup",
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 5, 30],
+)
+
+series_disk_cache_hits = Counter(
+    "series_disk_cache_hits_total",
+    "Series reads served from the local Arrow IPC cache",
+)
+
+series_disk_cache_misses = Counter(
+    "series_disk_cache_misses_total",
+    "Series reads that missed the local Arrow IPC cache",
+)
+
+series_disk_cache_evictions = Counter(
+    "series_disk_cache_evictions_total",
+    "Entries evicted from the local Arrow IPC cache",
+)
+
+series_disk_cache_bytes = Gauge(
+    "series_disk_cache_bytes",
+    "Bytes held on disk by the local Arrow IPC cache",
+)
+
+series_memory_cache_hits = Counter(
+    "series_memory_cache_hits_total",
+    "Series reads served from the in-process decoded series cache",
+)
+
+series_memory_cache_misses = Counter(
+    "series_memory_cache_misses_total",
+    "Series reads that missed the in-process decoded series cache",
+)
+
+series_memory_cache_evictions = Counter(
+    "series_memory_cache_evictions_total",
+    "Entries evicted from the in-process decoded series cache",
+)
+
+series_memory_cache_hit_ratio = Gauge(
+    "series_memory_cache_hit_ratio",
+    "Hit ratio of the in-process decoded series cache since start",
+)
+
+series_memory_cache_resident_bytes = Gauge(
+    "series_memory_cache_resident_bytes",
+    "Bytes held by the in-process decoded series cache",
+)
+
+dataset_manifest_cache_requests = Counter(
+    "dataset_manifest_cache_requests_total",
+    "Dataset manifest lookups by cache outcome",
+    ["result"],
+)
+
+parquet_object_requests_estimated = Counter(
+    "parquet_object_requests_estimated_total",
+    "Estimated object-store requests of Parquet scans (head, footer, data, list, object)",
+    ["kind"],
+)
+
+parquet_metadata_cache_requests = Counter(
+    "parquet_metadata_cache_requests_total",
+    "Parquet footer lookups by outcome (hit, persisted, miss)",
+    ["result"],
+)
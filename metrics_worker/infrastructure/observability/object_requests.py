@@ -0,0 +1,71 @@
+"""Per-run estimates of the object-store requests issued by Parquet scans.
+
+PyArrow issues the requests of a scan itself and does not report them, so the
+reader records the requests its access plan implies. Whole-object GETs
+(``object``) and directory listings (``list``) are counted as they are issued.
+``head``, ``footer`` and ``data`` assume one request per file opened, footer
+read and file scanned; the real number also depends on pre-buffering, range
+coalescing and footer size. Use them to compare access plans, not as exact
+request totals.
+"""
+
+import contextvars
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from metrics_worker.infrastructure.observability.metrics import (
+    parquet_object_requests_estimated,
+)
+
+
+class ObjectRequestEstimates:
+    """Thread-safe estimated request counts by kind for one run."""
+
+    def __init__(self) -> None:
+        """Initialize empty counts."""
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+
+    def add(self, kind: str, count: int) -> None:
+        """Add ``count`` requests of ``kind``."""
+        with self._lock:
+            self._counts[kind] = self._counts.get(kind, 0) + count
+
+    def as_dict(self) -> dict[str, int]:
+        """Counts by kind, plus their ``total``."""
+        with self._lock:
+            counts = dict(sorted(self._counts.items()))
+        counts["total"] = sum(counts.values())
+        return counts
+
+
+_run_counts: contextvars.ContextVar[ObjectRequestEstimates | None] = contextvars.ContextVar(
+    "run_object_requests",
+    default=None,
+)
+
+
+def record_estimated_object_requests(kind: str, count: int = 1) -> None:
+    """Add estimated requests to Prometheus and to the current run, if one is counted.
+
+    Scans run on worker threads, so callers must run them in a copy of the
+    caller's context (``contextvars.copy_context().run``) for the run to see them.
+    """
+    if count <= 0:
+        return
+    parquet_object_requests_estimated.labels(kind=kind).inc(count)
+    counts = _run_counts.get()
+    if counts is not None:
+        counts.add(kind, count)
+
+
+@contextmanager
+def count_estimated_object_requests() -> Iterator[ObjectRequestEstimates]:
+    """Collect the estimates recorded while the block runs (including its tasks)."""
+    counts = ObjectRequestEstimates()
+    token = _run_counts.set(counts)
+    try:
+        yield counts
+    finally:
+        _run_counts.reset(token)
@@ -1,65 +1,164 @@
 """Catalog adapter."""
 
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import cast
+
 import structlog
+from botocore.exceptions import ClientError
 
 from metrics_worker.domain.ports import CatalogPort
 from metrics_worker.domain.types import DatasetManifestDict
-from metrics_worker.infrastructure.aws.s3_io import S3IO
+from metrics_worker.infrastructure.aws.s3_io import S3IO, S3ObjectNotFoundError
 from metrics_worker.infrastructure.aws.s3_path import S3Path
+from metrics_worker.infrastructure.observability.metrics import dataset_manifest_cache_requests
 
 logger = structlog.get_logger()
 
 
+@dataclass
+class _CachedManifest:
+    """Parsed manifest with its validator and timestamps (monotonic seconds)."""
+
+    manifest: DatasetManifestDict
+    etag: str | None
+    validated_at: float
+    requested_at: float
+
+
 class S3CatalogAdapter(CatalogPort):
-    """S3-based catalog adapter."""
+    """S3-based catalog adapter.
+
+    Parsed manifests are cached per path. Within ``ttl_seconds`` of the last
+    validation a lookup costs nothing; after that the manifest is revalidated with
+    a conditional GET (``If-None-Match``), so an unchanged manifest costs a 304
+    instead of a full download and parse. ``run_refresher`` keeps recently
+    requested manifests revalidated in the background. At most ``max_entries``
+    manifests are kept; the least recently requested is dropped first.
+    """
 
-    def __init__(self, s3_io: S3IO) -> None:
+    def __init__(
+        self,
+        s3_io: S3IO,
+        ttl_seconds: float = 0.0,
+        monotonic: Callable[[], float] = time.monotonic,
+        max_entries: int = 256,
+    ) -> None:
         """Initialize catalog adapter."""
         self.s3_io = s3_io
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._monotonic = monotonic
+        self._cache: OrderedDict[str, _CachedManifest] = OrderedDict()
 
     async def get_dataset_manifest(self, manifest_path: str) -> DatasetManifestDict:
-        """Get dataset manifest from S3."""
+        """Get dataset manifest from S3 (or the manifest cache)."""
+        now = self._monotonic()
+        cached = self._cache.get(manifest_path)
+        if cached is not None:
+            self._cache.move_to_end(manifest_path)
+            cached.requested_at = now
+            if now - cached.validated_at < self.ttl_seconds:
+                dataset_manifest_cache_requests.labels(result="hit").inc()
+                return cached.manifest
+
         logger.info(
             "getting_manifest",
             manifest_path=manifest_path,
             bucket=self.s3_io.bucket,
+            cached_etag=cached.etag if cached else None,
         )
+        return await self._load(manifest_path, cached, now)
+
+    async def refresh_recent(self, recent_seconds: float) -> None:
+        """Revalidate manifests requested within the last ``recent_seconds``."""
+        now = self._monotonic()
+        recent = [
+            (path, cached)
+            for path, cached in self._cache.items()
+            if now - cached.requested_at <= recent_seconds
+        ]
+        for path, cached in recent:
+            try:
+                await self._load(path, cached, cached.requested_at)
+            except Exception as e:
+                logger.warning("manifest_refresh_failed", manifest_path=path, error=str(e))
+
+    async def run_refresher(self, interval_seconds: float, recent_seconds: float) -> None:
+        """Refresh recently used manifests every ``interval_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.refresh_recent(recent_seconds)
+
+    async def _load(
+        self,
+        manifest_path: str,
+        cached: _CachedManifest | None,
+        requested_at: float,
+    ) -> DatasetManifestDict:
+        """Fetch or revalidate a manifest and update the cache."""
         try:
-            return await self.s3_io.get_json(manifest_path)
-        except RuntimeError as e:
-            prefix = S3Path.parent(manifest_path)
-            available_files = self._list_objects_with_prefix(prefix)
-            
-            error_msg = (
-                f"Manifest not found: {manifest_path} "
-                f"(bucket: {self.s3_io.bucket}). "
+            manifest, etag = await self.s3_io.get_json_if_modified(
+                manifest_path,
+                cached.etag if cached else None,
             )
-            if available_files:
-                error_msg += f"Available files with prefix '{prefix}': {available_files[:10]}"
-            else:
-                error_msg += f"No files found with prefix '{prefix}'"
-            
-            logger.error(
-                "manifest_not_found",
-                manifest_path=manifest_path,
-                bucket=self.s3_io.bucket,
-                prefix=prefix,
-                available_files=available_files[:10] if available_files else [],
-            )
-            raise RuntimeError(error_msg) from e
+        except S3ObjectNotFoundError as e:
+            self._cache.pop(manifest_path, None)
+            raise await self._not_found_error(manifest_path) from e
+
+        validated_at = self._monotonic()
+        if manifest is None:
+            # Only a cached manifest has an etag S3 can match
+            if cached is None:
+                msg = f"Manifest {manifest_path} reported unchanged but is not cached"
+                raise RuntimeError(msg)
+            dataset_manifest_cache_requests.labels(result="not_modified").inc()
+            cached.validated_at = validated_at
+            return cached.manifest
 
-    def _list_objects_with_prefix(self, prefix: str) -> list[str]:
+        dataset_manifest = cast(DatasetManifestDict, manifest)
+        dataset_manifest_cache_requests.labels(result="fetched").inc()
+        self._cache[manifest_path] = _CachedManifest(
+            manifest=dataset_manifest,
+            etag=etag,
+            validated_at=validated_at,
+            requested_at=requested_at,
+        )
+        self._cache.move_to_end(manifest_path)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return dataset_manifest
+
+    async def _not_found_error(self, manifest_path: str) -> RuntimeError:
+        """Build a descriptive error listing what exists next to the manifest."""
+        prefix = S3Path.parent(manifest_path)
+        available_files = await self._list_objects_with_prefix(prefix)
+
+        error_msg = (
+            f"Manifest not found: {manifest_path} "
+            f"(bucket: {self.s3_io.bucket}). "
+        )
+        if available_files:
+            error_msg += f"Available files with prefix '{prefix}': {available_files[:10]}"
+        else:
+            error_msg += f"No files found with prefix '{prefix}'"
+
+        logger.error(
+            "manifest_not_found",
+            manifest_path=manifest_path,
+            bucket=self.s3_io.bucket,
+            prefix=prefix,
+            available_files=available_files[:10] if available_files else [],
+        )
+        return RuntimeError(error_msg)
+
+    async def _list_objects_with_prefix(self, prefix: str) -> list[str]:
         """List objects in S3 with given prefix."""
         try:
-            response = self.s3_io.s3_client.list_objects_v2(
-                Bucket=self.s3_io.bucket,
-                Prefix=prefix,
-                MaxKeys=20,
-            )
-            if "Contents" in response:
-                return [obj["Key"] for obj in response["Contents"]]
-            return []
-        except Exception as e:
+            return await self.s3_io.list_keys(prefix, max_keys=20)
+        except ClientError as e:
             logger.warning("failed_to_list_objects", prefix=prefix, error=str(e))
             return []
-
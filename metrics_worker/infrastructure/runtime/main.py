@@ -1,26 +1,43 @@
 """Main entrypoint."""
 
 import asyncio
+import os
 import signal
 
 import structlog
+from pyarrow.fs import S3FileSystem
 
+from metrics_worker.application.dto.events import MetricRunRequestedEvent
+from metrics_worker.application.use_cases.handle_run_request import RunOptions
 from metrics_worker.application.use_cases.handle_run_request import run as handle_run
+from metrics_worker.domain.enums import ExpressionEngine
+from metrics_worker.domain.ports import DataReaderPort
+from metrics_worker.infrastructure.aws.async_clients import AsyncAwsClients
+from metrics_worker.infrastructure.aws.s3_filesystem import (
+    get_s3_filesystem,
+    warm_up_s3_filesystem,
+)
+from metrics_worker.infrastructure.aws.s3_io import S3IO
+from metrics_worker.infrastructure.aws.s3_path import S3Path
 from metrics_worker.infrastructure.aws.sns_publisher import SNSPublisher
 from metrics_worker.infrastructure.aws.sqs_consumer import SQSConsumer
 from metrics_worker.infrastructure.config.settings import Settings
-from metrics_worker.infrastructure.io.parquet_reader import ParquetReader
+from metrics_worker.infrastructure.io.disk_series_cache import DiskSeriesCache
 from metrics_worker.infrastructure.io.jsonl_writer import JsonlWriter
+from metrics_worker.infrastructure.io.memory_series_cache import MemorySeriesCache
+from metrics_worker.infrastructure.io.parquet_metadata_cache import ParquetMetadataCache
+from metrics_worker.infrastructure.io.parquet_reader import ParquetReader
 from metrics_worker.infrastructure.observability.logging import configure_logging
 from metrics_worker.infrastructure.observability.metrics import (
     runs_failed,
     runs_started,
     runs_succeeded,
 )
+from metrics_worker.infrastructure.observability.object_requests import (
+    count_estimated_object_requests,
+)
 from metrics_worker.infrastructure.runtime.catalog_adapter import S3CatalogAdapter
 from metrics_worker.infrastructure.runtime.clock import SystemClock
-from metrics_worker.infrastructure.aws.s3_io import S3IO
-from metrics_worker.infrastructure.aws.s3_path import S3Path
 from metrics_worker.infrastructure.runtime.health import start_metrics_server
 
 logger = structlog.get_logger()
@@ -34,15 +51,8 @@ def signal_handler() -> None:
     shutdown_event.set()
 
 
-async def main_loop() -> None:
-    """Main event loop."""
-    configure_logging()
-    logger.info("worker_starting")
-
-    settings = Settings()
-    
-    # Load AWS credentials from Settings to environment for boto3
-    import os
+def _export_aws_credentials(settings: Settings) -> bool:
+    """Load AWS credentials from Settings to environment for boto3."""
     has_credentials = False
     if settings.aws_access_key_id:
         os.environ["AWS_ACCESS_KEY_ID"] = settings.aws_access_key_id
@@ -52,11 +62,113 @@ async def main_loop() -> None:
         has_credentials = True
     if settings.aws_session_token:
         os.environ["AWS_SESSION_TOKEN"] = settings.aws_session_token
-    
+    return has_credentials
+
+
+def _build_data_reader(
+    settings: Settings,
+    s3_io: S3IO,
+    s3_filesystem: S3FileSystem,
+    *,
+    arrow_frames: bool,
+) -> tuple[ParquetReader, DiskSeriesCache | None, DataReaderPort]:
+    """Build the Parquet reader and wrap it in the configured series caches.
+
+    The disk cache, if enabled, is returned as well so its index can be flushed
+    on shutdown.
+    """
+    metadata_cache = None
+    if settings.parquet_metadata_cache_max_entries > 0:
+        metadata_cache = ParquetMetadataCache(
+            settings.parquet_metadata_cache_max_entries,
+            cache_dir=settings.parquet_metadata_cache_dir,
+        )
+    parquet_reader = ParquetReader(
+        s3_io,
+        filesystem=s3_filesystem,
+        max_workers=settings.parquet_reader_max_workers,
+        fragment_readahead=settings.parquet_fragment_readahead,
+        whole_object_max_bytes=settings.parquet_whole_object_max_bytes,
+        fetch_concurrency=settings.parquet_fetch_concurrency,
+        metadata_cache=metadata_cache,
+        arrow_frames=arrow_frames,
+    )
+    data_reader: DataReaderPort = parquet_reader
+    disk_cache = None
+    if settings.series_disk_cache_enabled:
+        disk_cache = DiskSeriesCache(
+            data_reader,
+            settings.series_disk_cache_dir,
+            settings.series_disk_cache_max_bytes,
+            arrow_frames=arrow_frames,
+        )
+        data_reader = disk_cache
+    if settings.series_memory_cache_enabled:
+        data_reader = MemorySeriesCache(data_reader, settings.series_memory_cache_max_bytes)
+    return parquet_reader, disk_cache, data_reader
+
+
+async def _process_event(
+    event: MetricRunRequestedEvent,
+    receipt_handle: str,
+    sqs_consumer: SQSConsumer,
+    catalog: S3CatalogAdapter,
+    data_reader: DataReaderPort,
+    output_writer: JsonlWriter,
+    event_bus: SNSPublisher,
+    clock: SystemClock,
+    run_options: RunOptions,
+) -> None:
+    """Run one requested metric unless already completed, then delete its message."""
+    runs_started.inc()
+
+    try:
+        marker_path = S3Path.join("metrics", event.metric_code, "runs", f"{event.run_id}.ok")
+        marker_exists = await output_writer.check_run_marker(marker_path)
+
+        if marker_exists:
+            logger.info("run_already_completed", run_id=event.run_id, metric_code=event.metric_code)
+            await sqs_consumer.delete_message(receipt_handle)
+            return
+
+        with count_estimated_object_requests() as object_requests:
+            await handle_run(
+                event,
+                catalog,
+                data_reader,
+                output_writer,
+                event_bus,
+                clock,
+                run_options,
+            )
+        logger.info(
+            "run_object_requests_estimated",
+            run_id=event.run_id,
+            **object_requests.as_dict(),
+        )
+
+        runs_succeeded.inc()
+        await sqs_consumer.delete_message(receipt_handle)
+
+    except Exception as e:
+        runs_failed.labels(error_code="INTERNAL_ERROR").inc()
+        logger.error("run_processing_error", exc_info=True, error=str(e))
+        await sqs_consumer.delete_message(receipt_handle)
+
+
+async def main_loop() -> None:
+    """Main event loop."""
+    configure_logging()
+    logger.info("worker_starting")
+
+    settings = Settings()
+
+    has_credentials = _export_aws_credentials(settings)
+
     # Check if credentials are available from environment or .env
     env_has_access_key = bool(os.environ.get("AWS_ACCESS_KEY_ID"))
     env_has_secret_key = bool(os.environ.get("AWS_SECRET_ACCESS_KEY"))
-    
+
     logger.info(
         "settings_loaded",
         region=settings.aws_region,
@@ -68,7 +180,7 @@ async def main_loop() -> None:
         has_access_key=env_has_access_key,
         has_secret_key=env_has_secret_key,
     )
-    
+
     if not env_has_access_key or not env_has_secret_key:
         logger.warning(
             "aws_credentials_missing",
@@ -77,18 +189,47 @@ async def main_loop() -> None:
 
     start_metrics_server(settings)
 
-    s3_io = S3IO(settings)
-    catalog = S3CatalogAdapter(s3_io)
-    data_reader = ParquetReader(s3_io)
+    aws_clients = AsyncAwsClients(settings)
+    s3_io = S3IO(settings, aws_clients)
+    catalog = S3CatalogAdapter(
+        s3_io,
+        ttl_seconds=settings.manifest_cache_ttl_seconds,
+        max_entries=settings.manifest_cache_max_entries,
+    )
+    s3_filesystem = get_s3_filesystem(settings)
+    await asyncio.to_thread(warm_up_s3_filesystem, s3_filesystem, settings.aws_s3_bucket)
+    expression_engine = ExpressionEngine(settings.expression_engine)
+    parquet_reader, disk_cache, data_reader = _build_data_reader(
+        settings,
+        s3_io,
+        s3_filesystem,
+        arrow_frames=expression_engine == ExpressionEngine.ARROW,
+    )
     output_writer = JsonlWriter(s3_io)
-    event_bus = SNSPublisher(settings)
+    event_bus = SNSPublisher(settings, aws_clients)
     clock = SystemClock()
+    run_options = RunOptions(
+        max_concurrent_series_reads=settings.run_max_concurrent_series_reads,
+        incremental=settings.run_incremental_enabled,
+        incremental_restate_days=settings.run_incremental_restate_days,
+        expression_engine=expression_engine,
+        max_parallel_expression_nodes=settings.run_max_parallel_expression_nodes,
+    )
 
     if not settings.aws_sqs_run_request_queue_enabled:
         logger.warning("sqs_queue_disabled")
         return
 
-    sqs_consumer = SQSConsumer(settings)
+    sqs_consumer = SQSConsumer(settings, aws_clients)
+
+    manifest_refresher: asyncio.Task[None] | None = None
+    if settings.manifest_cache_refresh_enabled:
+        manifest_refresher = asyncio.create_task(
+            catalog.run_refresher(
+                settings.manifest_cache_refresh_interval_seconds,
+                settings.manifest_cache_recent_seconds,
+            )
+        )
 
     logger.info("worker_ready")
 
@@ -96,36 +237,20 @@ async def main_loop() -> None:
         try:
             event, receipt_handle = await sqs_consumer.receive_message()
 
-            if event is None:
+            if event is None or receipt_handle is None:
                 continue
 
-            runs_started.inc()
-
-            try:
-                marker_path = S3Path.join("metrics", event.metric_code, "runs", f"{event.run_id}.ok")
-                marker_exists = await output_writer.check_run_marker(marker_path)
-
-                if marker_exists:
-                    logger.info("run_already_completed", run_id=event.run_id, metric_code=event.metric_code)
-                    await sqs_consumer.delete_message(receipt_handle)
-                    continue
-
-                await handle_run(
-                    event,
-                    catalog,
-                    data_reader,
-                    output_writer,
-                    event_bus,
-                    clock,
-                )
-
-                runs_succeeded.inc()
-                await sqs_consumer.delete_message(receipt_handle)
-
-            except Exception as e:
-                runs_failed.labels(error_code="INTERNAL_ERROR").inc()
-                logger.error("run_processing_error", exc_info=True, error=str(e))
-                await sqs_consumer.delete_message(receipt_handle)
+            await _process_event(
+                event,
+                receipt_handle,
+                sqs_consumer,
+                catalog,
+                data_reader,
+                output_writer,
+                event_bus,
+                clock,
+                run_options,
+            )
 
         except KeyboardInterrupt:
             logger.info("keyboard_interrupt")
@@ -134,6 +259,12 @@ async def main_loop() -> None:
             logger.error("main_loop_error", exc_info=True, error=str(e))
             await asyncio.sleep(5)
 
+    if manifest_refresher is not None:
+        manifest_refresher.cancel()
+    parquet_reader.shutdown()
+    if disk_cache is not None:
+        disk_cache.flush_index()
+    aws_clients.shutdown()
     logger.info("worker_shutting_down")
 
 
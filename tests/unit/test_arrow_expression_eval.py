@@ -0,0 +1,146 @@
+"""Unit tests for the Arrow expression evaluator."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from metrics_worker.application.services.arrow_expression_eval import evaluate_expression_arrow
+from metrics_worker.application.services.expression_eval import evaluate_expression
+from metrics_worker.domain.errors import ExpressionEvaluationError, InvalidExpressionError
+
+
+def _series(start: str, periods: int, seed: int, missing: float = 0.1) -> pd.DataFrame:
+    """Business-day series with some NaN values."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100.0, 5.0, periods)
+    values[rng.random(periods) < missing] = np.nan
+    return pd.DataFrame({"obs_time": pd.bdate_range(start, periods=periods), "value": values})
+
+
+@pytest.fixture
+def series_data() -> dict[str, pd.DataFrame]:
+    """Three overlapping series with gaps; B is stored in reverse order."""
+    return {
+        "A": _series("2020-01-01", 400, seed=1),
+        "B": _series("2020-03-02", 300, seed=2).iloc[::-1].reset_index(drop=True),
+        "C": _series("2019-11-01", 250, seed=3, missing=0.3).iloc[::3].reset_index(drop=True),
+    }
+
+
+EXPRESSIONS = [
+    ("series_math", {"op": op, "left": {"series_code": "A"}, "right": {"series_code": "B"}})
+    for op in ["add", "subtract", "multiply", "ratio"]
+] + [
+    (
+        "series_math",
+        {"op": "ratio", "left": {"series_code": "C"}, "right": {"series_code": "A"}, "scale": 100},
+    ),
+] + [
+    ("window_op", {"op": op, "series": {"series_code": "B"}, "window": window})
+    for op in ["sma", "ema", "sum", "max", "min", "lag"]
+    for window in [1, 5]
+] + [
+    ("composite", {"op": op, "operands": [{"series_code": code} for code in "ABC"]})
+    for op in ["sum", "avg", "max", "min"]
+] + [
+    (
+        "composite",
+        {
+            "op": "avg",
+            "operands": [
+                {"op": "sma", "series": {"series_code": "A"}, "window": 3},
+                {
+                    "op": "subtract",
+                    "left": {"seriesCode": "B"},
+                    "right": {"op": "lag", "series": {"series_code": "C"}, "window": 7},
+                },
+            ],
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(("expression_type", "expression"), EXPRESSIONS)
+@pytest.mark.parametrize("as_tables", [False, True])
+def test_arrow_engine_matches_pandas_engine(series_data, expression_type, expression, as_tables):
+    """Test every operation gives exactly the pandas engine's rows and values."""
+    expected = evaluate_expression(expression, expression_type, series_data)
+    inputs = series_data
+    if as_tables:
+        inputs = {
+            code: pa.Table.from_pandas(frame, preserve_index=False)
+            for code, frame in series_data.items()
+        }
+
+    result = evaluate_expression_arrow(expression, expression_type, inputs)
+
+    assert isinstance(result, pa.Table)
+    pd.testing.assert_frame_equal(
+        result.to_pandas(),
+        expected.reset_index(drop=True),
+        check_exact=True,
+    )
+
+
+@pytest.mark.parametrize("op", ["sum", "avg", "max", "min"])
+def test_wide_composite_matches_pandas_engine(op):
+    """Test composites over many operands keep pandas' summation order."""
+    series_data = {
+        f"S{idx}": _series("2020-01-01", 120, seed=idx, missing=0.2).iloc[idx % 3 :: 2]
+        for idx in range(40)
+    }
+    expression = {"op": op, "operands": [{"series_code": code} for code in series_data]}
+
+    expected = evaluate_expression(expression, "composite", series_data)
+    result = evaluate_expression_arrow(expression, "composite", series_data)
+
+    pd.testing.assert_frame_equal(result.to_pandas(), expected, check_exact=True)
+
+
+def test_composite_of_all_missing_row_follows_pandas():
+    """Test rows where every operand is missing sum to 0.0 and average to NaN."""
+    obs_time = pd.date_range("2024-01-01", periods=2)
+    series_data = {
+        "A": pd.DataFrame({"obs_time": obs_time, "value": [np.nan, 1.0]}),
+        "B": pa.table({"obs_time": obs_time, "value": pa.array([None, 2.0], pa.float64())}),
+    }
+    operands = [{"series_code": "A"}, {"series_code": "B"}]
+
+    total = evaluate_expression_arrow({"op": "sum", "operands": operands}, "composite", series_data)
+    mean = evaluate_expression_arrow({"op": "avg", "operands": operands}, "composite", series_data)
+
+    assert total.column("value").to_pylist() == [0.0, 3.0]
+    assert np.isnan(mean.column("value").to_numpy(zero_copy_only=False)[0])
+    assert mean.column("value")[1].as_py() == 1.5
+
+
+def test_arrow_engine_errors_match_pandas_engine():
+    """Test invalid expressions and unknown series raise the usual errors."""
+    series_data = {"A": _series("2024-01-01", 5, seed=0)}
+
+    with pytest.raises(ExpressionEvaluationError, match="Series not found: X"):
+        evaluate_expression_arrow(
+            {"op": "sma", "series": {"series_code": "X"}, "window": 2}, "window_op", series_data
+        )
+    with pytest.raises(InvalidExpressionError, match="Invalid window"):
+        evaluate_expression_arrow(
+            {"op": "sma", "series": {"series_code": "A"}, "window": 0}, "window_op", series_data
+        )
+    with pytest.raises(InvalidExpressionError, match="at least 2 operands"):
+        evaluate_expression_arrow(
+            {"op": "sum", "operands": [{"series_code": "A"}]}, "composite", series_data
+        )
+    with pytest.raises(InvalidExpressionError, match="Unknown expression type"):
+        evaluate_expression_arrow({}, "nope", series_data)
+    with pytest.raises(InvalidExpressionError, match="Invalid scale"):
+        evaluate_expression_arrow(
+            {
+                "op": "add",
+                "left": {"series_code": "A"},
+                "right": {"series_code": "A"},
+                "scale": "x",
+            },
+            "series_math",
+            series_data,
+        )
@@ -0,0 +1,101 @@
+"""Unit tests for the shared async AWS client layer."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from moto import mock_aws
+
+from metrics_worker.infrastructure.aws.async_clients import AsyncAwsClients
+from metrics_worker.infrastructure.aws.s3_io import S3IO
+from metrics_worker.infrastructure.aws.sns_publisher import SNSPublisher
+from metrics_worker.infrastructure.aws.sqs_consumer import SQSConsumer
+from metrics_worker.infrastructure.config.settings import Settings
+
+
+@pytest.fixture
+def aws_env(monkeypatch):
+    """Fake credentials so moto never reaches real AWS."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+
+@pytest.fixture
+def settings(aws_env):
+    """Create settings pointing at moto resources."""
+    return Settings(
+        _env_file=None,
+        aws_s3_bucket="test-bucket",
+        aws_sqs_run_request_queue_url="https://sqs.us-east-1.amazonaws.com/123456789012/runs",
+        aws_sns_metric_run_started_topic_arn="arn:aws:sns:us-east-1:123456789012:started",
+        aws_sns_metric_run_heartbeat_topic_arn="arn:aws:sns:us-east-1:123456789012:heartbeat",
+        aws_sns_metric_run_completed_topic_arn="arn:aws:sns:us-east-1:123456789012:completed",
+        aws_max_pool_connections=4,
+    )
+
+
+def test_clients_are_shared(settings):
+    """Test that each service client is created once and reused."""
+    clients = AsyncAwsClients(settings)
+
+    assert clients.client("s3") is clients.client("s3")
+    assert clients.config.max_pool_connections == 4
+    clients.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_call_does_not_block_event_loop(settings):
+    """Test that blocking calls overlap instead of running one after another."""
+    clients = AsyncAwsClients(settings)
+
+    def blocking_call(delay: float) -> float:
+        time.sleep(delay)
+        return delay
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[clients.call(blocking_call, 0.2) for _ in range(4)])
+    elapsed = time.perf_counter() - started
+    clients.shutdown()
+
+    assert results == [0.2] * 4
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_adapters_share_clients_with_moto(settings):
+    """Test S3, SQS and SNS adapters end-to-end on one shared client layer."""
+    with mock_aws():
+        clients = AsyncAwsClients(settings)
+        clients.client("s3").create_bucket(Bucket="test-bucket")
+        queue_url = clients.client("sqs").create_queue(QueueName="runs")["QueueUrl"]
+        topic_arn = clients.client("sns").create_topic(Name="completed")["TopicArn"]
+
+        s3_io = S3IO(settings, clients)
+        await asyncio.gather(
+            s3_io.put_json("a.json", {"key": "a"}),
+            s3_io.put_json("b.json", {"key": "b"}),
+        )
+        assert await s3_io.get_json("a.json") == {"key": "a"}
+        assert await s3_io.object_exists("b.json") is True
+        assert await s3_io.object_exists("missing.json") is False
+        assert sorted(await s3_io.list_keys("")) == ["a.json", "b.json"]
+
+        settings.aws_sqs_run_request_queue_url = queue_url
+        consumer = SQSConsumer(settings, clients)
+        clients.client("sqs").send_message(
+            QueueUrl=queue_url,
+            MessageBody=json.dumps({"type": "other"}),
+        )
+        with pytest.raises(RuntimeError, match="Failed to parse message"):
+            await consumer.receive_message()
+
+        settings.aws_sns_metric_run_completed_topic_arn = topic_arn
+        publisher = SNSPublisher(settings, clients)
+        await publisher.publish_completed("run-1", "metric", "FAILURE", error="boom")
+
+        assert s3_io.s3_client is clients.client("s3")
+        assert consumer.sqs_client is clients.client("sqs")
+        assert publisher.sns_client is clients.client("sns")
+        clients.shutdown()
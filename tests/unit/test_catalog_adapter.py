@@ -4,35 +4,159 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from metrics_worker.infrastructure.aws.s3_io import S3ObjectNotFoundError
 from metrics_worker.infrastructure.runtime.catalog_adapter import S3CatalogAdapter
 
+MANIFEST_DICT = {
+    "version_id": "v20251111_014138_730866",
+    "dataset_id": "test-dataset",
+    "created_at": "2025-11-11T05:13:32Z",
+    "collection_date": "2025-11-11T04:41:38Z",
+    "data_points_count": 100,
+    "series_count": 1,
+    "series_codes": ["TEST_SERIES"],
+    "date_range": {
+        "min_obs_time": "2025-01-01T00:00:00Z",
+        "max_obs_time": "2025-11-07T00:00:00Z",
+    },
+    "parquet_files": ["TEST_SERIES/year=2025/month=11/data.parquet"],
+    "partitions": ["TEST_SERIES/year=2025/month=11/"],
+    "partition_strategy": "series_year_month",
+}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
 
 @pytest.mark.asyncio
 async def test_get_dataset_manifest():
     """Test getting dataset manifest."""
-    manifest_dict = {
-        "version_id": "v20251111_014138_730866",
-        "dataset_id": "test-dataset",
-        "created_at": "2025-11-11T05:13:32Z",
-        "collection_date": "2025-11-11T04:41:38Z",
-        "data_points_count": 100,
-        "series_count": 1,
-        "series_codes": ["TEST_SERIES"],
-        "date_range": {
-            "min_obs_time": "2025-01-01T00:00:00Z",
-            "max_obs_time": "2025-11-07T00:00:00Z",
-        },
-        "parquet_files": ["TEST_SERIES/year=2025/month=11/data.parquet"],
-        "partitions": ["TEST_SERIES/year=2025/month=11/"],
-        "partition_strategy": "series_year_month",
-    }
-
-    s3_io = AsyncMock()
-    s3_io.get_json = AsyncMock(return_value=manifest_dict)
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(return_value=(MANIFEST_DICT, '"etag-1"'))
 
     adapter = S3CatalogAdapter(s3_io)
     result = await adapter.get_dataset_manifest("test-dataset/manifest.json")
 
-    assert result == manifest_dict
-    s3_io.get_json.assert_called_once_with("test-dataset/manifest.json")
+    assert result == MANIFEST_DICT
+    s3_io.get_json_if_modified.assert_called_once_with("test-dataset/manifest.json", None)
+
+
+@pytest.mark.asyncio
+async def test_get_dataset_manifest_within_ttl_skips_s3():
+    """Test a manifest validated within the TTL is served without a request."""
+    clock = FakeClock()
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(return_value=(MANIFEST_DICT, '"etag-1"'))
+    adapter = S3CatalogAdapter(s3_io, ttl_seconds=30.0, monotonic=clock)
+
+    first = await adapter.get_dataset_manifest("test-dataset/manifest.json")
+    clock.now = 10.0
+    second = await adapter.get_dataset_manifest("test-dataset/manifest.json")
+
+    assert second is first
+    assert s3_io.get_json_if_modified.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_dataset_manifest_revalidates_with_etag_after_ttl():
+    """Test an expired entry is revalidated and reused on 304."""
+    clock = FakeClock()
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(
+        side_effect=[(MANIFEST_DICT, '"etag-1"'), (None, '"etag-1"')]
+    )
+    adapter = S3CatalogAdapter(s3_io, ttl_seconds=30.0, monotonic=clock)
+
+    first = await adapter.get_dataset_manifest("test-dataset/manifest.json")
+    clock.now = 31.0
+    second = await adapter.get_dataset_manifest("test-dataset/manifest.json")
+
+    assert second is first
+    s3_io.get_json_if_modified.assert_called_with("test-dataset/manifest.json", '"etag-1"')
+
+
+@pytest.mark.asyncio
+async def test_get_dataset_manifest_picks_up_new_version():
+    """Test a changed manifest replaces the cached one."""
+    updated = {**MANIFEST_DICT, "version_id": "v20251112_000000_000000"}
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(
+        side_effect=[(MANIFEST_DICT, '"etag-1"'), (updated, '"etag-2"')]
+    )
+    adapter = S3CatalogAdapter(s3_io)
+
+    await adapter.get_dataset_manifest("test-dataset/manifest.json")
+    result = await adapter.get_dataset_manifest("test-dataset/manifest.json")
+
+    assert result == updated
+
+
+@pytest.mark.asyncio
+async def test_get_dataset_manifest_revalidation_error_propagates():
+    """Test a failed revalidation raises instead of serving the cached manifest."""
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(
+        side_effect=[(MANIFEST_DICT, '"etag-1"'), RuntimeError("boom")]
+    )
+    adapter = S3CatalogAdapter(s3_io)
+
+    await adapter.get_dataset_manifest("test-dataset/manifest.json")
+    with pytest.raises(RuntimeError, match="boom"):
+        await adapter.get_dataset_manifest("test-dataset/manifest.json")
+
+
+@pytest.mark.asyncio
+async def test_get_dataset_manifest_not_found_lists_prefix():
+    """Test a missing manifest raises with the neighbouring keys."""
+    s3_io = AsyncMock()
+    s3_io.bucket = "test-bucket"
+    s3_io.get_json_if_modified = AsyncMock(side_effect=S3ObjectNotFoundError("NoSuchKey"))
+    s3_io.list_keys = AsyncMock(return_value=["test-dataset/other.json"])
+    adapter = S3CatalogAdapter(s3_io)
+
+    with pytest.raises(RuntimeError, match="Manifest not found.*other.json"):
+        await adapter.get_dataset_manifest("test-dataset/manifest.json")
+
+
+@pytest.mark.asyncio
+async def test_cache_drops_least_recently_requested_manifest():
+    """Test the cache keeps at most max_entries manifests."""
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(return_value=(MANIFEST_DICT, '"etag-1"'))
+    adapter = S3CatalogAdapter(s3_io, ttl_seconds=30.0, max_entries=2)
+
+    for path in ("a/manifest.json", "b/manifest.json", "a/manifest.json", "c/manifest.json"):
+        await adapter.get_dataset_manifest(path)
+    s3_io.get_json_if_modified.reset_mock()
+
+    await adapter.get_dataset_manifest("a/manifest.json")
+    await adapter.get_dataset_manifest("c/manifest.json")
+    s3_io.get_json_if_modified.assert_not_called()
+    await adapter.get_dataset_manifest("b/manifest.json")
+    s3_io.get_json_if_modified.assert_called_once_with("b/manifest.json", None)
+
+
+@pytest.mark.asyncio
+async def test_refresh_recent_only_touches_recently_requested():
+    """Test the refresher revalidates recent manifests and skips stale ones."""
+    clock = FakeClock()
+    s3_io = AsyncMock()
+    s3_io.get_json_if_modified = AsyncMock(return_value=(MANIFEST_DICT, '"etag-1"'))
+    adapter = S3CatalogAdapter(s3_io, ttl_seconds=30.0, monotonic=clock)
+
+    await adapter.get_dataset_manifest("old/manifest.json")
+    clock.now = 500.0
+    await adapter.get_dataset_manifest("recent/manifest.json")
+    s3_io.get_json_if_modified.reset_mock()
+
+    clock.now = 600.0
+    await adapter.refresh_recent(recent_seconds=300.0)
 
+    s3_io.get_json_if_modified.assert_called_once_with("recent/manifest.json", '"etag-1"')
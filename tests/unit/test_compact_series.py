@@ -0,0 +1,171 @@
+"""Unit tests for CompactSeries, sorted-union alignment and timelines."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from metrics_worker.application.services.compact_series import CompactSeries, Timeline, align
+from metrics_worker.application.services.expression_eval import evaluate_expression
+
+
+def _series(days: list[int], values: list[float]) -> CompactSeries:
+    obs_time = (pd.Timestamp("2024-01-01") + pd.to_timedelta(days, unit="D")).to_numpy()
+    return CompactSeries(obs_time.view("int64"), np.array(values, dtype="float64"))
+
+
+def test_from_frame_views_dataframe_and_table_alike():
+    """Test a DataFrame and an Arrow table give the same series."""
+    frame = pd.DataFrame({
+        "obs_time": pd.date_range("2024-01-01", periods=3, freq="D"),
+        "value": [1.0, 2.0, 3.0],
+    })
+
+    from_frame = CompactSeries.from_frame(frame)
+    from_table = CompactSeries.from_frame(pa.Table.from_pandas(frame, preserve_index=False))
+
+    assert from_frame.obs_time.dtype == np.int64
+    np.testing.assert_array_equal(from_frame.obs_time, from_table.obs_time)
+    np.testing.assert_array_equal(from_frame.value, from_table.value)
+    assert from_frame.is_sorted and from_frame.is_strictly_increasing
+    expected = frame.astype({"obs_time": "datetime64[ns]"})
+    pd.testing.assert_frame_equal(from_frame.to_frame(), expected)
+
+
+def test_sorted_orders_unsorted_series():
+    """Test sorted() orders by obs_time and keeps values paired."""
+    series = _series([2, 0, 1], [30.0, 10.0, 20.0])
+
+    assert not series.is_sorted
+    result = series.sorted()
+
+    assert result.is_sorted
+    np.testing.assert_array_equal(result.value, [10.0, 20.0, 30.0])
+    assert series.sorted() is not series
+    assert result.sorted() is result
+
+
+def test_repeated_obs_time_is_not_strictly_increasing():
+    """Test a sorted series with a repeated obs_time is flagged."""
+    series = _series([0, 1, 1], [1.0, 2.0, 3.0])
+
+    assert series.is_sorted
+    assert not series.is_strictly_increasing
+
+
+def test_align_fills_missing_observations_with_nan():
+    """Test align puts each series on the union of obs_time."""
+    left = _series([0, 1, 3], [1.0, 2.0, 4.0])
+    right = _series([1, 2, 3], [20.0, 30.0, 40.0])
+
+    obs_time, values = align([left, right])
+    left_value, right_value = values.T
+
+    np.testing.assert_array_equal(obs_time, _series([0, 1, 2, 3], [0] * 4).obs_time)
+    np.testing.assert_array_equal(left_value, [1.0, 2.0, np.nan, 4.0])
+    np.testing.assert_array_equal(right_value, [np.nan, 20.0, 30.0, 40.0])
+
+
+def test_align_scatters_many_series_into_one_block():
+    """Test k series are aligned on one union into an (obs_time, series) block."""
+    series_list = [_series([day, day + 2], [float(day), float(day) + 0.5]) for day in range(4)]
+
+    obs_time, values = align(series_list)
+
+    assert values.shape == (6, 4)
+    assert values.flags.c_contiguous
+    np.testing.assert_array_equal(obs_time, _series(list(range(6)), [0] * 6).obs_time)
+    np.testing.assert_array_equal(values[:, 1], [np.nan, 1.0, np.nan, 1.5, np.nan, np.nan])
+    np.testing.assert_array_equal(np.isnan(values).sum(axis=1), [3, 3, 2, 2, 3, 3])
+
+
+def test_repeated_obs_time_joins_like_merge():
+    """Test duplicate obs_time still pairs every matching row, as pd.merge does."""
+    obs_time = pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"])
+    data = {
+        "A": pd.DataFrame({"obs_time": obs_time, "value": [1.0, 2.0, 3.0]}),
+        "B": pd.DataFrame({"obs_time": obs_time[1:], "value": [10.0, 20.0]}),
+    }
+    expression = {"op": "add", "left": {"series_code": "A"}, "right": {"series_code": "B"}}
+
+    result = evaluate_expression(expression, "series_math", data)
+
+    assert result["value"].tolist() == [11.0, 12.0, 23.0]
+
+
+def test_timeline_places_series_with_mask():
+    """Test series on a timeline share its obs_time and mask their observations."""
+    left = _series([0, 2], [1.0, np.nan])
+    right = _series([1, 2], [10.0, 20.0])
+
+    timeline = Timeline.from_series([left, right])
+    placed = timeline.place(left)
+
+    assert placed.obs_time is timeline.obs_time
+    assert placed.mask.tolist() == [True, False, True]
+    np.testing.assert_array_equal(placed.value, [1.0, np.nan, np.nan])
+    np.testing.assert_array_equal(placed.observed().value, left.value)
+
+
+def test_timeline_is_not_built_for_repeated_obs_time():
+    """Test a series repeating an obs_time cannot be placed on a timeline."""
+    assert Timeline.from_series([_series([0, 1, 1], [1.0, 2.0, 3.0])]) is None
+
+
+def test_nested_nodes_keep_rows_nobody_observes_missing():
+    """Test a composite over sparse series neither adds rows nor fills them."""
+    data = {
+        code: _series(days, values).to_frame()
+        for code, days, values in [
+            ("A", [0, 1, 2, 3], [1.0, 2.0, 3.0, 4.0]),
+            ("B", [0, 2], [10.0, 30.0]),
+            ("C", [0, 3], [100.0, 400.0]),
+        ]
+    }
+    expression = {
+        "op": "add",
+        "left": {"series_code": "A"},
+        "right": {
+            "op": "sum",
+            "operands": [
+                {"op": "sma", "series": {"series_code": "B"}, "window": 2},
+                {"series_code": "C"},
+            ],
+        },
+    }
+
+    result = evaluate_expression(expression, "series_math", data)
+
+    # sma(B) uses B's own two observations, not the timeline's four rows
+    np.testing.assert_array_equal(result["value"], [101.0, np.nan, 23.0, 404.0])
+
+
+def test_series_arrays_cannot_be_written_through():
+    """Test a series and the series placed on a timeline reject writes."""
+    frame = pd.DataFrame({
+        "obs_time": pd.date_range("2024-01-01", periods=3, freq="D"),
+        "value": [1.0, 2.0, 3.0],
+    })
+
+    series = CompactSeries.from_frame(frame)
+    placed = Timeline.from_series([series]).place(series)
+
+    for array in (series.obs_time, series.value, placed.value, placed.mask):
+        with pytest.raises(ValueError, match="read-only"):
+            array[0] = 0
+    frame.loc[0, "value"] = 10.0
+    assert frame["value"].tolist() == [10.0, 2.0, 3.0]
+
+
+def test_read_only_inputs_are_not_copied():
+    """Test arrays that are already read-only are used as they are."""
+    obs_time = _series([0, 1, 2], [0.0] * 3).obs_time
+    value = np.array([1.0, 2.0, 3.0])
+    value.flags.writeable = False
+
+    series = CompactSeries(obs_time, value)
+    placed = Timeline.from_series([series]).place(series)
+
+    assert np.shares_memory(series.value, value)
+    assert np.shares_memory(placed.value, value)
+    assert np.shares_memory(placed.observed().value, value)
@@ -0,0 +1,224 @@
+"""Unit tests for the on-disk series cache."""
+
+import errno
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from metrics_worker.domain.ports import DataReaderPort
+from metrics_worker.infrastructure.io.disk_series_cache import DiskSeriesCache
+
+PATHS = ["datasets/ds/projections/SERIES_A/year=2024/month=01/data.parquet"]
+
+
+@pytest.fixture
+def series_frame():
+    """Create a decoded series frame."""
+    return pd.DataFrame(
+        {
+            "obs_time": pd.date_range("2024-01-01", periods=100, freq="D"),
+            "value": [float(i) for i in range(100)],
+        }
+    )
+
+
+@pytest.fixture
+def inner_reader(series_frame):
+    """Create a mock wrapped reader."""
+    reader = MagicMock(spec=DataReaderPort)
+    reader.read_series_from_paths = AsyncMock(return_value=series_frame)
+    return reader
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_inner_reader(tmp_path, inner_reader, series_frame):
+    """Test that the second read of the same version is served from disk."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+
+    first = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    second = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert inner_reader.read_series_from_paths.call_count == 1
+    pd.testing.assert_frame_equal(first, series_frame)
+    pd.testing.assert_frame_equal(second, series_frame)
+
+
+@pytest.mark.asyncio
+async def test_arrow_frames_hit_returns_table(tmp_path, inner_reader, series_frame):
+    """Test that hits are the cached Arrow tables when arrow_frames is set."""
+    inner_reader.read_series_from_paths.return_value = pa.Table.from_pandas(
+        series_frame, preserve_index=False
+    )
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7, arrow_frames=True)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    hit = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert isinstance(hit, pa.Table)
+    pd.testing.assert_frame_equal(hit.to_pandas(), series_frame)
+
+
+@pytest.mark.asyncio
+async def test_new_version_misses(tmp_path, inner_reader):
+    """Test that a new dataset version is not served from an old entry."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v2")
+
+    assert inner_reader.read_series_from_paths.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_without_version_bypasses_cache(tmp_path, inner_reader):
+    """Test that reads without a dataset version are not cached."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A")
+    await cache.read_series_from_paths(PATHS, "SERIES_A")
+
+    assert inner_reader.read_series_from_paths.call_count == 2
+    assert cache.total_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_respects_budget(tmp_path, inner_reader):
+    """Test that least recently used entries are evicted over budget."""
+    probe = DiskSeriesCache(inner_reader, tmp_path / "probe", max_bytes=10**7)
+    await probe.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    entry_bytes = probe.total_bytes
+
+    cache = DiskSeriesCache(inner_reader, tmp_path / "cache", max_bytes=2 * entry_bytes)
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v2")
+    # Touch v1 so v2 becomes the least recently used entry
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v3")
+    inner_reader.read_series_from_paths.reset_mock()
+
+    assert cache.total_bytes <= 2 * entry_bytes
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v3")
+    assert inner_reader.read_series_from_paths.call_count == 0
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v2")
+    assert inner_reader.read_series_from_paths.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_index_survives_restart(tmp_path, inner_reader, series_frame):
+    """Test that a new cache instance over the same directory keeps entries."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    cache.flush_index()
+    (tmp_path / "orphan.arrow").write_bytes(b"partial write")
+
+    restarted = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+    result = await restarted.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert inner_reader.read_series_from_paths.call_count == 1
+    assert restarted.total_bytes == cache.total_bytes
+    assert not (tmp_path / "orphan.arrow").exists()
+    pd.testing.assert_frame_equal(result, series_frame)
+
+
+@pytest.mark.asyncio
+async def test_index_is_written_at_most_once_per_interval(tmp_path, inner_reader):
+    """Test that puts within the write interval do not rewrite the index."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7, index_write_interval_seconds=0)
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    assert (tmp_path / "index.json").exists()
+
+    cache.index_write_interval_seconds = 3600
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v2")
+    assert len(json.loads((tmp_path / "index.json").read_text())) == 1
+
+    cache.flush_index()
+    assert len(json.loads((tmp_path / "index.json").read_text())) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_entry_write_returns_frame(tmp_path, inner_reader, series_frame, monkeypatch):
+    """Test that an entry that cannot be written is skipped, not raised."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+
+    def no_space(*args, **kwargs):  # noqa: ARG001
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(pa, "OSFile", no_space)
+    result = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    pd.testing.assert_frame_equal(result, series_frame)
+    assert cache.total_bytes == 0
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_failed_index_write_keeps_entry(tmp_path, inner_reader, series_frame):
+    """Test that an index that cannot be written leaves reads working."""
+    # A directory where the index belongs makes the rename fail
+    (tmp_path / "index.json").mkdir()
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7, index_write_interval_seconds=0)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    cache.flush_index()
+    result = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert inner_reader.read_series_from_paths.call_count == 1
+    pd.testing.assert_frame_equal(result, series_frame)
+    assert not (tmp_path / "index.tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_restart_removes_only_cache_files(tmp_path, inner_reader):
+    """Test that orphan entries and partial writes go but other files stay."""
+    (tmp_path / "orphan.arrow").write_bytes(b"partial write")
+    (tmp_path / "orphan.123.tmp").write_bytes(b"partial write")
+    (tmp_path / "notes.txt").write_text("not ours")
+    (tmp_path / "subdir.arrow").mkdir()
+
+    DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["notes.txt", "subdir.arrow"]
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        "[]",
+        '{"key": {"file_name": "key.arrow"}}',
+        '{"key": {"file_name": "key.arrow", "size_bytes": 1, "last_access": 0, "x": 1}}',
+        '{"key": 1}',
+    ],
+)
+@pytest.mark.asyncio
+async def test_malformed_index_starts_empty(tmp_path, inner_reader, series_frame, index):
+    """Test that an index with the wrong shape is discarded with its entries."""
+    (tmp_path / "key.arrow").write_bytes(b"entry")
+    (tmp_path / "index.json").write_text(index)
+
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+    result = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert not (tmp_path / "key.arrow").exists()
+    assert inner_reader.read_series_from_paths.call_count == 1
+    pd.testing.assert_frame_equal(result, series_frame)
+
+
+@pytest.mark.asyncio
+async def test_bounds_are_part_of_the_key(tmp_path, inner_reader):
+    """Test reads of different obs_time windows are cached separately."""
+    cache = DiskSeriesCache(inner_reader, tmp_path, max_bytes=10**7)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(
+        PATHS, "SERIES_A", dataset_version="v1", start=pd.Timestamp("2024-01-03")
+    )
+    await cache.read_series_from_paths(
+        PATHS, "SERIES_A", dataset_version="v1", start=pd.Timestamp("2024-01-03")
+    )
+
+    assert inner_reader.read_series_from_paths.call_count == 2
+    assert inner_reader.read_series_from_paths.call_args[1]["start"] == pd.Timestamp("2024-01-03")
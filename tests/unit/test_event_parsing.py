@@ -222,3 +222,45 @@ def test_composite_expression():
     assert event.expression_type == "composite"
     assert event.expression_json["op"] == "sum"
     assert len(event.expression_json["operands"]) == 3
+
+
+def _minimal_event(**extra) -> dict:
+    return {
+        "type": "metric_run_requested",
+        "runId": "run-1",
+        "metricCode": "sma.x",
+        "expressionType": "window_op",
+        "expressionJson": {"op": "sma", "series": {"series_code": "X"}, "window": 5},
+        "inputs": [{"datasetId": "ds", "seriesCode": "X"}],
+        "catalog": {"datasets": {}},
+        "output": {"basePath": "s3://bucket/metrics/sma.x/"},
+        **extra,
+    }
+
+
+def test_output_window_is_optional():
+    """Test events without outputWindow recompute the full history."""
+    event = MetricRunRequestedEvent(**_minimal_event())
+
+    assert event.output_window is None
+
+
+def test_parse_output_window():
+    """Test parsing the outputWindow field."""
+    event = MetricRunRequestedEvent(
+        **_minimal_event(outputWindow={"start": "2025-01-01T00:00:00Z", "end": "2025-01-31"})
+    )
+
+    assert event.output_window.start.year == 2025
+    assert event.output_window.end.day == 31
+
+
+def test_output_window_end_before_start_rejected():
+    """Test an inverted window is rejected."""
+    import pytest
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError, match="must not be before"):
+        MetricRunRequestedEvent(
+            **_minimal_event(outputWindow={"start": "2025-02-01", "end": "2025-01-01"})
+        )
@@ -0,0 +1,210 @@
+"""Unit tests for the expression compiler."""
+
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from metrics_worker.application.services import expression_eval
+from metrics_worker.application.services.expression_compiler import (
+    SeriesMathNode,
+    SeriesNode,
+    WindowOpNode,
+    compile_expression,
+    evaluate_compiled,
+    node_label,
+)
+from metrics_worker.application.services.expression_eval import evaluate_expression
+from metrics_worker.application.services.window_ops import sma
+from metrics_worker.domain.enums import ExpressionType, SeriesMathOp, WindowOp
+from metrics_worker.domain.errors import ExpressionEvaluationError, InvalidExpressionError
+
+_SMA_X = {"op": "sma", "series": {"series_code": "X"}, "window": 3}
+
+# sum(sma(X, 3), sma(X, 4), sma(X, 5), sma(X, 6)): four independent window ops
+_WIDE = {"op": "sum", "operands": [{**_SMA_X, "window": window} for window in (3, 4, 5, 6)]}
+
+
+def _x_series() -> dict[str, pd.DataFrame]:
+    return {
+        "X": pd.DataFrame({
+            "obs_time": pd.date_range("2024-01-01", periods=10),
+            "value": [float(value) for value in range(10)],
+        }),
+    }
+
+
+def test_compile_builds_typed_nodes():
+    """Test nodes carry parsed enums and nested types inferred once."""
+    compiled = compile_expression(
+        {"op": "ratio", "left": _SMA_X, "right": {"seriesCode": "Y"}, "scale": 100},
+        "series_math",
+    )
+
+    root = compiled.root
+    assert isinstance(root, SeriesMathNode)
+    assert root.op is SeriesMathOp.RATIO
+    assert root.scale == 100
+    assert isinstance(root.left, WindowOpNode)
+    assert root.left.op is WindowOp.SMA
+    assert root.left.window == 3
+    assert root.right.series_code == "Y"
+    assert compiled.series_codes == ("X", "Y")
+    assert compiled.nodes[-1] is root
+
+
+def test_identical_subtrees_share_one_node():
+    """Test a subexpression used twice is compiled to a single node."""
+    compiled = compile_expression(
+        {"op": "subtract", "left": _SMA_X, "right": dict(_SMA_X)},
+        ExpressionType.SERIES_MATH,
+    )
+
+    assert compiled.root.left is compiled.root.right
+    assert len(compiled.nodes) == 3
+    assert compiled.consumer_counts()[compiled.root.left] == 2
+    assert sum(isinstance(node, SeriesNode) for node in compiled.nodes) == 1
+
+
+def test_different_windows_are_distinct_nodes():
+    """Test subtrees differing in a parameter are not merged."""
+    compiled = compile_expression(
+        {"op": "subtract", "left": _SMA_X, "right": {**_SMA_X, "window": 4}},
+        "series_math",
+    )
+
+    assert compiled.root.left is not compiled.root.right
+    assert compiled.root.left.series is compiled.root.right.series
+
+
+def test_shared_subtree_is_evaluated_once():
+    """Test the evaluator runs a deduplicated node a single time."""
+    series_data = {
+        "X": pd.DataFrame({
+            "obs_time": pd.date_range("2024-01-01", periods=5),
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }),
+    }
+    expression = {"op": "ratio", "left": _SMA_X, "right": _SMA_X}
+
+    calls = []
+
+    def counting_sma(series, window):
+        calls.append(window)
+        return sma(series, window)
+
+    with patch.dict(expression_eval._WINDOW_OPS, {WindowOp.SMA: counting_sma}):
+        result = evaluate_expression(expression, "series_math", series_data)
+
+    assert calls == [3]
+    assert result["value"].iloc[2:].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_compiled_plans_are_cached_by_expression():
+    """Test an equal expression, even with keys reordered, reuses the compiled plan."""
+    expression = {"op": "add", "left": {"series_code": "A"}, "right": {"series_code": "B"}}
+    reordered = {"right": {"series_code": "B"}, "left": {"series_code": "A"}, "op": "add"}
+
+    compiled = compile_expression(expression, "series_math")
+
+    assert compile_expression(reordered, ExpressionType.SERIES_MATH) is compiled
+    assert compile_expression({**expression, "op": "subtract"}, "series_math") is not compiled
+
+
+def test_invalid_expressions_raise_at_compile_time():
+    """Test validation errors are raised by the compiler, every time."""
+    expression = {"op": "sma", "series": {"series_code": "X"}, "window": 0}
+
+    for _ in range(2):
+        with pytest.raises(InvalidExpressionError, match="Invalid window"):
+            compile_expression(expression, "window_op")
+    with pytest.raises(InvalidExpressionError, match="Unknown expression type"):
+        compile_expression(expression, "unknown")
+
+
+@pytest.mark.parametrize(
+    ("expression", "expression_type", "match"),
+    [
+        ({"op": "sma", "series": "X", "window": 3}, "window_op", "Cannot resolve operand"),
+        ({"op": "sma", "series": {"series_code": 7}, "window": 3}, "window_op", "Cannot resolve"),
+        ({"op": "sum", "operands": {"series_code": "X"}}, "composite", "at least 2 operands"),
+        ({"op": "add", "left": {"op": 1}, "right": {"series_code": "X"}}, "series_math", "Missing"),
+    ],
+)
+def test_malformed_json_is_rejected(expression, expression_type, match):
+    """Test operands and fields of the wrong JSON type raise InvalidExpressionError."""
+    with pytest.raises(InvalidExpressionError, match=match):
+        compile_expression(expression, expression_type)
+
+
+def test_parallel_evaluation_matches_sequential_and_times_every_node():
+    """Test nodes evaluated on a thread pool give the same result, with one timing per node."""
+    compiled = compile_expression(_WIDE, "composite")
+    timings = []
+
+    result = evaluate_expression(_WIDE, "composite", _x_series(), 4, timings)
+
+    pd.testing.assert_frame_equal(result, evaluate_expression(_WIDE, "composite", _x_series()))
+    assert sorted(node_label(timing.node) for timing in timings) == sorted(
+        node_label(node) for node in compiled.nodes
+    )
+    assert timings[-1].node is compiled.root
+    assert timings[-1].as_dict()["node"] == "composite:sum"
+    assert all(timing.seconds >= 0 and timing.start_seconds >= 0 for timing in timings)
+
+
+def test_independent_nodes_run_concurrently_within_the_bound():
+    """Test independent nodes overlap, but no more of them than max_parallel_nodes."""
+    # Each window op waits for a second one: sequential evaluation would time out
+    barrier = threading.Barrier(2, timeout=5)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def overlapping_sma(series, window):
+        with lock:
+            running.append(window)
+            peak.append(len(running))
+        barrier.wait()
+        with lock:
+            running.remove(window)
+        return sma(series, window)
+
+    with patch.dict(expression_eval._WINDOW_OPS, {WindowOp.SMA: overlapping_sma}):
+        result = evaluate_expression(_WIDE, "composite", _x_series(), 2)
+
+    assert max(peak) == 2
+    assert len(peak) == 4
+    assert result["value"].iloc[5:].notna().all()
+
+
+def test_parallel_evaluation_raises_the_failing_node_error():
+    """Test an error on a worker thread is raised to the caller."""
+    expression = {"op": "sum", "operands": [_SMA_X, {"series_code": "MISSING"}]}
+
+    with pytest.raises(ExpressionEvaluationError, match="Series not found: MISSING"):
+        evaluate_expression(expression, "composite", _x_series(), 4)
+
+
+def test_parallel_evaluation_frees_results_after_their_last_consumer():
+    """Test intermediate results are dropped once every consumer has run."""
+    compiled = compile_expression(_WIDE, "composite")
+    alive = set()
+
+    class Result:
+        def __init__(self, node):
+            self.node = node
+            alive.add(node)
+
+        def __del__(self):
+            alive.discard(self.node)
+
+    def evaluate_node(node, operands):  # noqa: ARG001
+        if node is compiled.root:
+            # The input series has been dropped; only the root's operands are held
+            assert alive == set(node.operands)
+        return Result(node)
+
+    root = evaluate_compiled(compiled, evaluate_node, 4)
+    assert root.node is compiled.root
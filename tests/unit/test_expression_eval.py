@@ -1,5 +1,6 @@
 """Unit tests for expression evaluator."""
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -550,3 +551,44 @@ def test_expression_type_enum():
     assert result["value"].iloc[0] == 4.0
     assert result["value"].iloc[1] == 6.0
 
+
+
+def test_composite_sum_keeps_infinities():
+    """Test NaN is skipped in sums but infinite operands stay infinite."""
+    obs_time = pd.date_range("2024-01-01", periods=3)
+    series_data = {
+        "A": pd.DataFrame({"obs_time": obs_time, "value": [1.0, np.nan, np.inf]}),
+        "B": pd.DataFrame({"obs_time": obs_time, "value": [2.0, 3.0, 1.0]}),
+    }
+
+    expression = {"op": "sum", "operands": [{"series_code": "A"}, {"series_code": "B"}]}
+    result = evaluate_expression(expression, "composite", series_data)
+
+    assert result["value"].tolist() == [3.0, 3.0, np.inf]
+
+
+@pytest.mark.parametrize("op", ["sum", "avg", "max", "min"])
+def test_composite_of_many_operands_matches_pandas_row_reductions(op):
+    """Test a wide composite equals the reduction over the merged frame, bit for bit."""
+    rng = np.random.default_rng(0)
+    obs_time = pd.date_range("2024-01-01", periods=60)
+    series_data = {}
+    for idx in range(40):
+        keep = rng.random(len(obs_time)) > 0.3
+        values = rng.normal(0.0, 1e6, size=int(keep.sum()))
+        values[rng.random(len(values)) < 0.1] = np.nan
+        series_data[f"S{idx}"] = pd.DataFrame({"obs_time": obs_time[keep], "value": values})
+
+    expression = {"op": op, "operands": [{"series_code": code} for code in series_data]}
+    result = evaluate_expression(expression, "composite", series_data)
+
+    # Reference: successive outer merges, then a DataFrame row reduction
+    wide = None
+    for idx, frame in enumerate(series_data.values()):
+        renamed = frame.rename(columns={"value": f"value_{idx}"})
+        wide = renamed if wide is None else wide.merge(renamed, on="obs_time", how="outer")
+    wide = wide.sort_values("obs_time").set_index("obs_time")
+    reduce = {"sum": wide.sum, "avg": wide.mean, "max": wide.max, "min": wide.min}[op]
+    expected = reduce(axis=1)
+    np.testing.assert_array_equal(result["obs_time"].to_numpy(), expected.index.to_numpy())
+    np.testing.assert_array_equal(result["value"].to_numpy(), expected.to_numpy())
@@ -1,5 +1,6 @@
 """Unit tests for handle_run_request use case."""
 
+from functools import partial
 from unittest.mock import AsyncMock, MagicMock
 
 import pandas as pd
@@ -7,8 +8,10 @@ import pytest
 
 from metrics_worker.application.dto.catalog import DatasetManifest, DateRange
 from metrics_worker.application.services.planner import ReadPlan
+from metrics_worker.application.services.series_index import SeriesFileIndex
 from metrics_worker.application.use_cases.handle_run_request import (
     _calculate_output_paths,
+    _parse_dataset_manifest,
     _read_all_series,
     _read_single_series,
 )
@@ -63,12 +66,16 @@ def mock_data_reader():
     """Create mock data reader."""
     reader = MagicMock(spec=DataReaderPort)
     reader.read_series_from_paths = AsyncMock()
+    # Keep the port's default batching so batched reads reach read_series_from_paths
+    reader.read_many_series_from_paths = partial(
+        DataReaderPort.read_many_series_from_paths, reader
+    )
     return reader
 
 
 @pytest.mark.asyncio
 async def test_read_single_series_success(
-    mock_data_reader, sample_series_frame  # noqa: F811
+    mock_data_reader, sample_series_frame
 ):
     """Test reading a single series successfully."""
     mock_data_reader.read_series_from_paths.return_value = sample_series_frame
@@ -77,10 +84,12 @@ async def test_read_single_series_success(
         series_code="SERIES_A",
         dataset_id="test-dataset",
         projections_path="datasets/test-dataset/projections",
-        all_parquet_files=[
-            "SERIES_A/year=2024/month=01/data.parquet",
-            "SERIES_B/year=2024/month=01/data.parquet",
-        ],
+        series_index=SeriesFileIndex(
+            [
+                "SERIES_A/year=2024/month=01/data.parquet",
+                "SERIES_B/year=2024/month=01/data.parquet",
+            ]
+        ),
         data_reader=mock_data_reader,
     )
 
@@ -94,23 +103,25 @@ async def test_read_single_series_success(
 
 
 @pytest.mark.asyncio
-async def test_read_single_series_no_files_found(mock_data_reader):  # noqa: F811
+async def test_read_single_series_no_files_found(mock_data_reader):
     """Test reading a series when no parquet files are found."""
     with pytest.raises(ValueError, match="No parquet files found"):
         await _read_single_series(
             series_code="SERIES_C",
             dataset_id="test-dataset",
             projections_path="datasets/test-dataset/projections",
-            all_parquet_files=[
-                "SERIES_A/year=2024/month=01/data.parquet",
-                "SERIES_B/year=2024/month=01/data.parquet",
-            ],
+            series_index=SeriesFileIndex(
+                [
+                    "SERIES_A/year=2024/month=01/data.parquet",
+                    "SERIES_B/year=2024/month=01/data.parquet",
+                ]
+            ),
             data_reader=mock_data_reader,
         )
 
 
 @pytest.mark.asyncio
-async def test_read_single_series_read_error(mock_data_reader):  # noqa: F811
+async def test_read_single_series_read_error(mock_data_reader):
     """Test reading a series when data reader raises an error."""
     mock_data_reader.read_series_from_paths.side_effect = ValueError("File not found")
 
@@ -119,14 +130,14 @@ async def test_read_single_series_read_error(mock_data_reader):  # noqa: F811
             series_code="SERIES_A",
             dataset_id="test-dataset",
             projections_path="datasets/test-dataset/projections",
-            all_parquet_files=["SERIES_A/year=2024/month=01/data.parquet"],
+            series_index=SeriesFileIndex(["SERIES_A/year=2024/month=01/data.parquet"]),
             data_reader=mock_data_reader,
         )
 
 
 @pytest.mark.asyncio
 async def test_read_all_series_single_dataset(
-    mock_catalog, mock_data_reader, sample_series_frame  # noqa: F811
+    mock_catalog, mock_data_reader, sample_series_frame
 ):
     """Test reading all series from a single dataset."""
     read_plan = ReadPlan()
@@ -184,7 +195,7 @@ async def test_read_all_series_single_dataset(
 
 @pytest.mark.asyncio
 async def test_read_all_series_multiple_datasets(
-    mock_catalog, mock_data_reader, sample_series_frame  # noqa: F811
+    mock_catalog, mock_data_reader, sample_series_frame
 ):
     """Test reading series from multiple datasets."""
     read_plan = ReadPlan()
@@ -261,7 +272,7 @@ async def test_read_all_series_multiple_datasets(
 
 @pytest.mark.asyncio
 async def test_read_all_series_error_propagation(
-    mock_catalog, mock_data_reader  # noqa: F811
+    mock_catalog, mock_data_reader
 ):
     """Test that errors in reading series are properly propagated."""
     read_plan = ReadPlan()
@@ -304,6 +315,71 @@ async def test_read_all_series_error_propagation(
         )
 
 
+@pytest.mark.asyncio
+async def test_read_all_series_bounds_concurrent_reads(
+    mock_catalog, mock_data_reader, sample_series_frame
+):
+    """Test that at most max_concurrent_reads series are read at once."""
+    import asyncio
+
+    series_codes = [f"SERIES_{idx}" for idx in range(6)]
+    read_plan = ReadPlan()
+    # One dataset per series: series sharing a dataset are read in a single batch
+    for series_code in series_codes:
+        read_plan.add_series(f"dataset-{series_code}", series_code)
+
+    catalog_info = {
+        "datasets": {
+            f"dataset-{series_code}": {
+                "manifestPath": "datasets/test-dataset/manifest.json",
+                "projectionsPath": "datasets/test-dataset/projections",
+            }
+            for series_code in series_codes
+        }
+    }
+
+    mock_catalog.get_dataset_manifest.return_value = {
+        "version_id": "v1",
+        "dataset_id": "test-dataset",
+        "created_at": "2024-01-01T12:00:00Z",
+        "collection_date": "2024-01-01T11:00:00Z",
+        "data_points_count": 50,
+        "series_count": len(series_codes),
+        "series_codes": series_codes,
+        "date_range": {
+            "min_obs_time": "2024-01-01T00:00:00Z",
+            "max_obs_time": "2024-01-05T00:00:00Z",
+        },
+        "parquet_files": [f"{code}/year=2024/month=01/data.parquet" for code in series_codes],
+        "partitions": [],
+        "partition_strategy": "series_year_month",
+    }
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_read(paths, series_code, **kwargs):  # noqa: ARG001
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return sample_series_frame
+
+    mock_data_reader.read_series_from_paths.side_effect = slow_read
+
+    result = await _read_all_series(
+        read_plan=read_plan,
+        catalog_info=catalog_info,
+        catalog=mock_catalog,
+        data_reader=mock_data_reader,
+        max_concurrent_reads=2,
+    )
+
+    assert sorted(result) == series_codes
+    assert max_in_flight == 2
+
+
 def test_calculate_output_paths():
     """Test calculating output paths."""
     base_path = "s3://bucket/metrics/test-metric"
@@ -321,3 +397,291 @@ def test_calculate_output_paths():
     assert run_id in paths.marker_path
     assert paths.manifest_relative_path == paths.manifest_path
 
+
+
+def test_parse_dataset_manifest_reuses_same_catalog_copy():
+    """Test the parsed manifest is reused only for the identical catalog dict."""
+    manifest_dict = {
+        "version_id": "v-parse-reuse",
+        "dataset_id": "test-dataset",
+        "created_at": "2024-01-01T12:00:00Z",
+        "collection_date": "2024-01-01T11:00:00Z",
+        "data_points_count": 1,
+        "series_count": 1,
+        "series_codes": ["S"],
+        "date_range": {
+            "min_obs_time": "2024-01-01T00:00:00Z",
+            "max_obs_time": "2024-01-01T00:00:00Z",
+        },
+        "parquet_files": ["S/year=2024/month=01/data.parquet"],
+        "partitions": [],
+        "partition_strategy": "series_year_month",
+    }
+
+    first = _parse_dataset_manifest(manifest_dict)
+
+    assert _parse_dataset_manifest(manifest_dict) is first
+    assert _parse_dataset_manifest(dict(manifest_dict)) is not first
+
+
+def _manifest_for(dataset_id: str, series_code: str) -> dict:
+    return {
+        "version_id": "v1",
+        "dataset_id": dataset_id,
+        "created_at": "2024-01-01T12:00:00Z",
+        "collection_date": "2024-01-01T11:00:00Z",
+        "data_points_count": 5,
+        "series_count": 1,
+        "series_codes": [series_code],
+        "date_range": {
+            "min_obs_time": "2024-01-01T00:00:00Z",
+            "max_obs_time": "2024-01-05T00:00:00Z",
+        },
+        "parquet_files": [f"{series_code}/year=2024/month=01/data.parquet"],
+        "partitions": [],
+        "partition_strategy": "series_year_month",
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_all_series_loads_manifests_concurrently(
+    mock_catalog, mock_data_reader, sample_series_frame
+):
+    """Test manifests of different datasets are fetched at the same time."""
+    import asyncio
+
+    read_plan = ReadPlan()
+    read_plan.add_series("dataset1", "SERIES_A")
+    read_plan.add_series("dataset2", "SERIES_B")
+    catalog_info = {
+        "datasets": {
+            dataset_id: {
+                "manifestPath": f"datasets/{dataset_id}/concurrent/manifest.json",
+                "projectionsPath": f"datasets/{dataset_id}/projections",
+            }
+            for dataset_id in ["dataset1", "dataset2"]
+        }
+    }
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_manifest(path: str) -> dict:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "dataset1" in path:
+            return _manifest_for("dataset1", "SERIES_A")
+        return _manifest_for("dataset2", "SERIES_B")
+
+    mock_catalog.get_dataset_manifest.side_effect = slow_manifest
+    mock_data_reader.read_series_from_paths.return_value = sample_series_frame
+
+    await _read_all_series(read_plan, catalog_info, mock_catalog, mock_data_reader)
+
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_share_one_manifest_fetch(
+    mock_catalog, mock_data_reader, sample_series_frame
+):
+    """Test runs reading the same manifest at once trigger a single fetch."""
+    import asyncio
+
+    read_plan = ReadPlan()
+    read_plan.add_series("dataset1", "SERIES_A")
+    catalog_info = {
+        "datasets": {
+            "dataset1": {
+                "manifestPath": "datasets/dataset1/shared/manifest.json",
+                "projectionsPath": "datasets/dataset1/projections",
+            }
+        }
+    }
+
+    async def slow_manifest(path: str) -> dict:  # noqa: ARG001
+        await asyncio.sleep(0.01)
+        return _manifest_for("dataset1", "SERIES_A")
+
+    mock_catalog.get_dataset_manifest.side_effect = slow_manifest
+    mock_data_reader.read_series_from_paths.return_value = sample_series_frame
+
+    results = await asyncio.gather(
+        *(
+            _read_all_series(read_plan, catalog_info, mock_catalog, mock_data_reader)
+            for _ in range(3)
+        )
+    )
+
+    assert all("SERIES_A" in result for result in results)
+    assert mock_catalog.get_dataset_manifest.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_read_single_series_does_not_match_code_prefixes(
+    mock_data_reader, sample_series_frame
+):
+    """Test a series code that prefixes another only gets its own files."""
+    mock_data_reader.read_series_from_paths.return_value = sample_series_frame
+
+    await _read_single_series(
+        series_code="X_D",
+        dataset_id="test-dataset",
+        projections_path="projections",
+        series_index=SeriesFileIndex(
+            [
+                "X_D/year=2024/month=01/data.parquet",
+                "X_D_ADJ/year=2024/month=01/data.parquet",
+            ]
+        ),
+        data_reader=mock_data_reader,
+    )
+
+    paths = mock_data_reader.read_series_from_paths.call_args[0][0]
+    assert paths == ["projections/X_D/year=2024/month=01/data.parquet"]
+
+
+@pytest.mark.asyncio
+async def test_read_single_series_with_bounds_reads_only_overlapping_months(
+    mock_data_reader, sample_series_frame
+):
+    """Test obs_time bounds select partitions and are passed to the reader."""
+    mock_data_reader.read_series_from_paths.return_value = sample_series_frame
+    start = pd.Timestamp("2024-02-15")
+
+    await _read_single_series(
+        series_code="SERIES_A",
+        dataset_id="test-dataset",
+        projections_path="projections",
+        series_index=SeriesFileIndex(
+            [f"SERIES_A/year=2024/month={month:02d}/data.parquet" for month in range(1, 4)]
+        ),
+        data_reader=mock_data_reader,
+        start=start,
+    )
+
+    call = mock_data_reader.read_series_from_paths.call_args
+    assert call[0][0] == [
+        "projections/SERIES_A/year=2024/month=02/data.parquet",
+        "projections/SERIES_A/year=2024/month=03/data.parquet",
+    ]
+    assert call[1]["start"] == start
+
+
+@pytest.mark.parametrize(
+    "expression, expression_type",
+    [
+        ({"op": "sma", "series": {"series_code": "A"}, "window": 30}, "window_op"),
+        ({"op": "ema", "series": {"series_code": "A"}, "window": 12}, "window_op"),
+        (
+            {
+                "op": "sma",
+                "series": {"op": "lag", "series": {"series_code": "A"}, "window": 365},
+                "window": 7,
+            },
+            "window_op",
+        ),
+        (
+            {
+                "op": "ratio",
+                "left": {"op": "max", "series": {"series_code": "A"}, "window": 20},
+                "right": {"series_code": "B"},
+            },
+            "series_math",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_output_window_matches_full_recompute(expression, expression_type):
+    """Test a windowed run reads less but produces the full run's values in the window."""
+    import numpy as np
+
+    from metrics_worker.application.dto.events import OutputWindow
+    from metrics_worker.application.services.expression_eval import evaluate_expression
+    from metrics_worker.application.services.planner import plan_reads
+    from metrics_worker.application.use_cases.handle_run_request import _trim_to_window
+
+    obs_time = pd.bdate_range("2021-01-01", "2024-06-30")
+    rng = np.random.default_rng(1)
+    full = {
+        code: pd.DataFrame({"obs_time": obs_time, "value": rng.normal(100, 5, len(obs_time))})
+        for code in ["A", "B"]
+    }
+    months = sorted({(ts.year, ts.month) for ts in obs_time})
+    manifest_dict = _manifest_for("ds", "A")
+    manifest_dict["version_id"] = f"v-window-{expression['op']}"
+    manifest_dict["parquet_files"] = [
+        f"{code}/year={year}/month={month:02d}/data.parquet"
+        for code in ["A", "B"]
+        for year, month in months
+    ]
+
+    rows_read = []
+
+    async def read(paths, series_code, dataset_version=None, start=None, end=None):  # noqa: ARG001
+        frame = full[series_code]
+        if start is not None:
+            frame = frame[frame["obs_time"] >= start]
+        if end is not None:
+            frame = frame[frame["obs_time"] <= end]
+        rows_read.append(len(frame))
+        return frame.reset_index(drop=True)
+
+    catalog = MagicMock(spec=CatalogPort)
+    catalog.get_dataset_manifest = AsyncMock(return_value=manifest_dict)
+    reader = MagicMock(spec=DataReaderPort)
+    reader.read_series_from_paths = AsyncMock(side_effect=read)
+    inputs = [{"datasetId": "ds", "seriesCode": "A"}, {"datasetId": "ds", "seriesCode": "B"}]
+    catalog_info = {
+        "datasets": {
+            "ds": {"manifestPath": "ds/window/manifest.json", "projectionsPath": "projections"}
+        }
+    }
+    window = OutputWindow(start="2024-03-01T00:00:00Z", end="2024-05-31")
+
+    plan = plan_reads(expression, expression_type, inputs)
+    series_data = await _read_all_series(plan, catalog_info, catalog, reader, output_window=window)
+    result = evaluate_expression(expression, expression_type, series_data)
+    windowed = _trim_to_window(result, window)
+    expected = _trim_to_window(evaluate_expression(expression, expression_type, full), window)
+
+    assert len(windowed) == len(expected) > 0
+    assert (windowed["obs_time"].to_numpy() == expected["obs_time"].to_numpy()).all()
+    np.testing.assert_allclose(windowed["value"], expected["value"], rtol=1e-8)
+    assert max(rows_read) < len(obs_time)
+
+
+@pytest.mark.asyncio
+async def test_read_all_series_batches_series_of_a_dataset(
+    mock_catalog, sample_series_frame
+):
+    """Test series of the same dataset are requested in one batched read."""
+    read_plan = ReadPlan()
+    read_plan.add_series("ds", "A")
+    read_plan.add_series("ds", "B")
+    manifest_dict = _manifest_for("ds", "A")
+    manifest_dict["version_id"] = "v-batched"
+    manifest_dict["parquet_files"] += ["B/year=2024/month=01/data.parquet"]
+    mock_catalog.get_dataset_manifest.return_value = manifest_dict
+    catalog_info = {
+        "datasets": {"ds": {"manifestPath": "ds/batched/manifest.json", "projectionsPath": "p"}}
+    }
+    reader = MagicMock(spec=DataReaderPort)
+    reader.read_many_series_from_paths = AsyncMock(
+        return_value={"A": sample_series_frame, "B": sample_series_frame}
+    )
+
+    result = await _read_all_series(read_plan, catalog_info, mock_catalog, reader)
+
+    assert sorted(result) == ["A", "B"]
+    reader.read_many_series_from_paths.assert_awaited_once()
+    paths_by_series = reader.read_many_series_from_paths.call_args[0][0]
+    assert paths_by_series == {
+        "A": ["p/A/year=2024/month=01/data.parquet"],
+        "B": ["p/B/year=2024/month=01/data.parquet"],
+    }
+    assert reader.read_many_series_from_paths.call_args[1]["dataset_version"] == "v-batched"
+    reader.read_series_from_paths.assert_not_called()
@@ -0,0 +1,320 @@
+"""Unit tests for incremental metric runs."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from metrics_worker.application.dto.events import MetricRunRequestedEvent
+from metrics_worker.application.use_cases.handle_run_request import RunOptions, run
+from metrics_worker.domain.enums import ExpressionEngine
+from metrics_worker.domain.ports import CatalogPort, ClockPort, DataReaderPort, EventBusPort
+from metrics_worker.infrastructure.io.jsonl_writer import JsonlWriter
+
+BASE_PATH = "s3://bucket/metrics/incremental.test/"
+
+
+class InMemoryS3IO:
+    """Object store with the subset of the S3IO interface the writer uses."""
+
+    bucket = "bucket"
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    async def put_object(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str = "",  # noqa: ARG002
+    ) -> None:
+        self.objects[key] = body
+
+    async def put_json(self, key: str, data: dict) -> None:
+        self.objects[key] = json.dumps(data, default=str).encode("utf-8")
+
+    async def get_json(self, key: str) -> dict:
+        return json.loads(self.objects[key])
+
+    async def get_object(self, key: str) -> bytes:
+        return self.objects[key]
+
+    async def object_exists(self, key: str) -> bool:
+        return key in self.objects
+
+
+class StepClock(ClockPort):
+    """Clock advancing one minute per call so every run gets its own version."""
+
+    def __init__(self) -> None:
+        # Naive UTC, like SystemClock
+        self.current = datetime(2025, 1, 1)  # noqa: DTZ001
+
+    def now(self) -> datetime:
+        self.current += timedelta(minutes=1)
+        return self.current
+
+    def format_version_ts(self, ts: datetime) -> str:
+        return ts.strftime("%Y-%m-%dT%H-%M-%S")
+
+
+def _series(end: str, seed: int = 0) -> pd.DataFrame:
+    obs_time = pd.bdate_range("2021-01-01", end)
+    values = np.random.default_rng(seed).normal(100, 5, len(obs_time))
+    return pd.DataFrame({"obs_time": obs_time, "value": values})
+
+
+def _event(
+    expression: dict,
+    expression_type: str = "window_op",
+    output_window: dict | None = None,
+) -> MetricRunRequestedEvent:
+    return MetricRunRequestedEvent(
+        type="metric_run_requested",
+        runId="run",
+        metricCode="incremental.test",
+        expressionType=expression_type,
+        expressionJson=expression,
+        inputs=[{"datasetId": "ds", "seriesCode": "A"}],
+        catalog={
+            "datasets": {"ds": {"manifestPath": "ds/manifest.json", "projectionsPath": "p"}}
+        },
+        output={"basePath": BASE_PATH},
+        outputWindow=output_window,
+    )
+
+
+def _catalog(source: pd.DataFrame, version: str) -> MagicMock:
+    months = sorted({(ts.year, ts.month) for ts in source["obs_time"]})
+    catalog = MagicMock(spec=CatalogPort)
+    catalog.get_dataset_manifest = AsyncMock(
+        return_value={
+            "version_id": version,
+            "dataset_id": "ds",
+            "created_at": "2025-01-01T00:00:00Z",
+            "collection_date": "2025-01-01T00:00:00Z",
+            "data_points_count": len(source),
+            "series_count": 1,
+            "series_codes": ["A"],
+            "date_range": {"min_obs_time": "2021-01-01", "max_obs_time": "2024-06-28"},
+            "parquet_files": [f"A/year={y}/month={m:02d}/data.parquet" for y, m in months],
+            "partitions": [],
+            "partition_strategy": "series_year_month",
+        }
+    )
+    return catalog
+
+
+def _reader(source: pd.DataFrame, rows_read: list[int], as_tables: bool = False) -> MagicMock:
+    async def read(paths, series_code, dataset_version=None, start=None, end=None):  # noqa: ARG001
+        frame = source
+        if start is not None:
+            frame = frame[frame["obs_time"] >= start]
+        if end is not None:
+            frame = frame[frame["obs_time"] <= end]
+        rows_read.append(len(frame))
+        if as_tables:
+            return pa.Table.from_pandas(frame, preserve_index=False)
+        return frame.reset_index(drop=True)
+
+    reader = MagicMock(spec=DataReaderPort)
+    reader.read_series_from_paths = AsyncMock(side_effect=read)
+    return reader
+
+
+async def _run(
+    event: MetricRunRequestedEvent,
+    source: pd.DataFrame,
+    store: InMemoryS3IO,
+    clock: StepClock,
+    options: RunOptions,
+    version: str,
+) -> tuple[pd.DataFrame, list[int]]:
+    rows_read: list[int] = []
+    writer = JsonlWriter(store)
+    event_bus = MagicMock(spec=EventBusPort)
+    await run(
+        event,
+        _catalog(source, version),
+        _reader(source, rows_read, options.expression_engine == ExpressionEngine.ARROW),
+        writer,
+        event_bus,
+        clock,
+        options,
+    )
+    event_bus.publish_completed.assert_called_once()
+    assert event_bus.publish_completed.call_args[1]["status"] == "SUCCESS"
+    manifest = await writer.read_manifest("bucket/metrics/incremental.test/current/manifest.json")
+    outputs = manifest["outputs"]
+    paths = [f"{outputs['data_prefix']}/{name}" for name in outputs["files"]]
+    frame = await writer.read_jsonl(paths)
+    return frame, rows_read
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        {"op": "sma", "series": {"series_code": "A"}, "window": 20},
+        {"op": "ema", "series": {"series_code": "A"}, "window": 10},
+        {
+            "op": "max",
+            "series": {"op": "lag", "series": {"series_code": "A"}, "window": 30},
+            "window": 5,
+        },
+    ],
+)
+@pytest.mark.parametrize("engine", list(ExpressionEngine))
+@pytest.mark.asyncio
+async def test_incremental_run_matches_full_recompute(expression, engine):
+    """Test extending the previous output gives the same values as recomputing all history."""
+    event = _event(expression)
+    clock = StepClock()
+    incremental = RunOptions(
+        incremental=True,
+        incremental_restate_days=5,
+        expression_engine=engine,
+    )
+
+    store = InMemoryS3IO()
+    old_source = _series("2024-03-29")
+    await _run(event, old_source, store, clock, incremental, "v1")
+
+    # New observations arrive and the latest old ones are revised
+    new_source = _series("2024-06-28")
+    new_source.loc[new_source["obs_time"] >= "2024-03-27", "value"] += 1.0
+    extended, rows_read = await _run(event, new_source, store, clock, incremental, "v2")
+
+    full, _ = await _run(event, new_source, InMemoryS3IO(), clock, RunOptions(), "v2")
+
+    assert len(extended) == len(full)
+    assert (extended["obs_time"].to_numpy() == full["obs_time"].to_numpy()).all()
+    np.testing.assert_allclose(extended["value"], full["value"], rtol=1e-8)
+    assert max(rows_read) < len(new_source) / 2
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_recomputes_all_when_expression_changes():
+    """Test a previous output built from another expression is not extended."""
+    clock = StepClock()
+    incremental = RunOptions(incremental=True)
+    store = InMemoryS3IO()
+    source = _series("2024-06-28")
+
+    await _run(
+        _event({"op": "sma", "series": {"series_code": "A"}, "window": 20}),
+        source, store, clock, incremental, "v1",
+    )
+    changed, rows_read = await _run(
+        _event({"op": "sma", "series": {"series_code": "A"}, "window": 5}),
+        source, store, clock, incremental, "v1",
+    )
+
+    assert rows_read == [len(source)]
+    expected = source["value"].rolling(5, min_periods=5).mean()
+    np.testing.assert_allclose(changed["value"], expected, rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_arrow_engine_writes_same_output_as_pandas_engine():
+    """Test both expression engines write byte-identical JSONL."""
+    event = _event(
+        {
+            "op": "ratio",
+            "left": {"op": "sma", "series": {"series_code": "A"}, "window": 10},
+            "right": {"op": "lag", "series": {"series_code": "A"}, "window": 30},
+            "scale": 100,
+        },
+        "series_math",
+    )
+    source = _series("2024-06-28")
+    source.loc[source.index % 17 == 0, "value"] = np.nan
+
+    outputs = {}
+    for engine in ExpressionEngine:
+        store = InMemoryS3IO()
+        await _run(
+            event,
+            source,
+            store,
+            StepClock(),
+            RunOptions(expression_engine=engine),
+            "v1",
+        )
+        outputs[engine] = {
+            key: body for key, body in store.objects.items() if key.endswith(".jsonl")
+        }
+
+    assert outputs[ExpressionEngine.ARROW] == outputs[ExpressionEngine.PANDAS]
+    assert b'"value": null' in next(iter(outputs[ExpressionEngine.ARROW].values()))
+
+
+@pytest.mark.parametrize("engine", list(ExpressionEngine))
+@pytest.mark.asyncio
+async def test_parallel_expression_nodes_write_same_output(engine):
+    """Test evaluating independent nodes on threads writes the same JSONL as one by one."""
+    event = _event(
+        {
+            "op": "ratio",
+            "left": {"op": "sma", "series": {"series_code": "A"}, "window": 10},
+            "right": {"op": "lag", "series": {"series_code": "A"}, "window": 30},
+            "scale": 100,
+        },
+        "series_math",
+    )
+    source = _series("2024-06-28")
+
+    outputs = []
+    for max_parallel in (1, 4):
+        store = InMemoryS3IO()
+        options = RunOptions(expression_engine=engine, max_parallel_expression_nodes=max_parallel)
+        await _run(event, source, store, StepClock(), options, "v1")
+        outputs.append({key: body for key, body in store.objects.items() if key.endswith(".jsonl")})
+
+    assert outputs[0] == outputs[1]
+
+
+@pytest.mark.asyncio
+async def test_windowed_run_marks_its_window_in_the_manifest():
+    """Test a windowed run's manifest says it only covers part of the history."""
+    expression = {"op": "sma", "series": {"series_code": "A"}, "window": 20}
+    source = _series("2024-06-28")
+    store = InMemoryS3IO()
+    current = "bucket/metrics/incremental.test/current/manifest.json"
+
+    await _run(_event(expression), source, store, StepClock(), RunOptions(), "v1")
+    assert "output_window" not in json.loads(store.objects[current])
+
+    window = {"start": "2024-06-01T00:00:00Z"}
+    windowed, _ = await _run(
+        _event(expression, output_window=window), source, store, StepClock(), RunOptions(), "v1"
+    )
+
+    manifest = json.loads(store.objects[current])
+    assert manifest["output_window"] == {"start": "2024-06-01T00:00:00Z", "end": None}
+    assert manifest["row_count"] == len(windowed) == (source["obs_time"] >= "2024-06-01").sum()
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_after_windowed_run_recomputes_full_history():
+    """Test an incremental run does not extend the truncated output of a windowed run."""
+    expression = {"op": "sma", "series": {"series_code": "A"}, "window": 20}
+    clock = StepClock()
+    incremental = RunOptions(incremental=True, incremental_restate_days=5)
+    store = InMemoryS3IO()
+    source = _series("2024-06-28")
+
+    await _run(_event(expression), source, store, clock, incremental, "v1")
+    windowed_event = _event(expression, output_window={"start": "2024-06-01T00:00:00Z"})
+    windowed, _ = await _run(windowed_event, source, store, clock, incremental, "v1")
+    assert len(windowed) < len(source) / 10
+
+    extended, rows_read = await _run(_event(expression), source, store, clock, incremental, "v1")
+
+    full, _ = await _run(_event(expression), source, InMemoryS3IO(), clock, RunOptions(), "v1")
+    assert len(extended) == len(full) == len(source)
+    assert rows_read == [len(source)]
+    np.testing.assert_allclose(extended["value"], full["value"], rtol=1e-12)
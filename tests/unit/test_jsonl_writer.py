@@ -0,0 +1,42 @@
+"""Unit tests for JsonlWriter."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from metrics_worker.infrastructure.aws.s3_io import S3IO
+from metrics_worker.infrastructure.io.jsonl_writer import JsonlWriter
+
+
+async def _written(data) -> bytes:
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.put_object = AsyncMock()
+    await JsonlWriter(s3_io).write_jsonl(data, "bucket/out/data/metrics.jsonl")
+    return s3_io.put_object.call_args[0][1]
+
+
+@pytest.mark.parametrize(
+    "obs_time",
+    [
+        pd.date_range("2024-01-01", periods=4, freq="D"),
+        pd.date_range("2024-01-01 09:30", periods=4, freq="1500ms"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_table_is_written_like_the_same_dataframe(obs_time):
+    """Test an Arrow table and the equivalent DataFrame produce identical JSONL."""
+    frame = pd.DataFrame({"obs_time": obs_time, "value": [1.5, np.nan, 1e-17, 3.0]})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.set_column(
+        1, "value", pa.array([1.5, None, 1e-17, 3.0], type=pa.float64())
+    )
+
+    written = await _written(table)
+
+    assert written == await _written(frame)
+    assert written.splitlines()[1] == b'{"obs_time": "' + obs_time[1].isoformat().encode() + (
+        b'", "value": null}'
+    )
@@ -0,0 +1,151 @@
+"""Unit tests for the in-process series cache."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics_worker.application.services.expression_eval import evaluate_expression
+from metrics_worker.domain.ports import DataReaderPort
+from metrics_worker.infrastructure.io.memory_series_cache import MemorySeriesCache
+
+PATHS = ["datasets/ds/projections/SERIES_A/year=2024/month=01/data.parquet"]
+
+
+@pytest.fixture
+def inner_reader():
+    """Create a mock wrapped reader returning a fresh 100-point frame."""
+    reader = MagicMock(spec=DataReaderPort)
+
+    async def read(paths, series_code, dataset_version=None, start=None, end=None):  # noqa: ARG001
+        return pd.DataFrame(
+            {
+                "obs_time": pd.date_range("2024-01-01", periods=100, freq="D"),
+                "value": np.arange(100, dtype="float64"),
+            }
+        )
+
+    reader.read_series_from_paths = AsyncMock(side_effect=read)
+    return reader
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_zero_copy_view(inner_reader):
+    """Test that hits share buffers with the cached entry."""
+    cache = MemorySeriesCache(inner_reader, max_bytes=10**6)
+
+    first = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    second = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert inner_reader.read_series_from_paths.call_count == 1
+    assert first is not second
+    assert np.shares_memory(first["value"].to_numpy(), second["value"].to_numpy())
+    assert second["obs_time"].dtype == "datetime64[ns]"
+    assert second["value"].dtype == "float64"
+    assert cache.hit_ratio == 0.5
+    assert cache.resident_bytes == 100 * 8 * 2
+
+
+@pytest.mark.asyncio
+async def test_cached_view_is_read_only(inner_reader):
+    """Test that in-place writes on a hit cannot corrupt the cache."""
+    cache = MemorySeriesCache(inner_reader, max_bytes=10**6)
+    frame = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[0, "value"] = 42.0
+
+    frame["value"] = frame["value"] * 2
+    again = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    assert again["value"].iloc[1] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_cached_view_can_be_evaluated(inner_reader):
+    """Test that read-only frames flow through the expression evaluator."""
+    cache = MemorySeriesCache(inner_reader, max_bytes=10**6)
+    frame = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    result = evaluate_expression(
+        {"op": "sma", "series": {"series_code": "A"}, "window": 3},
+        "window_op",
+        {"A": frame},
+    )
+
+    assert result["value"].iloc[2] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_unsorted_frames_are_normalized():
+    """Test that cached frames are sorted by obs_time."""
+    reader = MagicMock(spec=DataReaderPort)
+    reader.read_series_from_paths = AsyncMock(
+        return_value=pd.DataFrame(
+            {
+                "obs_time": pd.to_datetime(["2024-01-03", "2024-01-01", "2024-01-02"]),
+                "value": [3, 1, 2],
+            }
+        )
+    )
+    cache = MemorySeriesCache(reader, max_bytes=10**6)
+
+    frame = await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    assert frame["obs_time"].is_monotonic_increasing
+    assert frame["value"].tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_size_aware_lru_eviction(inner_reader):
+    """Test that the byte budget evicts the least recently used entry."""
+    cache = MemorySeriesCache(inner_reader, max_bytes=2 * 1600)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v2")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v3")
+
+    assert cache.resident_bytes == 2 * 1600
+    inner_reader.read_series_from_paths.reset_mock()
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+    assert inner_reader.read_series_from_paths.call_count == 0
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v2")
+    assert inner_reader.read_series_from_paths.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_read_without_version_bypasses_cache(inner_reader):
+    """Test that reads without a dataset version are not cached."""
+    cache = MemorySeriesCache(inner_reader, max_bytes=10**6)
+
+    await cache.read_series_from_paths(PATHS, "SERIES_A")
+    await cache.read_series_from_paths(PATHS, "SERIES_A")
+
+    assert inner_reader.read_series_from_paths.call_count == 2
+    assert cache.resident_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_read_many_reads_only_missing_series(inner_reader):
+    """Test batched reads serve hits from memory and forward only the misses."""
+    inner_reader.read_many_series_from_paths = AsyncMock(
+        side_effect=lambda paths_by_series, **kwargs: {  # noqa: ARG005
+            code: pd.DataFrame(
+                {"obs_time": pd.date_range("2024-01-01", periods=3), "value": [1.0, 2.0, 3.0]}
+            )
+            for code in paths_by_series
+        }
+    )
+    cache = MemorySeriesCache(inner_reader, max_bytes=10**6)
+    await cache.read_series_from_paths(PATHS, "SERIES_A", dataset_version="v1")
+
+    result = await cache.read_many_series_from_paths(
+        {"SERIES_A": PATHS, "SERIES_B": PATHS}, dataset_version="v1"
+    )
+
+    assert list(result) == ["SERIES_A", "SERIES_B"]
+    assert len(result["SERIES_A"]) == 100
+    assert len(result["SERIES_B"]) == 3
+    forwarded = inner_reader.read_many_series_from_paths.call_args[0][0]
+    assert list(forwarded) == ["SERIES_B"]
@@ -0,0 +1,69 @@
+"""Unit tests for ParquetMetadataCache."""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+from pyarrow.fs import LocalFileSystem
+
+from metrics_worker.infrastructure.io.parquet_metadata_cache import ParquetMetadataCache
+
+
+@pytest.fixture
+def fragment(tmp_path):
+    """Local fragment of a two-row-group file with its footer loaded."""
+    frame = pd.DataFrame(
+        {
+            "obs_time": pd.date_range("2024-01-01", periods=20, freq="D"),
+            "value": [float(idx) for idx in range(20)],
+        }
+    )
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), path, row_group_size=10)
+    fragment = ds.ParquetFileFormat().make_fragment(str(path), filesystem=LocalFileSystem())
+    fragment.ensure_complete_metadata()
+    return fragment
+
+
+def test_get_returns_put_fragment_and_evicts_least_recent(fragment):
+    """Test lookups hit by exact key and the oldest entry is evicted first."""
+    cache = ParquetMetadataCache(max_entries=2)
+    cache.put(("a", 1, 1), fragment)
+    cache.put(("b", 1, 1), fragment)
+    assert cache.get(("a", 1, 1)) is fragment
+    cache.put(("c", 1, 1), fragment)
+
+    assert len(cache) == 2
+    assert cache.get(("b", 1, 1)) is None
+    assert cache.get(("a", 1, 1)) is fragment
+    # A rewritten object (new size or mtime) is another key
+    assert cache.get(("a", 1, 2)) is None
+    assert cache.get_persisted(("a", 1, 1)) is None
+
+
+def test_persisted_footer_prunes_row_groups(tmp_path, fragment):
+    """Test a footer persisted by one cache is readable by another for pruning."""
+    key = ("bucket/data.parquet", 123, 456)
+    ParquetMetadataCache(10, cache_dir=tmp_path / "footers").put(key, fragment)
+
+    restarted = ParquetMetadataCache(10, cache_dir=tmp_path / "footers")
+    persisted = restarted.get_persisted(key)
+
+    assert restarted.get(key) is None
+    assert persisted is not None
+    assert persisted.metadata.num_row_groups == 2
+    late = ds.field("obs_time") >= pa.scalar(pd.Timestamp("2024-01-15"), type=pa.timestamp("ns"))
+    assert [rg.id for rg in persisted.subset(late).row_groups] == [1]
+    assert restarted.get_persisted(("bucket/data.parquet", 124, 456)) is None
+
+
+def test_unreadable_persisted_footer_is_ignored(tmp_path, fragment):
+    """Test a corrupt footer file is treated as a miss."""
+    key = ("bucket/data.parquet", 123, 456)
+    cache = ParquetMetadataCache(10, cache_dir=tmp_path)
+    cache.put(key, fragment)
+    for footer in tmp_path.glob("*.footer.parquet"):
+        footer.write_bytes(b"not parquet")
+
+    assert cache.get_persisted(key) is None
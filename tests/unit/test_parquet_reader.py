@@ -1,12 +1,11 @@
 """Unit tests for ParquetReader."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pyarrow as pa
 import pyarrow.dataset as ds
 import pytest
-from pyarrow.fs import S3FileSystem
 
 from metrics_worker.infrastructure.aws.s3_io import S3IO
 from metrics_worker.infrastructure.io.parquet_reader import ParquetReader
@@ -76,7 +75,8 @@ async def test_read_series_from_paths_success(
         # Verify dataset was created with correct paths
         call_args = mock_dataset_func.call_args
         assert call_args[0][0] == [
-            "test-bucket/datasets/test-dataset/projections/TEST_SERIES/year=2024/month=01/data.parquet"
+            "test-bucket/datasets/test-dataset/projections/TEST_SERIES/"
+            "year=2024/month=01/data.parquet"
         ]
 
         # Verify scanner was called with correct filter
@@ -241,3 +241,537 @@ async def test_read_series_from_paths_sorted_output(parquet_reader):
         assert result["obs_time"].iloc[0] == pd.Timestamp("2024-01-01")
         assert result["obs_time"].iloc[-1] == pd.Timestamp("2024-01-05")
 
+
+
+@pytest.mark.asyncio
+async def test_read_series_from_paths_reuses_filesystem(tmp_path):
+    """Test that every scan uses the filesystem the reader was built with."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2024-01-01", 5)
+    shared_filesystem = LocalFileSystem()
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(s3_io, filesystem=shared_filesystem)
+
+    with patch("pyarrow.dataset.dataset", wraps=ds.dataset) as dataset_func, patch(
+        "pyarrow.dataset.FileSystemDataset", wraps=ds.FileSystemDataset
+    ) as fragments_dataset:
+        for _ in range(2):
+            await reader.read_series_from_paths(paths, "TEST_SERIES")
+
+    # The first scan discovers the schema, the second builds fragments from it
+    assert dataset_func.call_count == 1
+    assert dataset_func.call_args[1]["filesystem"] is shared_filesystem
+    assert fragments_dataset.call_count == 1
+    assert fragments_dataset.call_args[0][3] is shared_filesystem
+    reader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_read_series_from_paths_runs_scans_concurrently(mock_s3_io, sample_series_data):
+    """Test that blocking scans run off the event loop and overlap."""
+    import asyncio
+    import time
+
+    parquet_paths = [
+        "datasets/test-dataset/projections/TEST_SERIES/year=2024/month=01/data.parquet"
+    ]
+    mock_table = pa.Table.from_pandas(sample_series_data)
+
+    def slow_to_table():
+        time.sleep(0.2)
+        return mock_table
+
+    mock_scanner = MagicMock()
+    mock_scanner.to_table.side_effect = slow_to_table
+    mock_dataset = MagicMock()
+    mock_dataset.scanner.return_value = mock_scanner
+
+    reader = ParquetReader(mock_s3_io, max_workers=4)
+    loop_ticks = 0
+
+    async def ticker():
+        nonlocal loop_ticks
+        while True:
+            await asyncio.sleep(0.01)
+            loop_ticks += 1
+
+    with patch.object(ParquetReader, "_open_dataset", return_value=(mock_dataset, None)):
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[reader.read_series_from_paths(parquet_paths, "TEST_SERIES") for _ in range(4)]
+        )
+        elapsed = time.perf_counter() - started
+        ticker_task.cancel()
+
+    reader.shutdown()
+    assert all(len(result) == 5 for result in results)
+    # Four 0.2s scans on four workers finish in roughly one scan's time
+    assert elapsed < 0.6
+    # The loop kept running while scans were in flight
+    assert loop_ticks >= 5
+
+
+def _write_daily_partitions(root, series_code: str, start: str, periods: int) -> list[str]:
+    """Write a daily series in the series_year_month layout; return relative paths."""
+    import pyarrow.parquet as pq
+
+    frame = pd.DataFrame(
+        {
+            "obs_time": pd.date_range(start, periods=periods, freq="D"),
+            "value": [float(idx) for idx in range(periods)],
+            "internal_series_code": series_code,
+        }
+    )
+    paths = []
+    months = [frame["obs_time"].dt.year, frame["obs_time"].dt.month]
+    for (year, month), month_df in frame.groupby(months):
+        relative = f"{series_code}/year={year:04d}/month={month:02d}/data.parquet"
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(month_df, preserve_index=False), root / relative)
+        paths.append(relative)
+    return paths
+
+
+@pytest.mark.asyncio
+async def test_read_series_with_bounds_prunes_partitions(tmp_path):
+    """Test a 90-day window opens only the overlapping month partitions."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2022-01-01", 3 * 365)
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(s3_io, filesystem=LocalFileSystem())
+
+    with patch("pyarrow.dataset.dataset", wraps=ds.dataset) as dataset_func:
+        result = await reader.read_series_from_paths(
+            paths,
+            "TEST_SERIES",
+            start=pd.Timestamp("2024-10-02"),
+            end=pd.Timestamp("2024-12-30"),
+        )
+
+    opened = dataset_func.call_args[0][0]
+    assert len(paths) == 36
+    assert len(opened) == 3
+    assert result["obs_time"].iloc[0] == pd.Timestamp("2024-10-02")
+    assert result["obs_time"].iloc[-1] == pd.Timestamp("2024-12-30")
+    assert len(result) == 90
+    reader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_read_series_with_bounds_pushes_filter_to_scanner(mock_s3_io, sample_series_data):
+    """Test obs_time bounds are part of the scan filter, typed like the column."""
+    reader = ParquetReader(mock_s3_io)
+    table = pa.Table.from_pandas(sample_series_data)
+    mock_dataset = MagicMock()
+    mock_dataset.schema = table.schema
+    mock_dataset.scanner.return_value.to_table.return_value = table
+
+    with patch("pyarrow.dataset.dataset", return_value=mock_dataset):
+        result = await reader.read_series_from_paths(
+            ["TEST_SERIES/year=2024/month=01/data.parquet"],
+            "TEST_SERIES",
+            start=pd.Timestamp("2024-01-02"),
+            end=pd.Timestamp("2024-01-03T00:00:00Z"),
+        )
+
+    scan_filter = str(mock_dataset.scanner.call_args[1]["filter"])
+    assert "obs_time" in scan_filter
+    assert "2024-01-02" in scan_filter
+    assert result["obs_time"].tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+
+
+@pytest.mark.asyncio
+async def test_read_series_with_bounds_outside_data_returns_empty(mock_s3_io):
+    """Test a window with no overlapping partition skips the scan entirely."""
+    reader = ParquetReader(mock_s3_io)
+
+    with patch("pyarrow.dataset.dataset") as dataset_func:
+        result = await reader.read_series_from_paths(
+            ["TEST_SERIES/year=2024/month=01/data.parquet"],
+            "TEST_SERIES",
+            start=pd.Timestamp("2025-01-01"),
+        )
+
+    dataset_func.assert_not_called()
+    assert result.empty
+    assert list(result.columns) == ["obs_time", "value"]
+
+
+@pytest.mark.asyncio
+async def test_read_many_series_scans_union_once(tmp_path):
+    """Test several series are read from one dataset and split per series."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths_by_series = {
+        code: _write_daily_partitions(tmp_path, code, "2024-01-01", 60)
+        for code in ["SERIES_A", "SERIES_B", "SERIES_C"]
+    }
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(s3_io, filesystem=LocalFileSystem())
+
+    with patch("pyarrow.dataset.dataset", wraps=ds.dataset) as dataset_func:
+        result = await reader.read_many_series_from_paths(paths_by_series)
+
+    dataset_func.assert_called_once()
+    assert len(dataset_func.call_args[0][0]) == 3 * len(paths_by_series["SERIES_A"])
+    assert list(result) == ["SERIES_A", "SERIES_B", "SERIES_C"]
+    for code, paths in paths_by_series.items():
+        expected = await reader.read_series_from_paths(paths, code)
+        pd.testing.assert_frame_equal(result[code], expected)
+    reader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_read_many_series_missing_series_raises(tmp_path):
+    """Test a requested series with no rows raises like a single read does."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths = _write_daily_partitions(tmp_path, "SERIES_A", "2024-01-01", 10)
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(s3_io, filesystem=LocalFileSystem())
+
+    with pytest.raises(ValueError, match="Series not found: SERIES_X"):
+        await reader.read_many_series_from_paths({"SERIES_A": paths, "SERIES_X": paths})
+
+    bounded = await reader.read_many_series_from_paths(
+        {"SERIES_A": paths, "SERIES_X": paths},
+        start=pd.Timestamp("2024-01-05"),
+    )
+    assert len(bounded["SERIES_A"]) == 6
+    assert bounded["SERIES_X"].empty
+    reader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_versioned_reads_use_listed_sizes_and_known_schema(tmp_path):
+    """Test repeated versioned reads skip discovery and per-file HEADs."""
+    from pyarrow.fs import LocalFileSystem
+
+    from metrics_worker.infrastructure.observability.object_requests import (
+        count_estimated_object_requests,
+    )
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2024-01-01", 90)
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(s3_io, filesystem=LocalFileSystem())
+
+    with count_estimated_object_requests() as first:
+        await reader.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+    with count_estimated_object_requests() as second, patch(
+        "pyarrow.dataset.dataset", wraps=ds.dataset
+    ) as dataset_func:
+        result = await reader.read_series_from_paths(
+            paths,
+            "TEST_SERIES",
+            dataset_version="v1",
+            start=pd.Timestamp("2024-02-01"),
+        )
+
+    dataset_func.assert_not_called()
+    assert len(result) == 90 - 31
+    assert first.as_dict() == {"data": 3, "footer": 4, "head": 4, "total": 11}
+    assert second.as_dict() == {"data": 2, "footer": 2, "list": 1, "total": 5}
+    reader.shutdown()
+
+
+def test_known_schema_skips_discovery(tmp_path):
+    """Test a schema passed in is used from the first scan."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2024-01-01", 10)
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    schema = pa.schema(
+        [
+            ("obs_time", pa.timestamp("ns")),
+            ("value", pa.float64()),
+            ("internal_series_code", pa.string()),
+        ]
+    )
+    reader = ParquetReader(s3_io, filesystem=LocalFileSystem(), schema=schema)
+
+    with patch("pyarrow.dataset.dataset") as dataset_func:
+        result = reader._read_series_sync(paths, "TEST_SERIES")
+
+    dataset_func.assert_not_called()
+    assert len(result) == 10
+    reader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_missing_file_in_fragment_dataset_is_series_not_found(tmp_path):
+    """Test a file deleted after the schema is known fails the scan as a missing series."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2024-01-01", 90)
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(s3_io, filesystem=LocalFileSystem())
+    await reader.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+
+    (tmp_path / paths[1]).unlink()
+    with pytest.raises(ValueError, match="Series not found: TEST_SERIES") as raised:
+        await reader.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+
+    assert "failed to read dataset from paths" in str(raised.value)
+    assert isinstance(raised.value.__cause__, FileNotFoundError)
+    reader.shutdown()
+
+
+class _LocalObjectStore:
+    """S3IO stand-in serving objects from a local directory."""
+
+    def __init__(self, root, fail: set[str] | None = None) -> None:
+        self.bucket = str(root)
+        self._root = root
+        self._fail = fail or set()
+        self.gets: list[str] = []
+
+    async def get_object(self, key: str) -> bytes:
+        self.gets.append(key)
+        if key in self._fail:
+            msg = f"Failed to read S3 object {key}"
+            raise RuntimeError(msg)
+        return (self._root / key).read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_small_objects_are_fetched_whole(tmp_path):
+    """Test small files are downloaded with one GET each and decoded from memory."""
+    from pyarrow.fs import LocalFileSystem
+
+    from metrics_worker.infrastructure.observability.object_requests import (
+        count_estimated_object_requests,
+    )
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2024-01-01", 90)
+    store = _LocalObjectStore(tmp_path)
+    reader = ParquetReader(store, filesystem=LocalFileSystem(), whole_object_max_bytes=10**6)
+    plain = ParquetReader(store, filesystem=LocalFileSystem())
+
+    with count_estimated_object_requests() as requests:
+        result = await reader.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+
+    assert sorted(store.gets) == sorted(paths)
+    assert requests.as_dict() == {"list": 1, "object": 3, "total": 4}
+    expected = await plain.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+    pd.testing.assert_frame_equal(result, expected)
+    reader.shutdown()
+    plain.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_object_fetch_falls_back_to_filesystem(tmp_path):
+    """Test a file whose GET fails is still read, through the filesystem."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths = _write_daily_partitions(tmp_path, "TEST_SERIES", "2024-01-01", 90)
+    store = _LocalObjectStore(tmp_path, fail={paths[1]})
+    reader = ParquetReader(store, filesystem=LocalFileSystem(), whole_object_max_bytes=10**6)
+
+    result = await reader.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+
+    assert len(result) == 90
+    assert result["obs_time"].is_monotonic_increasing
+    reader.shutdown()
+
+
+def _write_yearly_files(root, series_code: str, years: list[int]) -> list[str]:
+    """Write one file per year outside any partition layout, one row group per month."""
+    import pyarrow.parquet as pq
+
+    paths = []
+    for year in years:
+        obs_time = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+        frame = pd.DataFrame(
+            {
+                "obs_time": obs_time,
+                "value": [float(idx) for idx in range(len(obs_time))],
+                "internal_series_code": series_code,
+            }
+        )
+        relative = f"{series_code}/part-{year}.parquet"
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), root / relative, 31)
+        paths.append(relative)
+    return paths
+
+
+_SERIES_SCHEMA = pa.schema(
+    [
+        ("obs_time", pa.timestamp("ns")),
+        ("value", pa.float64()),
+        ("internal_series_code", pa.string()),
+    ]
+)
+
+
+@pytest.mark.asyncio
+async def test_metadata_cache_skips_footer_reads_and_prunes_files(tmp_path):
+    """Test cached footers are reused and files outside the bounds are never scanned."""
+    from pyarrow.fs import LocalFileSystem
+
+    from metrics_worker.infrastructure.io.parquet_metadata_cache import ParquetMetadataCache
+    from metrics_worker.infrastructure.observability.object_requests import (
+        count_estimated_object_requests,
+    )
+
+    paths = _write_yearly_files(tmp_path, "TEST_SERIES", [2021, 2022, 2023])
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    reader = ParquetReader(
+        s3_io,
+        filesystem=LocalFileSystem(),
+        schema=_SERIES_SCHEMA,
+        metadata_cache=ParquetMetadataCache(max_entries=100),
+    )
+
+    with count_estimated_object_requests() as first:
+        await reader.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+    with count_estimated_object_requests() as second:
+        result = await reader.read_series_from_paths(
+            paths,
+            "TEST_SERIES",
+            dataset_version="v1",
+            start=pd.Timestamp("2022-03-10"),
+            end=pd.Timestamp("2022-04-20"),
+        )
+
+    assert first.as_dict() == {"data": 3, "footer": 3, "list": 1, "total": 7}
+    # Only the 2022 file has row groups in range; no footer is read again
+    assert second.as_dict() == {"data": 1, "total": 1}
+    assert result["obs_time"].iloc[0] == pd.Timestamp("2022-03-10")
+    assert result["obs_time"].iloc[-1] == pd.Timestamp("2022-04-20")
+    assert len(result) == 42
+    reader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_persisted_footers_prune_files_after_restart(tmp_path):
+    """Test footers written to disk let a new reader skip files before any request."""
+    from pyarrow.fs import LocalFileSystem
+
+    from metrics_worker.infrastructure.io.parquet_metadata_cache import ParquetMetadataCache
+    from metrics_worker.infrastructure.observability.object_requests import (
+        count_estimated_object_requests,
+    )
+
+    data_root = tmp_path / "data"
+    paths = _write_yearly_files(data_root, "TEST_SERIES", [2021, 2022, 2023])
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(data_root)
+
+    def new_reader() -> ParquetReader:
+        return ParquetReader(
+            s3_io,
+            filesystem=LocalFileSystem(),
+            schema=_SERIES_SCHEMA,
+            metadata_cache=ParquetMetadataCache(10, cache_dir=tmp_path / "footers"),
+        )
+
+    warm = new_reader()
+    expected = await warm.read_series_from_paths(paths, "TEST_SERIES", dataset_version="v1")
+    warm.shutdown()
+
+    restarted = new_reader()
+    with count_estimated_object_requests() as requests:
+        result = await restarted.read_series_from_paths(
+            paths,
+            "TEST_SERIES",
+            dataset_version="v1",
+            start=pd.Timestamp("2023-06-01"),
+        )
+
+    assert requests.as_dict() == {"data": 1, "footer": 1, "list": 1, "total": 3}
+    pd.testing.assert_frame_equal(
+        result,
+        expected[expected["obs_time"] >= "2023-06-01"].reset_index(drop=True),
+    )
+    restarted.shutdown()
+
+
+def test_series_table_frame_converts_without_copying():
+    """Test scanned rows become an obs_time/value frame sharing the Arrow buffers."""
+    from metrics_worker.infrastructure.io.parquet_reader import _series_table_frame
+
+    values = pa.array([1.0, 2.0, 3.0, 4.0])
+    table = pa.table(
+        {
+            "obs_time": pa.array(pd.date_range("2024-01-01", periods=4, freq="D")),
+            "value": values,
+            "internal_series_code": ["TEST_SERIES"] * 4,
+        }
+    )
+    value_address = values.buffers()[1].address
+
+    result = _series_table_frame(table, None, pd.Timestamp("2024-01-03"))
+
+    assert list(result.columns) == ["obs_time", "value"]
+    assert result["value"].tolist() == [1.0, 2.0, 3.0]
+    assert result["value"].to_numpy().ctypes.data == value_address
+    assert isinstance(result.index, pd.RangeIndex)
+
+
+def test_series_table_frame_normalizes_types_and_order():
+    """Test other time units, zones and value types are cast and rows sorted."""
+    from metrics_worker.infrastructure.io.parquet_reader import _series_table_frame
+
+    table = pa.table(
+        {
+            "obs_time": pa.array(
+                pd.to_datetime(["2024-01-03", "2024-01-01", "2024-01-02"], utc=True),
+                type=pa.timestamp("us", tz="UTC"),
+            ),
+            "value": pa.array([3, 1, None], type=pa.int64()),
+        }
+    )
+
+    result = _series_table_frame(table, pd.Timestamp("2024-01-01T12:00"), None)
+
+    assert result["obs_time"].dtype == "datetime64[ns]"
+    assert result["obs_time"].tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+    assert result["value"].dtype == "float64"
+    assert pd.isna(result["value"].iloc[0])
+    assert result["value"].iloc[1] == 3.0
+    assert result.index.tolist() == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_arrow_frames_match_pandas_frames(tmp_path):
+    """Test series returned as Arrow tables hold the same rows as the DataFrames."""
+    from pyarrow.fs import LocalFileSystem
+
+    paths_by_series = {
+        code: _write_daily_partitions(tmp_path, code, "2024-01-01", 60)
+        for code in ["SERIES_A", "SERIES_B"]
+    }
+    s3_io = MagicMock(spec=S3IO)
+    s3_io.bucket = str(tmp_path)
+    arrow = ParquetReader(s3_io, filesystem=LocalFileSystem(), arrow_frames=True)
+    plain = ParquetReader(s3_io, filesystem=LocalFileSystem())
+    start = pd.Timestamp("2024-01-10")
+
+    single = await arrow.read_series_from_paths(paths_by_series["SERIES_A"], "SERIES_A")
+    many = await arrow.read_many_series_from_paths(paths_by_series, start=start)
+    empty = await arrow.read_series_from_paths(
+        paths_by_series["SERIES_A"], "SERIES_A", start=pd.Timestamp("2025-01-01")
+    )
+
+    assert isinstance(single, pa.Table)
+    assert single.column_names == ["obs_time", "value"]
+    expected = await plain.read_series_from_paths(paths_by_series["SERIES_A"], "SERIES_A")
+    pd.testing.assert_frame_equal(single.to_pandas(), expected)
+    expected_many = await plain.read_many_series_from_paths(paths_by_series, start=start)
+    for code in paths_by_series:
+        pd.testing.assert_frame_equal(many[code].to_pandas(), expected_many[code])
+    assert empty.num_rows == 0 and empty.schema == single.schema
+    arrow.shutdown()
+    plain.shutdown()
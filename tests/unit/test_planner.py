@@ -2,7 +2,12 @@
 
 import pytest
 
-from metrics_worker.application.services.planner import ReadPlan, plan_reads
+from metrics_worker.application.services.planner import (
+    EMA_WARMUP_SPANS,
+    Lookback,
+    ReadPlan,
+    plan_reads,
+)
 
 
 def test_read_plan_add_series():
@@ -110,3 +115,56 @@ def test_plan_reads_nested_expression():
     assert "A" in plan.series_by_dataset["ds1"]
     assert "B" in plan.series_by_dataset["ds1"]
 
+
+
+def test_plan_reads_lookback_rolling_window():
+    """Test rolling windows need window - 1 prior observations."""
+    expression = {"op": "sma", "series": {"series_code": "A"}, "window": 30}
+
+    plan = plan_reads(expression, "window_op", [{"datasetId": "ds1", "seriesCode": "A"}])
+
+    assert plan.get_lookback("A") == Lookback(observations=29, days=0)
+
+
+def test_plan_reads_lookback_nested_lag_and_ema():
+    """Test lookbacks accumulate down nested window ops."""
+    expression = {
+        "op": "sma",
+        "series": {"op": "lag", "series": {"series_code": "A"}, "window": 365},
+        "window": 7,
+    }
+    plan = plan_reads(expression, "window_op", [{"datasetId": "ds1", "seriesCode": "A"}])
+    assert plan.get_lookback("A") == Lookback(observations=7, days=365)
+
+    expression = {"op": "ema", "series": {"series_code": "A"}, "window": 12}
+    plan = plan_reads(expression, "window_op", [{"datasetId": "ds1", "seriesCode": "A"}])
+    assert plan.get_lookback("A") == Lookback(observations=EMA_WARMUP_SPANS * 12)
+
+
+def test_plan_reads_lookback_takes_widest_use_of_a_series():
+    """Test a series used in several branches gets the union of their needs."""
+    expression = {
+        "op": "subtract",
+        "left": {"series_code": "A"},
+        "right": {"op": "lag", "series": {"series_code": "A"}, "window": 30},
+    }
+    inputs = [{"datasetId": "ds1", "seriesCode": "A"}, {"datasetId": "ds1", "seriesCode": "B"}]
+
+    plan = plan_reads(expression, "series_math", inputs)
+
+    assert plan.get_lookback("A") == Lookback(observations=1, days=30)
+    assert plan.get_lookback("B") == Lookback()
+
+
+def test_plan_reads_lookback_of_shared_subexpression():
+    """Test a subexpression shared by several parents gets the union of their needs."""
+    lagged = {"op": "lag", "series": {"series_code": "A"}, "window": 30}
+    expression = {
+        "op": "subtract",
+        "left": {"op": "sma", "series": lagged, "window": 10},
+        "right": {"op": "max", "series": lagged, "window": 20},
+    }
+
+    plan = plan_reads(expression, "series_math", [{"datasetId": "ds1", "seriesCode": "A"}])
+
+    assert plan.get_lookback("A") == Lookback(observations=20, days=30)
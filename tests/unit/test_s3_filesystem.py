@@ -0,0 +1,53 @@
+"""Unit tests for the process-wide S3 filesystem."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from metrics_worker.infrastructure.aws.s3_filesystem import (
+    get_s3_filesystem,
+    warm_up_s3_filesystem,
+)
+
+
+def _settings(request_timeout: float) -> MagicMock:
+    settings = MagicMock()
+    settings.aws_region = "us-east-1"
+    settings.s3fs_connect_timeout_seconds = 1.0
+    settings.s3fs_request_timeout_seconds = request_timeout
+    settings.s3fs_retry_max_attempts = 2
+    return settings
+
+
+def test_get_s3_filesystem_is_shared_per_profile():
+    """Test that one filesystem is built per settings profile."""
+    before = REGISTRY.get_sample_value("s3_filesystem_init_seconds_count") or 0.0
+
+    first = get_s3_filesystem(_settings(11.0))
+    second = get_s3_filesystem(_settings(11.0))
+    other = get_s3_filesystem(_settings(12.0))
+
+    assert first is second
+    assert other is not first
+    assert first.region == "us-east-1"
+    after = REGISTRY.get_sample_value("s3_filesystem_init_seconds_count")
+    assert after == before + 2
+
+
+def test_warm_up_s3_filesystem_heads_bucket():
+    """Test that warm-up touches the bucket once."""
+    filesystem = MagicMock()
+
+    warm_up_s3_filesystem(filesystem, "test-bucket")
+
+    filesystem.get_file_info.assert_called_once_with("test-bucket")
+
+
+@pytest.mark.parametrize("error", [OSError("no credentials")])
+def test_warm_up_s3_filesystem_failure_is_not_fatal(error):
+    """Test that a failed warm-up is logged and swallowed."""
+    filesystem = MagicMock()
+    filesystem.get_file_info.side_effect = error
+
+    warm_up_s3_filesystem(filesystem, "test-bucket")
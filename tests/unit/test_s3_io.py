@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from botocore.exceptions import ClientError
 
-from metrics_worker.infrastructure.aws.s3_io import S3IO
+from metrics_worker.infrastructure.aws.s3_io import S3IO, S3ObjectNotFoundError
 
 
 @pytest.fixture
@@ -14,15 +14,19 @@ def mock_settings():
     settings = MagicMock()
     settings.aws_region = "us-east-1"
     settings.aws_s3_bucket = "test-bucket"
+    settings.aws_max_pool_connections = 4
+    settings.aws_connect_timeout_seconds = 1.0
+    settings.aws_read_timeout_seconds = 1.0
+    settings.aws_max_attempts = 1
     return settings
 
 
 @pytest.fixture
 def s3_io(mock_settings):
     """Create S3IO instance."""
-    with patch("metrics_worker.infrastructure.aws.s3_io.boto3") as mock_boto3:
+    with patch("metrics_worker.infrastructure.aws.async_clients.boto3") as mock_boto3:
         mock_client = MagicMock()
-        mock_boto3.client.return_value = mock_client
+        mock_boto3.session.Session.return_value.client.return_value = mock_client
         s3 = S3IO(mock_settings)
         s3.s3_client = mock_client
         return s3
@@ -132,3 +136,58 @@ async def test_object_exists_false(s3_io):
 
     assert result is False
 
+
+
+@pytest.mark.asyncio
+async def test_list_keys(s3_io):
+    """Test listing keys under a prefix."""
+    s3_io.s3_client.list_objects_v2 = MagicMock(
+        return_value={"Contents": [{"Key": "a/1.json"}, {"Key": "a/2.json"}]}
+    )
+
+    result = await s3_io.list_keys("a/", max_keys=20)
+
+    assert result == ["a/1.json", "a/2.json"]
+    s3_io.s3_client.list_objects_v2.assert_called_once_with(
+        Bucket="test-bucket", Prefix="a/", MaxKeys=20
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_json_if_modified_sends_etag(s3_io):
+    """Test a changed object is returned with its new ETag."""
+    mock_response = {"Body": MagicMock(), "ETag": '"new"'}
+    mock_response["Body"].read.return_value = b'{"key": "value"}'
+    s3_io.s3_client.get_object = MagicMock(return_value=mock_response)
+
+    result = await s3_io.get_json_if_modified("test-key.json", '"old"')
+
+    assert result == ({"key": "value"}, '"new"')
+    s3_io.s3_client.get_object.assert_called_once_with(
+        Bucket="test-bucket", Key="test-key.json", IfNoneMatch='"old"'
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_json_if_modified_not_modified(s3_io):
+    """Test a 304 response returns no data and keeps the ETag."""
+    s3_io.s3_client.get_object = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject")
+    )
+
+    result = await s3_io.get_json_if_modified("test-key.json", '"same"')
+
+    assert result == (None, '"same"')
+
+
+@pytest.mark.asyncio
+async def test_get_json_if_modified_not_found_is_not_retried(s3_io):
+    """Test a missing object raises S3ObjectNotFoundError after one request."""
+    s3_io.s3_client.get_object = MagicMock(
+        side_effect=ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+    )
+
+    with pytest.raises(S3ObjectNotFoundError, match="test-key.json"):
+        await s3_io.get_json_if_modified("test-key.json", None)
+
+    assert s3_io.s3_client.get_object.call_count == 1
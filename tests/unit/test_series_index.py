@@ -0,0 +1,72 @@
+"""Unit tests for the series-to-file index."""
+
+from datetime import date
+
+from metrics_worker.application.services.series_index import SeriesFileIndex
+
+FILES = [
+    "X_D/year=2024/month=02/data.parquet",
+    "X_D_ADJ/year=2024/month=01/data.parquet",
+    "X_D/year=2023/month=12/data.parquet",
+    "X_D/year=2024/month=01/part-0.parquet",
+    "X_D/year=2024/month=01/part-1.parquet",
+]
+
+
+def test_files_for_matches_exact_series_segment():
+    """Test lookups never match on a code prefix."""
+    index = SeriesFileIndex(FILES)
+
+    assert index.files_for("X_D_ADJ") == ["X_D_ADJ/year=2024/month=01/data.parquet"]
+    assert "X_D_ADJ/year=2024/month=01/data.parquet" not in index.files_for("X_D")
+
+
+def test_files_for_sorted_by_month():
+    """Test files come back in partition order."""
+    index = SeriesFileIndex(FILES)
+
+    assert index.files_for("X_D") == [
+        "X_D/year=2023/month=12/data.parquet",
+        "X_D/year=2024/month=01/part-0.parquet",
+        "X_D/year=2024/month=01/part-1.parquet",
+        "X_D/year=2024/month=02/data.parquet",
+    ]
+
+
+def test_files_for_time_range():
+    """Test range bounds are inclusive at month granularity."""
+    index = SeriesFileIndex(FILES)
+
+    assert index.files_for("X_D", start=date(2024, 1, 31)) == [
+        "X_D/year=2024/month=01/part-0.parquet",
+        "X_D/year=2024/month=01/part-1.parquet",
+        "X_D/year=2024/month=02/data.parquet",
+    ]
+    assert index.files_for("X_D", end=date(2023, 12, 1)) == [
+        "X_D/year=2023/month=12/data.parquet",
+    ]
+    assert index.files_for("X_D", start=date(2025, 1, 1)) == []
+
+
+def test_unknown_series():
+    """Test an unknown code has no files and no bounds."""
+    index = SeriesFileIndex(FILES)
+
+    assert "Y" not in index
+    assert index.files_for("Y") == []
+    assert index.month_bounds("Y") is None
+
+
+def test_month_bounds():
+    """Test first and last partitions of a series."""
+    index = SeriesFileIndex(FILES)
+
+    assert index.month_bounds("X_D") == ((2023, 12), (2024, 2))
+
+
+def test_files_outside_partition_layout_match_path_segments():
+    """Test non-partitioned files match by segment or file stem."""
+    index = SeriesFileIndex(["flat/X_D.parquet", "flat/X_D_ADJ.parquet"])
+
+    assert index.files_for("X_D") == ["flat/X_D.parquet"]
+    assert index.files_for("X_D", start=date(2024, 1, 1)) == ["flat/X_D.parquet"]
@@ -0,0 +1,90 @@
+"""Unit tests for single-flight loading."""
+
+import asyncio
+
+import pytest
+
+from metrics_worker.application.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_for_same_key_share_one_load():
+    """Test callers for the same key await one load."""
+    flights: SingleFlight[str] = SingleFlight()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "manifest"
+
+    results = await asyncio.gather(*(flights.do("a", load) for _ in range(5)))
+
+    assert results == ["manifest"] * 5
+    assert calls == 1
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_load_concurrently():
+    """Test loads for different keys overlap."""
+    flights: SingleFlight[str] = SingleFlight()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def load(key: str) -> str:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return key
+
+    results = await asyncio.gather(
+        *(flights.do(key, lambda key=key: load(key)) for key in ["a", "b", "c"])
+    )
+
+    assert results == ["a", "b", "c"]
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_failure_is_shared_and_not_remembered():
+    """Test an exception reaches every waiter and the next call retries."""
+    flights: SingleFlight[str] = SingleFlight()
+    attempts = 0
+
+    async def load() -> str:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            msg = "boom"
+            raise RuntimeError(msg)
+        return "ok"
+
+    results = await asyncio.gather(
+        flights.do("a", load), flights.do("a", load), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    assert await flights.do("a", load) == "ok"
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    """Test cancelling one waiter leaves the load running for the others."""
+    flights: SingleFlight[str] = SingleFlight()
+
+    async def load() -> str:
+        await asyncio.sleep(0.02)
+        return "manifest"
+
+    first = asyncio.ensure_future(flights.do("a", load))
+    second = asyncio.ensure_future(flights.do("a", load))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "manifest"
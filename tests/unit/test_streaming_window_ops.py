@@ -0,0 +1,91 @@
+"""Unit tests for streaming window operations."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics_worker.application.services import window_ops
+from metrics_worker.application.services.streaming_window_ops import (
+    StreamingSMA,
+    restore,
+    streaming_window_op,
+)
+from metrics_worker.domain.errors import ExpressionEvaluationError
+
+OBS_TIME = pd.DatetimeIndex(pd.bdate_range("2020-01-01", periods=300), name="obs_time")
+
+
+def _values(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(100, 1e3, len(OBS_TIME))
+    values[rng.random(len(OBS_TIME)) < 0.05] = np.nan
+    # A constant run exercises the repeated-value handling of rolling sums
+    values[120:150] = 7.3
+    return values
+
+
+def _batch(op: str, values: np.ndarray, window: int) -> np.ndarray:
+    series = pd.Series(values, index=OBS_TIME)
+    if op == "lag":
+        return window_ops.lag(series, window, OBS_TIME).to_numpy()
+    functions = {
+        "sma": window_ops.sma,
+        "ema": window_ops.ema,
+        "sum": window_ops.window_sum,
+        "max": window_ops.window_max,
+        "min": window_ops.window_min,
+    }
+    return functions[op](series, window).to_numpy()
+
+
+@pytest.mark.parametrize("op", ["sma", "ema", "sum", "max", "min", "lag"])
+@pytest.mark.parametrize("window", [1, 5, 30])
+def test_chunked_updates_match_batch(op, window):
+    """Test feeding chunks through snapshot/restore gives the batch result exactly."""
+    values = _values()
+    operator = streaming_window_op(op, window)
+    outputs = []
+    bounds = [0, 1, 40, 41, 200, len(values)]
+    for lo, hi in itertools.pairwise(bounds):
+        outputs.append(operator.update(values[lo:hi], OBS_TIME[lo:hi]))
+        operator = restore(operator.snapshot())
+
+    np.testing.assert_array_equal(np.concatenate(outputs), _batch(op, values, window))
+
+
+def test_snapshot_does_not_share_state():
+    """Test a restored operator evolves independently of the original."""
+    operator = StreamingSMA(3)
+    operator.update([1.0, 2.0, 3.0])
+    resumed = restore(operator.snapshot())
+
+    assert operator.update([4.0]).tolist() == [3.0]
+    assert resumed.update([10.0]).tolist() == [5.0]
+
+
+def test_invalid_window():
+    """Test windows below 1 are rejected."""
+    with pytest.raises(ExpressionEvaluationError, match="Window must be >= 1"):
+        streaming_window_op("sma", 0)
+
+
+def test_unknown_op():
+    """Test unknown window ops are rejected."""
+    with pytest.raises(ExpressionEvaluationError, match="Unknown window_op"):
+        streaming_window_op("median", 3)
+
+
+def test_lag_requires_increasing_obs_time():
+    """Test lag rejects obs_time going backwards across updates."""
+    operator = streaming_window_op("lag", 2)
+    operator.update([1.0], OBS_TIME[5:6])
+    with pytest.raises(ExpressionEvaluationError, match="increasing obs_time"):
+        operator.update([2.0], OBS_TIME[4:5])
+
+
+def test_restore_rejects_foreign_bytes():
+    """Test restore fails cleanly on data that is not a snapshot."""
+    with pytest.raises(ExpressionEvaluationError, match="Not a window operator snapshot"):
+        restore(b"not a snapshot at all")
@@ -12,6 +12,7 @@ from metrics_worker.application.services.window_ops import (
     window_min,
     window_sum,
 )
+from metrics_worker.domain.errors import ExpressionEvaluationError
 
 
 def test_sma():
@@ -79,11 +80,64 @@ def test_lag():
     assert result.iloc[4] == 3.0
 
 
+def test_calendar_lag_takes_last_value_at_or_before_target():
+    """Test calendar lag falls back to the closest earlier observation."""
+    obs_time = pd.DatetimeIndex(
+        pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-04", "2024-01-05"]),
+        name="obs_time",
+    )
+    series = pd.Series([1.0, 2.0, 4.0, 5.0], index=obs_time)
+
+    result = lag(series, window=2, obs_time_index=obs_time)
+
+    np.testing.assert_array_equal(result.to_numpy(), [np.nan, np.nan, 2.0, 2.0])
+    assert result.index.equals(obs_time)
+
+
+def test_calendar_lag_accepts_unsorted_obs_time():
+    """Test calendar lag on unsorted rows matches the sorted result, row for row."""
+    obs_time = pd.DatetimeIndex(
+        pd.to_datetime(["2024-01-04", "2024-01-01", "2024-01-05", "2024-01-02"]),
+        name="obs_time",
+    )
+    series = pd.Series([4.0, 1.0, 5.0, 2.0], index=obs_time)
+
+    result = lag(series, window=2, obs_time_index=obs_time)
+
+    np.testing.assert_array_equal(result.to_numpy(), [2.0, np.nan, 2.0, np.nan])
+    assert result.index.equals(obs_time)
+
+
+def test_calendar_lag_tolerance_drops_stale_values():
+    """Test values observed more than tolerance before the target are missing."""
+    obs_time = pd.DatetimeIndex(
+        pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-04", "2024-01-05"]),
+        name="obs_time",
+    )
+    series = pd.Series([1.0, 2.0, 4.0, 5.0], index=obs_time)
+
+    result = lag(series, window=2, obs_time_index=obs_time, tolerance=pd.Timedelta(0))
+
+    np.testing.assert_array_equal(result.to_numpy(), [np.nan, np.nan, 2.0, np.nan])
+
+
+def test_business_day_lag_skips_weekends():
+    """Test business-day lag counts Monday to Friday only."""
+    obs_time = pd.DatetimeIndex(pd.bdate_range("2024-01-01", periods=10), name="obs_time")
+    series = pd.Series(np.arange(10.0), index=obs_time)
+
+    result = lag(series, window=5, obs_time_index=obs_time, business_days=True)
+
+    # Every business day lands on the same weekday a week earlier
+    np.testing.assert_array_equal(result.to_numpy()[5:], np.arange(5.0))
+    assert result.iloc[:5].isna().all()
+
+
 def test_invalid_window():
     """Test invalid window size."""
     series = pd.Series([1.0, 2.0, 3.0])
-    with pytest.raises(Exception):
+    with pytest.raises(ExpressionEvaluationError):
         sma(series, window=0)
-    with pytest.raises(Exception):
+    with pytest.raises(ExpressionEvaluationError):
         lag(series, window=-1)
 